@@ -1,8 +1,21 @@
+import contextvars
+import functools
+import hashlib
 import os
-from datetime import date
+from datetime import date, datetime
 import streamlit as st
-from crewai import Agent, Task, Process, Crew
-from crewai.tools import tool
+from checkpoints import kickoff_with_checkpoints
+from doc_index import index_document, render_chunks
+from doc_ingest import ingest
+from event_extract import extract_events
+from events import render_events
+import streaming
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobManager
+from host_health import get_host_health
+from page_cache import get_page_cache
+from research import render_research
+from research_planner import research_plan
+from search_memo import MEMO_MAX_ENTRIES, MEMO_TTL, memo_key, normalize_query
 
 # Page config
 st.set_page_config(
@@ -13,351 +26,68 @@ st.set_page_config(
 
 today = date.today().strftime("%A, %B %d, %Y")
 
-@tool("Web Search")
 def search_tool(query: str) -> str:
     """Real web search using SerpAPI or similar service"""
     try:
-        return perform_deep_research(query)
+        normalized = normalize_query(query)
+        return memoized_research(memo_key(normalized), date.today().isoformat(), normalized)
         
     except Exception as e:
         return f"Search failed for query '{query}': {str(e)}"
 
+@st.cache_data(ttl=MEMO_TTL, max_entries=MEMO_MAX_ENTRIES, show_spinner=False)
+def memoized_research(query_key: str, day: str, _query: str) -> str:
+    """Run the crawl once per equivalent query and day, shared across sessions"""
+    result = perform_deep_research(_query)
+    if result.startswith("Deep research failed"):
+        # Raising keeps failures out of the cache
+        raise RuntimeError(result)
+    return result
+
 def perform_deep_research(query: str) -> str:
     """Perform deep research using web scraping and analysis"""
     try:
-        import requests
-        from bs4 import BeautifulSoup
-        import re
-        from datetime import datetime, timedelta
-        
-        results = []
-        today = datetime.now()
-        next_week = today + timedelta(days=10)
-        
-        # Research multiple sources
-        query_encoded = query.replace(' ', '+')
-        query_dash = query.replace(' ', '-')
-        
-        sources = [
-            # Event platforms
-            f"https://www.meetup.com/find/?keywords={query_encoded}&source=EVENTS",
-            f"https://www.eventbrite.com/d/ca--san-francisco/{query_dash}/",
-            "https://lu.ma/genai-sf?k=c",
-            f"https://lu.ma/discover?q={query_encoded}",
-            
-            # Startup/VC events  
-            f"https://www.ycombinator.com/events?q={query_encoded}",
-            f"https://500.co/events/",
-            f"https://a16z.com/events/",
-            
-            # Universities
-            f"https://events.stanford.edu/search?search={query_encoded}",
-            f"https://events.berkeley.edu/search?search_api_fulltext={query_encoded}",
-            
-            # Professional networks
-            f"https://www.linkedin.com/events/search?keywords={query_encoded}",
-            f"https://www.svforum.org/events/",
-            
-            # Tech communities
-            f"https://www.galvanize.com/events",
-            f"https://strictlyvc.com/events/",
-            f"https://www.meetup.com/find/?keywords=bay+area+tech+{query_encoded}",
-            f"https://cerebralvalley.ai/events",
-            
-            # Additional Bay Area sources
-            f"https://www.techcrunch.com/events/",
-            f"https://www.eventbrite.com/d/ca--palo-alto/{query_dash}/",
-            f"https://www.eventbrite.com/d/ca--berkeley/{query_dash}/",
-        ]
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # Track successful sources
-        successful_sources = 0
-        max_sources = 8  # Limit to avoid timeout
-        
-        for url in sources[:max_sources]:
-            try:
-                response = requests.get(url, headers=headers, timeout=8)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Identify source name
-                    if "meetup.com" in url:
-                        source_name = "Meetup"
-                    elif "eventbrite.com" in url:
-                        source_name = "Eventbrite" 
-                    elif "lu.ma" in url:
-                        source_name = "Lu.ma"
-                    elif "ycombinator.com" in url:
-                        source_name = "Y Combinator"
-                    elif "500.co" in url:
-                        source_name = "500 Startups"
-                    elif "a16z.com" in url:
-                        source_name = "Andreessen Horowitz"
-                    elif "stanford.edu" in url:
-                        source_name = "Stanford Events"
-                    elif "berkeley.edu" in url:
-                        source_name = "Berkeley Events"
-                    elif "linkedin.com" in url:
-                        source_name = "LinkedIn Events"
-                    elif "svforum.org" in url:
-                        source_name = "Silicon Valley Forum"
-                    elif "galvanize.com" in url:
-                        source_name = "Galvanize"
-                    elif "strictlyvc.com" in url:
-                        source_name = "StrictlyVC"
-                    elif "cerebralvalley.ai" in url:
-                        source_name = "Cerebral Valley"
-                    elif "techcrunch.com" in url:
-                        source_name = "TechCrunch"
-                    else:
-                        source_name = "Unknown Source"
-                    
-                    # Extract event information and signup URLs
-                    links = soup.find_all('a', href=True)
-                    titles = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5'])
-                    
-                    # Extract specific event signup URLs based on platform
-                    event_urls = []
-                    if "lu.ma" in url:
-                        # Lu.ma specific event URL patterns
-                        for link in links:
-                            href = link.get('href', '')
-                            if href and ('/event/' in href or href.startswith('/') and len(href) > 5):
-                                if href.startswith('/'):
-                                    full_url = f"https://lu.ma{href}"
-                                else:
-                                    full_url = href
-                                if 'lu.ma' in full_url and '/event/' in full_url:
-                                    event_urls.append(full_url)
-                    
-                    elif "meetup.com" in url:
-                        # Meetup specific event URL patterns
-                        for link in links:
-                            href = link.get('href', '')
-                            if href and '/events/' in href and 'meetup.com' in href:
-                                event_urls.append(href)
-                    
-                    elif "eventbrite.com" in url:
-                        # Eventbrite specific event URL patterns  
-                        for link in links:
-                            href = link.get('href', '')
-                            if href and ('/e/' in href or '/events/' in href) and 'eventbrite.com' in href:
-                                event_urls.append(href)
-                    
-                    else:
-                        # Generic event URL detection
-                        for link in links:
-                            href = link.get('href', '')
-                            if href and any(pattern in href.lower() for pattern in ['/event/', '/events/', 'register', 'signup', 'rsvp']):
-                                if href.startswith('http'):
-                                    event_urls.append(href)
-                                elif href.startswith('/'):
-                                    base_domain = url.split('/')[2]
-                                    event_urls.append(f"https://{base_domain}{href}")
-                    
-                    # Remove duplicates and limit
-                    event_urls = list(set(event_urls))[:5]
-                    
-                    results.append(f"\n--- {source_name} Research Results ---")
-                    results.append(f"Status: ✅ Successfully scraped")
-                    results.append(f"Found: {len(links)} links, {len(titles)} headings")
-                    if event_urls:
-                        results.append(f"🔗 Event URLs found: {len(event_urls)}")
-                        for event_url in event_urls[:3]:  # Show top 3 URLs
-                            results.append(f"  📅 {event_url}")
-                    
-                    # Look for AI/event-related content
-                    ai_content = []
-                    event_content = []
-                    
-                    for title in titles[:10]:
-                        text = title.get_text().lower().strip()
-                        if text and len(text) > 5:  # Filter out empty/short content
-                            # AI-related keywords
-                            if any(keyword in text for keyword in [
-                                'ai', 'artificial intelligence', 'machine learning', 'ml', 
-                                'deep learning', 'neural', 'data science', 'nlp',
-                                'computer vision', 'llm', 'gpt', 'transformer'
-                            ]):
-                                ai_content.append(title.get_text().strip())
-                            # Event-related keywords  
-                            elif any(keyword in text for keyword in [
-                                'event', 'meetup', 'workshop', 'conference', 'seminar',
-                                'hackathon', 'demo', 'presentation', 'talk', 'webinar'
-                            ]):
-                                event_content.append(title.get_text().strip())
-                    
-                    # Combine AI content with their potential signup URLs
-                    if ai_content:
-                        results.append("🤖 AI-related events found:")
-                        for i, content in enumerate(ai_content[:3]):
-                            event_info = f"  • EVENT: {content}"
-                            # Try to match with a specific signup URL
-                            if i < len(event_urls):
-                                event_info += f"\n    SIGNUP URL: {event_urls[i]}"
-                            results.append(event_info)
-                    
-                    if event_content and not ai_content:
-                        results.append("📅 General events found:")
-                        for i, content in enumerate(event_content[:2]):
-                            event_info = f"  • EVENT: {content}"
-                            # Try to match with a specific signup URL
-                            if i < len(event_urls):
-                                event_info += f"\n    SIGNUP URL: {event_urls[i]}"
-                            results.append(event_info)
-                    
-                    # If we found URLs but no matching content, show the URLs anyway
-                    if event_urls and not ai_content and not event_content:
-                        results.append("🔗 Event URLs found (no titles detected):")
-                        for event_url in event_urls[:3]:
-                            results.append(f"  • SIGNUP URL: {event_url}")
-                    
-                    if not ai_content and not event_content and not event_urls:
-                        results.append("ℹ️  No specific AI/event content or URLs detected")
-                    
-                    successful_sources += 1
-                        
-            except Exception as e:
-                source_name = url.split('/')[2] if '/' in url else url
-                results.append(f"\n--- {source_name} ---")
-                results.append(f"Status: ❌ Error - {str(e)[:50]}...")
-        
-        # Insert summary at the beginning, but put URLs right after if found
-        summary_line = f"🔍 Deep Research Summary: Scraped {successful_sources}/{max_sources} sources"
-        results.insert(0, summary_line)
-        
-        # Add a clear section with all found signup URLs for easy agent access
-        all_signup_urls = []
-        for result in results:
-            if "SIGNUP URL:" in result:
-                # Extract just the URL part
-                url_part = result.split("SIGNUP URL: ", 1)[1].strip()
-                if url_part and url_part.startswith("http"):
-                    all_signup_urls.append(url_part)
-        
-        if all_signup_urls:
-            # Add URLs both at the end AND at the beginning for visibility
-            url_section = [
-                f"\n" + "="*50,
-                "🔗 IMPORTANT: FOUND SIGNUP URLS - USE THESE EXACT URLS:",
-                "="*50
-            ]
-            for i, url in enumerate(all_signup_urls[:10], 1):
-                url_section.append(f"URL_{i}: {url}")
-            url_section.extend([
-                "="*50,
-                "INSTRUCTIONS FOR AGENTS:",
-                "- Use the above URLs for Sign Up links",
-                "- DO NOT write 'Sign up URL not available'",
-                "- DO NOT use generic URLs like https://lu.ma/",
-                "- Copy the exact URL from above list",
-                "="*50
-            ])
-            
-            # Add URLs at the beginning (after summary) AND at the end
-            results[1:1] = url_section  # Insert after summary line
-            results.extend(url_section)  # Also add at the end
-        else:
-            results.append(f"\n⚠️ WARNING: No specific signup URLs found in research")
-            results.append("Only then use 'Sign up URL not available'")
-        
-        return f"Deep research results for '{query}':\n" + "\n".join(results)
-        
+        # One call covers every platform with several keywords (see research_planner)
+        return render_research(research_plan(query))
     except Exception as e:
         return f"Deep research failed: {str(e)}"
-        
-        # Create a focused prompt for AI events
-        system_prompt = f"""
-        Today's date is {today}. You are an AI events researcher helping find upcoming AI and machine learning events.
-        
-        IMPORTANT: The current date is {today}. When I ask for events "for the next 7 to 10 days", I mean events happening between {today} and 10 days from now.
-        
-        Based on your knowledge, provide information about upcoming AI and machine learning events that would typically be found on:
-        - Meetup.com
-        - Eventbrite.com 
-        - Lu.ma (especially https://lu.ma/genai-sf?k=c)
-        - Y Combinator events
-        - 500 Startups
-        - Andreessen Horowitz (a16z)
-        - Stanford Events
-        - Berkeley Events
-        - LinkedIn Events
-        - Silicon Valley Forum
-        - Galvanize
-        - StrictlyVC
-        - Bay Area Tech Events
-        - cerebralvalley.ai
-        
-        Include details like dates, locations, event types, and general information about AI/ML community events.
-        Remember: Today is {today}."""
-        
-       
-        user_prompt = f"""CURRENT DATE: {today}
-        
-        Query: {query}
-        
-        Find AI and machine learning events for the next 7-10 days starting from {today}.
-        
-        Search these sources and provide specific events:
 
-        
-        Please provide:
-        - Specific event names and titles
-        - Exact dates (starting from {today})
-        - Event times
-        - Locations (especially Bay Area/Silicon Valley)
-        - Event descriptions
-        - Registration/signup URLs
-        
-        Format your response as a structured list with bullet points.
-        REMEMBER: Today is {today}. Only include events happening in the next 7-10 days from this date."""
-        
-        st.write(f"query: {query}")
-
-        # Make API call to Claude
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            temperature=0,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-        
-        result = response.content[0].text
-        st.write(result)
-        return f"AI-powered search results for '{query}':\n\n{result}"
-        
-    except ImportError:
-        return "Anthropic library not installed. Please install it with: pip install anthropic"
-    except Exception as e:
-        return f"Claude search failed for query '{query}': {str(e)}"
+# The uploaded document of the run in progress; set by run_newsletter in the job's context
+uploaded_document = contextvars.ContextVar("uploaded_document", default=None)
 
-@tool("Load document")
-def load_tool(document_type: str = "any") -> str:
-    """Load a document using Streamlit file uploader and return its content as string"""
-    if 'uploaded_content' in st.session_state and st.session_state.uploaded_content:
-        return st.session_state.uploaded_content
+def load_tool(query: str = "AI events dates signup URLs") -> str:
+    """Search the uploaded document and return the sections most relevant to the query,
+    favouring sections with dates, events and URLs"""
+    document = uploaded_document.get()
+    if document:
+        # Only the top sections reach the prompt, however long the document is
+        return render_chunks(index_document(document), query)
     return "No file uploaded. Please upload a document to proceed."
 
+@functools.lru_cache(maxsize=None)
+def crew_tools():
+    """The agents' crewai tools; crewai is only imported once the first crew is built,
+    so the page renders without waiting for it"""
+    from crewai.tools import tool
+    return tool("Web Search")(search_tool), tool("Load document")(load_tool)
+
 # Define agents
-@st.cache_resource
 def create_agents():
+    from crewai import Agent
+    from llm_cache import cached_llm
+
+    web_search, load_document = crew_tools()
     today_str = date.today().strftime("%A, %B %d, %Y")
     explorer = Agent(
         role="Senior Researcher",
         goal=f"Find and explore the most exciting events in the ai and machine learning space starting from {today_str}",
-        backstory=f"""You are an Expert strategist that knows how to find events in AI, tech and machine learning. Today's date is {today_str}. Make sure to include the current date in every search query.
-           Search the following sources for AI events for the next 7 to 10 days from {today_str}: Meetup.com, eventbrite.com, lu.ma (make sure to include https://lu.ma/genai-sf?k=c ), startupgrind, Y combinator, 500 startups, Andreessen Horowitz (a16z), Stanford Events, Berkeley Events, LinkedIn Events, Silicon Valley Forum, Galvanize, StrictlyVC, Bay Area Tech Events, cerebralvalley.ai,
-           Please make sure to follow the link, and find out the date, the sign up URL and location""",
+        backstory=f"""You are an Expert strategist that knows how to find events in AI, tech and machine learning. Today's date is {today_str}.
+           Find AI events for the next 7 to 10 days from {today_str}. A single Web Search call already searches Meetup.com, eventbrite.com, lu.ma (including https://lu.ma/genai-sf?k=c ), Y combinator, 500 startups, Andreessen Horowitz (a16z), Stanford Events, Berkeley Events, LinkedIn Events, Silicon Valley Forum, Galvanize, StrictlyVC, Bay Area Tech Events and cerebralvalley.ai with several AI keywords, so search once with your topic (e.g. "AI events") instead of once per platform.
+           Report the date, the sign up URL and location of each event""",
         verbose=True,
         allow_delegation=False,
-        tools=[search_tool],
+        llm=cached_llm(),
+        tools=[web_search],
     )
 
     loader = Agent(
@@ -366,7 +96,8 @@ def create_agents():
         backstory="""Read the document and find the events""",
         verbose=True,
         allow_delegation=False,
-        tools=[load_tool],
+        llm=cached_llm(),
+        tools=[load_document],
     )
 
     writer = Agent(
@@ -382,6 +113,7 @@ IMPORTANT: When writing event listings, you MUST:
 5. Write in engaging, interesting but simple, straightforward and concise style.""",
         verbose=True,
         allow_delegation=False,
+        llm=cached_llm(),
     )
 
     critic = Agent(
@@ -409,11 +141,14 @@ Example of WRONG format (DO NOT DO THIS):
         """,
         verbose=True,
         allow_delegation=False,
+        llm=cached_llm(),
     )
     
     return explorer, loader, writer, critic
 
 def create_tasks(explorer, loader, writer, critic):
+    from crewai import Task
+
     today_str = date.today().strftime("%A, %B %d, %Y")
     task_report = Task(
         description=f"""Use and summarize scraped data from the internet to make a detailed report on the latest AI events in the next 7 to 10 days from {today_str}. 
@@ -423,7 +158,7 @@ def create_tasks(explorer, loader, writer, critic):
     )
 
     task_loader = Task(
-        description="""Load the content of the document and find the events.""",
+        description="""Search the document with the Load document tool and find the events. Start with a query like "AI events dates signup URLs" and search again with other terms if sections seem to be missing.""",
         agent=loader,
         expected_output="All the events in the document, with the date, description, the sign up URL and the location"
     )
@@ -434,11 +169,10 @@ def create_tasks(explorer, loader, writer, critic):
 CRITICAL: Use ONLY the specific signup URLs provided in the research data. 
 
 INSTRUCTIONS:
-1. Look for the section "FOUND SIGNUP URLS - USE THESE EXACT URLS:" in the research results
-2. Use the URLs listed as "URL_1:", "URL_2:", etc.
-3. If multiple events are found, distribute these URLs among them
-4. DO NOT write "Sign up URL not available" if URLs are provided
-5. DO NOT create generic URLs like https://lu.ma/ or https://meetup.com/
+1. Each event in the research results is listed on one line ending with its "SIGNUP URL:"
+2. Use that exact URL as the Sign Up link for that event
+3. DO NOT write "Sign up URL not available" if a URL is provided
+4. DO NOT create generic URLs like https://lu.ma/ or https://meetup.com/
 
 Example of CORRECT HTML format:
 <h2>Monday, August 25, 2025</h2>
@@ -455,7 +189,7 @@ WRONG format (DO NOT DO THIS):
 - **Sign Up:** https://lu.ma/ ❌
 - **Sign Up:** Sign up URL not available ❌ (only use if NO URLs found in research)
 
-Use HTML format with plain text URLs (not HTML links). Look for "SIGNUP_URL:" in the research results summary section.
+Use HTML format with plain text URLs (not HTML links).
         """,
         agent=writer,
         expected_output="A blog article in HTML format with compelling headline featuring AI events ordered by date with specific signup URLs from research data."
@@ -480,127 +214,68 @@ REJECT any output that uses generic domain URLs or HTML link formatting.""",
     
     return [task_report, task_loader, task_blog, task_critique]
 
-def main():
-    st.title("🤖 AI Events Newsletter Generator")
-    st.markdown("Generate a comprehensive newsletter about upcoming AI events using web search and document upload.")
+def create_crew(include_search, include_document, extraction=None):
+    """Build a fresh crew for one newsletter run (agents are not shared between runs).
+
+    ``extraction`` holds the events already extracted from the uploaded document by
+    the rule-based pass; the loader agent then only runs when there are leftovers.
+    """
+    from crewai import Crew, Process, Task
+
+    explorer, loader, writer, critic = create_agents()
     
-    # Sidebar for options
-    st.sidebar.header("Options")
-    include_search = st.sidebar.checkbox("Include web search for events", value=True)
-    include_document = st.sidebar.checkbox("Include document upload", value=False)
+    # Determine which tasks to include. Web research and document extraction are
+    # independent, so when both are enabled they run concurrently (async tasks)
+    # and the writer waits for both through its context.
+    tasks = []
+    agents = []
+    include_loader = include_document and (extraction is None or bool(extraction.leftovers))
+    parallel_research = include_search and include_loader
     
-    # Document upload section
-    uploaded_content = None
-    if include_document:
-        st.subheader("📄 Upload Document")
-        uploaded_file = st.file_uploader(
-            "Choose a file containing AI events",
-            type=['txt', 'md', 'csv', 'json', 'py', 'js', 'html', 'xml', 'pdf', 'docx', 'doc']
-        )
-        
-        if uploaded_file is not None:
-            try:
-                # Handle different file types
-                file_extension = uploaded_file.name.lower().split('.')[-1]
-                
-                if file_extension in ['docx', 'doc']:
-                    try:
-                        from docx import Document
-                        # Reset file pointer
-                        uploaded_file.seek(0)
-                        doc = Document(uploaded_file)
-                        content = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-                    except ImportError:
-                        st.error("python-docx library not installed. Install with: pip install python-docx")
-                        return
-                    except Exception as e:
-                        st.error(f"Error reading docx file: {str(e)}")
-                        return
-                elif file_extension == 'pdf':
-                    try:
-                        import PyPDF2
-                        # Reset file pointer
-                        uploaded_file.seek(0)
-                        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                        content = ""
-                        for page in pdf_reader.pages:
-                            content += page.extract_text() + "\n"
-                    except ImportError:
-                        st.error("PyPDF2 library not installed. Install with: pip install PyPDF2")
-                        return
-                    except Exception as e:
-                        st.error(f"Error reading PDF file: {str(e)}")
-                        return
-                else:
-                    # Handle text-based files
-                    content = uploaded_file.read().decode('utf-8')
-                
-                st.success(f"Successfully loaded {uploaded_file.name}")
-                uploaded_content = f"File: {uploaded_file.name}\n\nContent:\n{content}"
-                st.session_state.uploaded_content = uploaded_content
-                
-                with st.expander("Preview uploaded content"):
-                    st.text_area("Document content:", content, height=200)
-            except UnicodeDecodeError:
-                try:
-                    content = uploaded_file.read().decode('latin-1')
-                    st.success(f"Successfully loaded {uploaded_file.name}")
-                    uploaded_content = f"File: {uploaded_file.name}\n\nContent:\n{content}"
-                    st.session_state.uploaded_content = uploaded_content
-                    
-                    with st.expander("Preview uploaded content"):
-                        st.text_area("Document content:", content, height=200)
-                except Exception as e:
-                    st.error(f"Error reading file: {str(e)}")
+    if include_search:
+        tasks.append(Task(
+            description="""Use and summarize scraped data from the internet to make a detailed report on the latest AI events in the next 7 to 10 days. 
+            Use ONLY scraped data to generate the report.""",
+            agent=explorer,
+            expected_output="A detailed analysis report with bullet points listing AI events for the next 7-10 days, including dates, locations, and signup URLs.",
+            async_execution=parallel_research,
+        ))
+        agents.append(explorer)
     
-    # Generate button
-    if st.button("🚀 Generate AI Events Newsletter", type="primary"):
-        if not include_search and not include_document:
-            st.error("Please select at least one option: web search or document upload.")
-            return
-            
-        if include_document and not uploaded_content and 'uploaded_content' not in st.session_state:
-            st.error("Please upload a document first.")
-            return
-        
-        # Create agents and tasks
-        explorer, loader, writer, critic = create_agents()
-        
-        # Determine which tasks to include
-        tasks = []
-        agents = []
-        
-        if include_search:
-            tasks.append(Task(
-                description="""Use and summarize scraped data from the internet to make a detailed report on the latest AI events in the next 7 to 10 days. 
-                Use ONLY scraped data to generate the report.""",
-                agent=explorer,
-                expected_output="A detailed analysis report with bullet points listing AI events for the next 7-10 days, including dates, locations, and signup URLs."
-            ))
-            agents.append(explorer)
-        
-        if include_document and (uploaded_content or 'uploaded_content' in st.session_state):
-            tasks.append(Task(
-                description="""Load the content of the document and find the events.""",
-                agent=loader,
-                expected_output="All the events in the document, with the date, description, the sign up URL and the location"
-            ))
-            agents.append(loader)
-        
-        # Add writing and critique tasks
-        today_str = date.today().strftime("%A, %B %d, %Y")
-        tasks.extend([
-            Task(
-                description=f"""Write a short but impactful headline, and list all the events in the order of the date. Today is {today_str}.
+    if include_loader:
+        already_extracted = ""
+        if extraction is not None:
+            already_extracted = " Events with a clear title and date were already extracted from the document; the tool only searches the remaining sections, which need your judgement."
+        tasks.append(Task(
+            description="""Search the document with the Load document tool and find the events. Start with a query like "AI events dates signup URLs" and search again with other terms if sections seem to be missing.""" + already_extracted,
+            agent=loader,
+            expected_output="All the events in the document, with the date, description, the sign up URL and the location",
+            async_execution=parallel_research,
+        ))
+        agents.append(loader)
+    # Fan-in: the writer merges every research branch (by default it would only
+    # see the previous task's output)
+    writer_context = {"context": list(tasks)} if parallel_research else {}
+    
+    # Events the rule-based pass pulled out of the document go straight to the writer
+    document_events = ""
+    if include_document and extraction is not None and extraction.events:
+        document_events = "\nEvents from the uploaded document (include them too):\n" + \
+            "\n".join(render_events(extraction.events))
+    
+    # Add writing and critique tasks
+    today_str = date.today().strftime("%A, %B %d, %Y")
+    tasks.extend([
+        Task(
+            description=f"""Write a short but impactful headline, and list all the events in the order of the date. Today is {today_str}.
 
 CRITICAL: Use ONLY the specific signup URLs provided in the research data. 
 
 INSTRUCTIONS:
-1. Look for the section "FOUND SIGNUP URLS - USE THESE EXACT URLS:" in the research results
-2. Use the URLs listed as "URL_1:", "URL_2:", etc.
-3. If multiple events are found, distribute these URLs among them
-4. DO NOT write "Sign up URL not available" if URLs are provided
-5. DO NOT create generic URLs like https://lu.ma/ or https://meetup.com/
+1. Each event in the research results is listed on one line ending with its "SIGNUP URL:"
+2. Use that exact URL as the Sign Up link for that event
+3. DO NOT write "Sign up URL not available" if a URL is provided
+4. DO NOT create generic URLs like https://lu.ma/ or https://meetup.com/
 
 Example of CORRECT HTML format:
 <h2>Monday, August 25, 2025</h2>
@@ -617,13 +292,14 @@ WRONG format (DO NOT DO THIS):
 - **Sign Up:** https://lu.ma/ ❌
 - **Sign Up:** Sign up URL not available ❌ (only use if NO URLs found in research)
 
-Use HTML format with plain text URLs (not HTML links). Look for "SIGNUP_URL:" in the research results summary section.
-                """,
-                agent=writer,
-                expected_output="A blog article in HTML format with compelling headline featuring AI events ordered by date with specific signup URLs from research data."
-            ),
-            Task(
-                description=f"""Review the blog post and ensure it follows the correct format and is well-written. Today is {today_str}.
+Use HTML format with plain text URLs (not HTML links).
+            """ + document_events,
+            agent=writer,
+            expected_output="A blog article in HTML format with compelling headline featuring AI events ordered by date with specific signup URLs from research data.",
+            **writer_context,
+        ),
+        Task(
+            description=f"""Review the blog post and ensure it follows the correct format and is well-written. Today is {today_str}.
 
 CRITICAL REVIEW POINTS:
 1. Check that ALL signup URLs are specific event URLs (like https://lu.ma/event/evt-abc123-event-name), NOT generic domains
@@ -635,47 +311,202 @@ CRITICAL REVIEW POINTS:
 7. Ensure the writing is engaging and accessible
 
 REJECT any output that uses generic domain URLs or HTML link formatting.""",
-                agent=critic,
-                expected_output="A finalized, well-formatted HTML blog article with specific event signup URLs (no generic domains)."
-            )
-        ])
-        agents.extend([writer, critic])
+            agent=critic,
+            expected_output="A finalized, well-formatted HTML blog article with specific event signup URLs (no generic domains)."
+        )
+    ])
+    agents.extend([writer, critic])
+    
+    crew = Crew(
+        agents=agents,
+        tasks=tasks,
+        verbose=True,
+        process=Process.sequential,
+        task_callback=streaming.task_callback,
+        step_callback=streaming.step_callback,
+    )
+    return crew, agents
+
+def run_newsletter(include_search, document):
+    """Job body: runs on a background worker, outside any Streamlit session"""
+    extraction = None
+    if document is not None:
+        # Well-formed listings are extracted without the LLM; only leftovers reach the loader agent
+        extraction = extract_events(document, source="uploaded document")
+        streaming.emit("source", "Uploaded document",
+                       f"✅ {len(extraction.events)} events extracted, "
+                       f"{len(extraction.leftovers)} sections left for the loader agent")
+    crew, agents = create_crew(include_search, document is not None, extraction)
+    streaming.enable_token_streaming(agents)
+    uploaded_document.set("\n\n".join(extraction.leftovers) if extraction else None)
+    # Tasks that already finished for the same inputs today are restored, not rerun
+    return kickoff_with_checkpoints(crew, newsletter_job_key(include_search, document))
+
+def newsletter_job_key(include_search, document):
+    """Identical requests on the same day share one job"""
+    digest = hashlib.sha256((document or "").encode("utf-8")).hexdigest()
+    return f"{date.today().isoformat()}:{int(include_search)}:{digest if document else '-'}"
+
+@st.cache_resource
+def get_job_manager():
+    """One bounded worker pool per server process, shared by every session"""
+    return JobManager()
+
+def render_progress(job):
+    """Draw scrape progress, agent steps, task outputs and streamed LLM tokens so far"""
+    if job.status == FAILED:
+        label, state = "❌ Newsletter generation failed", "error"
+    elif job.status == DONE:
+        label, state = "✅ Research and drafting finished", "complete"
+    else:
+        label, state = f"🔍 Generating your AI events newsletter... (job {job.id}, {job.status})", "running"
+    with st.status(label, state=state, expanded=not job.finished):
+        live_label = None
+        live_text = ""
+        for event in job.log.since(0):
+            if event.kind == "token":
+                if event.label != live_label:
+                    if live_text:
+                        st.text(live_text)
+                    live_label, live_text = event.label, ""
+                    st.markdown(f"**✍️ {event.label}**")
+                live_text += event.text
+                continue
+            if live_text and event.kind == "task":
+                # The finished task output replaces its token stream
+                live_text = ""
+            elif live_text:
+                st.text(live_text)
+                live_text = ""
+            live_label = None
+            if event.kind == "source":
+                st.write(f"🌐 **{event.label}**: {event.text}")
+            elif event.kind == "step":
+                st.caption(f"{event.label}: {event.text}")
+            elif event.kind == "task":
+                with st.expander(f"✅ {event.label}"):
+                    st.text(event.text)
+        if live_text:
+            st.text(live_text)
+
+@st.fragment(run_every=1.0)
+def poll_job(job_id):
+    """Redraw a running job's progress every second; rerun the page once it finishes"""
+    job = get_job_manager().get(job_id)
+    render_progress(job)
+    if job.finished:
+        st.rerun()
+
+def render_result(job):
+    if job.status == FAILED:
+        st.error(f"Error generating newsletter: {job.error}")
+        st.info("Generate again to resume from the last completed step.")
+        return
+    
+    result = job.result
+    st.success("✅ Newsletter generated successfully!")
+    
+    # Display result
+    st.subheader("📰 Generated Newsletter")
+    
+    # Display HTML content rendered
+    st.html(result)
+    
+    # Also show source code in an expandable section
+    with st.expander("📝 View HTML Source Code"):
+        st.text_area("HTML Source", result, height=200)
+    
+    # Download button
+    st.download_button(
+        label="📥 Download Newsletter",
+        data=result,
+        file_name="ai_events_newsletter.html",
+        mime="text/html"
+    )
+
+def main():
+    st.title("🤖 AI Events Newsletter Generator")
+    st.markdown("Generate a comprehensive newsletter about upcoming AI events using web search and document upload.")
+    
+    # Sidebar for options
+    st.sidebar.header("Options")
+    include_search = st.sidebar.checkbox("Include web search for events", value=True)
+    include_document = st.sidebar.checkbox("Include document upload", value=False)
+    
+    job_manager = get_job_manager()
+    recent_jobs = job_manager.recent(5)
+    if recent_jobs:
+        st.sidebar.subheader("Recent newsletters")
+        icons = {QUEUED: "⏳", RUNNING: "🔄", DONE: "✅", FAILED: "❌"}
+        for job in recent_jobs:
+            submitted = datetime.fromtimestamp(job.submitted_at).strftime("%b %d %H:%M")
+            if st.sidebar.button(f"{icons.get(job.status, '')} {submitted} · {job.id}", key=f"job-{job.id}"):
+                st.session_state.job_id = job.id
+    
+    cache_stats = get_page_cache().stats()
+    st.sidebar.caption(
+        f"Page cache: {cache_stats['entries']} pages, {cache_stats['hits']} hits, "
+        f"{cache_stats['revalidated']} revalidated, {cache_stats['stale']} stale, {cache_stats['misses']} misses"
+    )
+    skipped_hosts = [host for host, health in get_host_health().stats().items() if health["open"]]
+    if skipped_hosts:
+        st.sidebar.caption("Skipping unresponsive hosts: " + ", ".join(sorted(skipped_hosts)))
+    
+    # Document upload section
+    uploaded_content = None
+    if include_document:
+        st.subheader("📄 Upload Document")
+        uploaded_file = st.file_uploader(
+            "Choose a file containing AI events",
+            type=['txt', 'md', 'csv', 'json', 'py', 'js', 'html', 'xml', 'pdf', 'docx', 'doc']
+        )
         
-        # Create and run crew
-        with st.spinner("🔍 Generating your AI events newsletter..."):
-            crew = Crew(
-                agents=agents,
-                tasks=tasks,
-                verbose=True,
-                process=Process.sequential,
-            )
-            
-            # Capture output
+        if uploaded_file is not None:
             try:
-                result = crew.kickoff()
-                
-                st.success("✅ Newsletter generated successfully!")
-                
-                # Display result
-                st.subheader("📰 Generated Newsletter")
-                
-                # Display HTML content rendered
-                st.html(str(result))
-                
-                # Also show source code in an expandable section
-                with st.expander("📝 View HTML Source Code"):
-                    st.text_area("HTML Source", str(result), height=200)
-                
-                # Download button
-                st.download_button(
-                    label="📥 Download Newsletter",
-                    data=str(result),
-                    file_name="ai_events_newsletter.html",
-                    mime="text/html"
-                )
-                
+                # Streams pages/paragraphs; identical files are served from the text cache
+                document = ingest(uploaded_file.name, uploaded_file)
+            except ImportError as e:
+                st.error(str(e))
+                return
             except Exception as e:
-                st.error(f"Error generating newsletter: {str(e)}")
+                st.error(f"Error reading file: {str(e)}")
+                return
+            
+            cached = " (cached)" if document.from_cache else ""
+            st.success(f"Successfully loaded {uploaded_file.name}{cached}")
+            uploaded_content = f"File: {uploaded_file.name}\n\nContent:\n{document.text}"
+            st.session_state.uploaded_content = uploaded_content
+            
+            with st.expander("Preview uploaded content"):
+                st.text_area("Document content:", document.text, height=200)
+    
+    # Generate button
+    if st.button("🚀 Generate AI Events Newsletter", type="primary"):
+        if not include_search and not include_document:
+            st.error("Please select at least one option: web search or document upload.")
+            return
+            
+        if include_document and not uploaded_content and 'uploaded_content' not in st.session_state:
+            st.error("Please upload a document first.")
+            return
+        
+        document = st.session_state.get('uploaded_content') if include_document else None
+        # Runs in the background worker pool; reruns of this page don't interrupt it
+        st.session_state.job_id = job_manager.submit(
+            newsletter_job_key(include_search, document),
+            lambda: run_newsletter(include_search, document),
+        )
+    
+    job_id = st.session_state.get("job_id")
+    if job_id:
+        job = job_manager.get(job_id)
+        if job is None:
+            st.warning(f"Newsletter job {job_id} not found.")
+        elif not job.finished:
+            poll_job(job_id)
+        else:
+            render_progress(job)
+            render_result(job)
 
     # Information section
     with st.expander("ℹ️ How it works"):
@@ -0,0 +1,183 @@
+"""Offline end-to-end benchmark of the app.py newsletter pipeline.
+
+    python -m benchmarks.bench_e2e [--latency S] [--failure-rate R] [--failure-mode status|reset]
+                                   [--token-latency S] [--document] [--warm] [--json FILE]
+    python -m benchmarks.bench_e2e --record   # save the live source pages as fixtures
+
+Runs the real job body, ``app.run_newsletter``: rule-based extraction,
+checkpoints, the research crawl through the page cache, host health and
+rate limits, and the crew's kickoff. Every source page is served by
+``fake_web`` and every LLM call is answered by ``fake_llm``, in a fresh cache
+directory, so it needs no network and no API keys and gives the same output
+on every run. Reported: wall time, time per stage (document extraction,
+research crawl, each agent's task split into LLM and the rest), peak RSS,
+and prompt and completion tokens per agent. ``--warm`` adds a second run in
+the same process on top of the first run's caches and checkpoints.
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("NEWSLETTER_CACHE_DIR", tempfile.mkdtemp(prefix="bench_e2e_"))
+# No telemetry requests from crewai: the benchmark must not touch the network
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from crewai.events import crewai_event_bus  # noqa: E402
+
+import app  # noqa: E402
+from benchmarks.fake_llm import NEWSLETTER_SCRIPT, ScriptedLLM  # noqa: E402
+from benchmarks.fake_web import FAILURE_MODES, FakeWeb, record  # noqa: E402
+from compaction import count_tokens  # noqa: E402
+import llm_cache  # noqa: E402
+from research_planner import plan_queries  # noqa: E402
+import streaming  # noqa: E402
+
+
+def synthetic_document(events: int = 24, today: date = None) -> str:
+    """An uploaded event list: mostly well-formed listings, a few for the loader agent"""
+    today = today or date.today()
+    blocks = []
+    for i in range(events):
+        when = today + timedelta(days=1 + i % 9)
+        if i % 6 == 5:
+            # No date: the rule-based pass leaves it to the loader agent
+            blocks.append(f"AI community call #{i}\nMonthly, date to be announced. RSVP at "
+                          f"https://community.example.org/events/call-{i}")
+        else:
+            blocks.append(f"Applied AI Meetup #{i}\n{when:%B} {when.day}, {when.year} 6:30 PM PT\n"
+                          f"{100 + i} Howard Street, San Francisco\nhttps://meetups.example.org/events/ai-{i}")
+    return "\n\n".join(blocks)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+
+
+def run_once(web: FakeWeb, llm: ScriptedLLM, document: str = None, verbose: bool = False) -> dict:
+    """One newsletter job against the fakes, with its stage timings"""
+    log = streaming.ProgressLog()
+    requests_before, failures_before, bytes_before = web.requests, web.failures, web.bytes_sent
+    calls_before = len(llm.calls)
+    rss_before = peak_rss_mb()
+
+    token = streaming.current_log.set(log)
+    started = time.time()
+    try:
+        with contextlib.nullcontext() if verbose else contextlib.redirect_stdout(open(os.devnull, "w")):
+            output = app.run_newsletter(include_search=True, document=document)
+            crewai_event_bus.flush()  # the crew's console panels are printed by event handlers
+    finally:
+        streaming.current_log.reset(token)
+    finished = time.time()
+
+    events = log.since(0)
+    calls = llm.calls[calls_before:]
+    stages = {}
+    extracted = [event.at for event in events if event.kind == "source" and event.label == "Uploaded document"]
+    if extracted:
+        stages["document extraction"] = {"seconds": extracted[0] - started}
+    crawled = [event.at for event in events if event.kind == "source" and event.label != "Uploaded document"]
+    search_calls = [call for call in calls if call.agent == "Senior Researcher"]
+    if crawled and search_calls:
+        # From the researcher asking for the Web Search tool to the last source report
+        stages["research crawl"] = {"seconds": max(crawled) - search_calls[0].finished,
+                                    "sources": len(crawled),
+                                    "requests": web.requests - requests_before,
+                                    "failed requests": web.failures - failures_before,
+                                    "bytes": web.bytes_sent - bytes_before}
+    task_done = {event.label: event.at for event in events if event.kind == "task"}
+    for role in dict.fromkeys(call.agent for call in calls):
+        agent_calls = [call for call in calls if call.agent == role]
+        llm_seconds = sum(call.finished - call.started for call in agent_calls)
+        wall = task_done.get(role, agent_calls[-1].finished) - agent_calls[0].started
+        stages[role] = {"seconds": wall, "llm seconds": llm_seconds, "other seconds": wall - llm_seconds,
+                        "llm calls": len(agent_calls),
+                        "prompt tokens": sum(call.prompt_tokens for call in agent_calls),
+                        "completion tokens": sum(call.completion_tokens for call in agent_calls)}
+
+    return {
+        "wall seconds": finished - started,
+        "stages": stages,
+        "llm calls": len(calls),
+        "prompt tokens": sum(call.prompt_tokens for call in calls),
+        "completion tokens": sum(call.completion_tokens for call in calls),
+        "peak rss mb": peak_rss_mb(),
+        "rss growth mb": peak_rss_mb() - rss_before,
+        "output tokens": count_tokens(output.raw),
+        "newsletter events": output.raw.count("Sign Up:"),
+    }
+
+
+def print_report(title: str, result: dict) -> None:
+    print(f"{title}: {result['wall seconds']:.2f} s wall, peak RSS {result['peak rss mb']:.0f} MB "
+          f"(+{result['rss growth mb']:.0f} MB during the run)")
+    for name, stage in result["stages"].items():
+        line = f"  {name:26} {stage['seconds']:7.2f} s"
+        if "llm calls" in stage:
+            line += (f"  (LLM {stage['llm seconds']:.2f} s, tools and crewai {stage['other seconds']:.2f} s)"
+                     f"  {stage['llm calls']} calls, {stage['prompt tokens']:,} prompt"
+                     f" / {stage['completion tokens']:,} completion tokens")
+        elif "sources" in stage:
+            line += (f"  {stage['sources']} sources, {stage['requests']} requests"
+                     f" ({stage['failed requests']} failed), {stage['bytes'] / 1e6:.1f} MB")
+        print(line)
+    print(f"  {'total':26} {result['llm calls']} LLM calls, {result['prompt tokens']:,} prompt"
+          f" / {result['completion tokens']:,} completion tokens; newsletter with"
+          f" {result['newsletter events']} events ({result['output tokens']:,} tokens)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per page request")
+    parser.add_argument("--jitter", type=float, default=0.1, help="extra random seconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="share of pages that fail")
+    parser.add_argument("--failure-mode", choices=FAILURE_MODES, default=FAILURE_MODES[0])
+    parser.add_argument("--page-kb", type=int, default=150, help="size of synthesized pages")
+    parser.add_argument("--first-token-latency", type=float, default=0.4, help="seconds per LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.002, help="seconds per completion token")
+    parser.add_argument("--document", action="store_true", help="also upload a synthetic event list")
+    parser.add_argument("--warm", action="store_true", help="run a second time on the first run's caches")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the crew's own output")
+    parser.add_argument("--record", action="store_true",
+                        help="save the live pages of every planned source URL as fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        statuses = record(subquery.url for subquery in plan_queries("AI events"))
+        print(f"recorded {sum(status == 200 for status in statuses.values())}/{len(statuses)} pages")
+        return
+
+    web = FakeWeb(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                  failure_mode=args.failure_mode, page_kb=args.page_kb)
+    web.start()
+    llm = ScriptedLLM(model="scripted", script=NEWSLETTER_SCRIPT,
+                      first_token_latency=args.first_token_latency, seconds_per_token=args.token_latency)
+    llm_cache.set_llm_factory(lambda **kwargs: llm)
+    document = synthetic_document() if args.document else None
+    print(f"caches in {os.environ['NEWSLETTER_CACHE_DIR']}\n")
+
+    results = {}
+    try:
+        results["cold"] = run_once(web, llm, document, args.verbose)
+        print_report("cold run", results["cold"])
+        if args.warm:
+            results["warm"] = run_once(web, llm, document, args.verbose)
+            print_report("warm run", results["warm"])
+    finally:
+        llm_cache.set_llm_factory(None)
+        web.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark for document ingestion of large PDFs.
+
+Compares the old upload path (``content += page.extract_text()`` in a loop)
+with doc_ingest's sequential and process-pool extraction, and with a
+re-upload served from the content-hash cache. Without ``--pdf`` an event
+brochure of ``--pages`` pages is generated.
+
+    python -m benchmarks.bench_ingest [--pdf FILE] [--pages N] [--workers N]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import doc_ingest
+
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def synthetic_brochure(pages: int = 120, events_per_page: int = 6) -> bytes:
+    """A text PDF shaped like an event brochure, written without a PDF library"""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page in range(pages):
+        lines = [f"Bay Area AI Week - page {page + 1}"]
+        for i in range(events_per_page):
+            n = page * events_per_page + i
+            lines += [
+                f"GenAI Builders Meetup #{n}: agents, retrieval and evaluation",
+                f"Tue, Aug {1 + n % 28} 2025, 6:30 PM - 9:00 PM",
+                f"{100 + n} Market Street, San Francisco, CA",
+                f"Register: https://lu.ma/genai-builders-{n}",
+                "Talks, demos and networking with local founders and researchers. " * 2,
+            ]
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(f"{_pdf_string(line)} Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def old_upload_path(data: bytes) -> str:
+    import PyPDF2
+    content = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        content += page.extract_text() + "\n"
+    return content
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="PDF to ingest instead of a generated brochure")
+    parser.add_argument("--pages", type=int, default=doc_ingest.PARALLEL_MIN_PAGES + 100)
+    parser.add_argument("--workers", type=int, default=max(2, doc_ingest.WORKERS))
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, "rb") as f:
+            data = f.read()
+    else:
+        data = synthetic_brochure(args.pages)
+    page_count = len(doc_ingest._pdf_reader(io.BytesIO(data)).pages)
+    print(f"{page_count} pages, {len(data) / 1024:.0f} KB, {args.workers} workers, {os.cpu_count()} CPUs")
+
+    with tempfile.TemporaryDirectory() as directory:
+        doc_ingest.storage.CACHE_DIR = directory
+        cache = doc_ingest.DocumentCache()
+        runs = [
+            ("old += loop", lambda: old_upload_path(data)),
+            ("sequential", lambda: "\n".join(doc_ingest.iter_pdf_pages(io.BytesIO(data), workers=1))),
+            ("process pool", lambda: "\n".join(doc_ingest.iter_pdf_pages(io.BytesIO(data), workers=args.workers))),
+            ("ingest (cold)", lambda: doc_ingest.ingest("brochure.pdf", io.BytesIO(data), cache).text),
+            ("ingest (cached)", lambda: doc_ingest.ingest("brochure.pdf", io.BytesIO(data), cache).text),
+        ]
+        print(f"{'method':16} {'seconds':>8} {'chars':>9}")
+        for name, run in runs:
+            seconds, text = timed(run)
+            print(f"{name:16} {seconds:8.3f} {len(text):9d}")
+
+
+if __name__ == "__main__":
+    main()
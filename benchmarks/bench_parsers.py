@@ -0,0 +1,169 @@
+"""Micro-benchmark for the html_extract backends.
+
+Compares parse time and peak memory of each backend (plus the full
+BeautifulSoup tree the scraper used to build) on saved copies of the source
+pages. Every measurement runs in a fresh process so earlier runs do not skew
+it: "py peak" is the tracemalloc peak of the Python heap, "rss peak" the
+sampled resident-memory growth over the process's pre-parse level (which
+also covers lxml's C allocations).
+
+    python -m benchmarks.bench_parsers --save [URL ...]   # save pages once
+    python -m benchmarks.bench_parsers [--pages DIR] [--repeat N]
+
+Without saved pages a synthetic event-listing page is generated instead.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+
+import html_extract
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+
+def _soup_full(content):
+    # The pre-html_extract approach: full tree, then find_all
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.find_all("a", href=True), soup.find_all(list(html_extract.HEADING_TAGS))
+
+
+def _run(name, content):
+    if name == "soup-full":
+        return _soup_full(content)
+    return html_extract.extract_page(content, name)
+
+
+def synthetic_page(cards=2000) -> bytes:
+    """A large listing page shaped like an Eventbrite search result"""
+    card = (
+        '<div class="card"><div class="meta"><span>Tue, Aug 26</span><span>7:00 PM</span></div>'
+        '<h3 class="title"><a href="https://www.eventbrite.com/e/ai-meetup-{i}">GenAI Builders Meetup #{i}</a></h3>'
+        '<p>San Francisco, CA &middot; Hosted by SF AI Collective &middot; ' + "lorem ipsum " * 20 + '</p>'
+        '<a href="/o/organizer-{i}">Organizer</a><a href="https://www.eventbrite.com/e/ai-meetup-{i}#tickets">Tickets</a></div>'
+    )
+    body = "".join(card.format(i=i) for i in range(cards))
+    return f"<html><head><title>AI events</title></head><body><h1>AI events in San Francisco</h1>{body}</body></html>".encode()
+
+
+def _rss() -> int:
+    """Current resident set size in bytes"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize()
+
+
+def _peak_rss_growth(name, content) -> int:
+    """Peak RSS above the pre-run level while parsing ``content`` once.
+
+    ru_maxrss is useless here: the interpreter start-up and imports already
+    set a higher peak than a streaming parse ever reaches, so lxml and
+    html.parser reported 0. Sampling the current RSS from a thread also
+    catches libxml2's C allocations, which tracemalloc does not see.
+    """
+    baseline = _rss()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, _rss())
+            time.sleep(0.0005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        _run(name, content)
+    finally:
+        done.set()
+        sampler.join()
+    return max(peak, _rss()) - baseline
+
+
+def _measure(name, content, repeat, queue):
+    # Imports and the sampler thread's own start-up are not part of the measurement
+    _peak_rss_growth(name, b"<html></html>")
+    rss_peak = _peak_rss_growth(name, content)
+    tracemalloc.start()
+    _run(name, content)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _run(name, content)
+        timings.append(time.perf_counter() - t0)
+    queue.put((statistics.median(timings), py_peak, rss_peak))
+
+
+def measure(name, content, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(name, content, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def save_pages(urls, directory):
+    import http_client
+    os.makedirs(directory, exist_ok=True)
+    for url in urls:
+        response = http_client.get(url, timeout=15)
+        name = page_file_name(url)
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(response.content)
+        print(f"saved {url} -> {name} ({len(response.content)} bytes, HTTP {response.status_code})")
+
+
+def page_file_name(url):
+    return "".join(c if c.isalnum() or c in "-." else "_" for c in url.split("://", 1)[-1])[:120] + ".html"
+
+
+def available_backends():
+    names = []
+    for name in [*html_extract.BACKENDS, "soup-full"]:
+        try:
+            _run(name, b"<html></html>")
+            names.append(name)
+        except ImportError:
+            print(f"skipping {name}: dependency not installed")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=PAGES_DIR, help="directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", nargs="*", metavar="URL",
+                        help="download pages into --pages and exit (default: every registered source)")
+    args = parser.parse_args()
+
+    if args.save is not None:
+        from event_sources import load_registry
+        save_pages(args.save or load_registry().urls_for("AI"), args.pages)
+        return
+
+    pages = {os.path.basename(path): open(path, "rb").read()
+             for path in sorted(glob.glob(os.path.join(args.pages, "*.html")))}
+    if not pages:
+        print(f"no saved pages in {args.pages}, using a synthetic listing page")
+        pages = {"synthetic-listing.html": synthetic_page()}
+
+    backends = available_backends()
+    print(f"{'page':40} {'backend':12} {'median ms':>10} {'py peak KB':>11} {'rss peak KB':>12}")
+    for page_name, content in pages.items():
+        for backend in backends:
+            seconds, py_peak, rss_peak = measure(backend, content, args.repeat)
+            print(f"{page_name[:40]:40} {backend:12} {seconds * 1000:10.1f} {py_peak / 1024:11.0f} {rss_peak / 1024:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of the Serper search backend against the local stub.
+
+    python -m benchmarks.bench_search [--queries N] [--latency SECONDS]
+
+Compares one request per query (the old ``GoogleSerperAPIWrapper.run``
+pattern) with one batched request, a cached rerun, and the size of the
+flattened blob versus the compact rendering.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("NEWSLETTER_CACHE_DIR", tempfile.mkdtemp(prefix="bench_search_"))
+
+from benchmarks.serper_stub import serve  # noqa: E402
+from serper_search import SearchCache, SerperSearch, render_results  # noqa: E402
+
+
+def flattened(result) -> str:
+    """Roughly what GoogleSerperAPIWrapper.run returns: every snippet joined"""
+    return " ".join(hit.snippet for hit in result.organic + result.news)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub seconds per request")
+    args = parser.parse_args()
+
+    server, url = serve(latency=args.latency)
+    queries = [f"new open source llm tool {i}" for i in range(args.queries)]
+    cache = SearchCache(db_name="bench_serper.sqlite3")
+    cache.clear()
+    search = SerperSearch(api_key="stub", base_url=url, cache=cache)
+
+    start = time.perf_counter()
+    one_by_one = [search._post([query])[0] for query in queries]
+    sequential = time.perf_counter() - start
+    server.RequestHandlerClass.requests = 0
+
+    start = time.perf_counter()
+    results = search.search(queries)
+    batched = time.perf_counter() - start
+    batch_requests = server.RequestHandlerClass.requests
+
+    start = time.perf_counter()
+    search.search(queries)
+    cached = time.perf_counter() - start
+
+    blob = sum(len(flattened(result)) for result in results)
+    compact = len(render_results(results))
+    print(f"{len(queries)} queries, stub latency {args.latency * 1000:.0f} ms")
+    print(f"one request per query: {sequential * 1000:8.1f} ms ({len(one_by_one)} requests)")
+    print(f"batched:               {batched * 1000:8.1f} ms ({batch_requests} request)")
+    print(f"cached rerun:          {cached * 1000:8.1f} ms (0 requests)")
+    print(f"output: flattened {blob} chars, compact {compact} chars (with titles and links)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Micro-benchmark for source lookup and the per-platform event-link extractors.
+
+    python -m benchmarks.bench_sources [--links N] [--repeat N]
+
+Each registered source's extractor runs on its own against a synthetic link
+list, so a slow pattern shows up under its source name.
+"""
+import argparse
+import timeit
+
+from event_sources import load_registry
+
+
+def synthetic_links(domain, count):
+    links = []
+    for i in range(count):
+        links.extend([
+            f"/event/evt-{i}",
+            f"https://www.{domain}/group-{i}/events/{i}/",
+            f"https://www.{domain}/e/ai-meetup-{i}",
+            f"/about/team-{i}",
+            f"https://twitter.com/share?u={i}",
+            "#",
+        ])
+    return links
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=500, help="links per synthetic page (x6)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    registry = load_registry()
+    urls = registry.urls_for("AI events")
+    lookups = timeit.timeit(lambda: [registry.lookup(url) for url in urls], number=args.repeat * 100)
+    print(f"lookup: {lookups / (args.repeat * 100 * len(urls)) * 1e6:.2f} us per URL over {len(registry)} sources\n")
+
+    print(f"{'source':24} {'links':>7} {'matches':>8} {'ms per page':>12}")
+    for source in registry:
+        page_url = source.urls_for("AI")[0] if source.url_templates else f"https://{source.domain}/"
+        links = synthetic_links(source.domain, args.links)
+        matches = len(source.extract_event_urls(page_url, links))
+        seconds = timeit.timeit(lambda: source.extract_event_urls(page_url, links), number=args.repeat)
+        print(f"{source.name:24} {len(links):7} {matches:8} {seconds / args.repeat * 1000:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Startup-time benchmark for the Streamlit app and the crew scripts.
+
+    python -m benchmarks.bench_startup [--repeat N] [--top N] [module ...]
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+(scripts no longer run their crew on import). Reported per module: the
+median wall time of the import, whether crewai got loaded, and the
+module's own imports that took longest, cumulative over their imports.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = ["app", "google_newsletter", "reddit_newsletter", "startup_crew"]
+
+
+def import_once(module):
+    """(wall seconds, importtime stderr, error line or None) of importing ``module``"""
+    code = f"import sys; import {module}; print('crewai' in sys.modules)"
+    env = dict(os.environ, NEWSLETTER_CACHE_DIR=os.environ.get("NEWSLETTER_CACHE_DIR", tempfile.gettempdir()))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    error = None
+    if proc.returncode:
+        lines = [line for line in proc.stderr.splitlines() if line.strip() and not line.startswith("import time:")]
+        error = next((line for line in reversed(lines) if re.match(r"[\w.]+(?:Error|Exception)\b", line)),
+                     lines[-1] if lines else "failed")
+    return wall, proc.stdout.strip() == "True", proc.stderr, error
+
+
+def direct_imports(stderr, module):
+    """{package: cumulative microseconds} of the imports made directly by ``module``"""
+    children = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # nested imports are indented by two spaces
+        if depth == 1:
+            children[name.strip()] = children.get(name.strip(), 0) + int(cumulative)
+        elif depth == 0:
+            # Imports are listed before the module that made them
+            if name.strip() == module:
+                return children
+            children = {}
+    return children
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports listed per module")
+    args = parser.parse_args()
+
+    baseline = statistics.median(import_once("os")[0] for _ in range(args.repeat))
+    print(f"interpreter startup: {baseline * 1000:.0f} ms\n")
+    for module in args.modules:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        wall = statistics.median(run[0] for run in runs)
+        _, crewai_loaded, stderr, error = runs[-1]
+        status = f"FAILED: {error}" if error else f"crewai {'loaded' if crewai_loaded else 'not loaded'}"
+        print(f"{module}: {wall * 1000:.0f} ms ({status})")
+        heaviest = sorted(direct_imports(stderr, module).items(), key=lambda item: item[1], reverse=True)
+        for name, micros in heaviest[:args.top]:
+            print(f"  {micros / 1000:9.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
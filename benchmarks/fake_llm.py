@@ -0,0 +1,130 @@
+"""Scripted crewai LLM for offline, deterministic crew runs.
+
+``ScriptedLLM`` answers each agent from a per-role script instead of a
+model: the n-th call an agent makes for a task gets the n-th response (the
+last one repeats). A response is a string or a function of the messages, so
+an agent can call its tool first and then hand the observation on. Output
+is "generated" at ``seconds_per_token`` after ``first_token_latency``, and
+every call is recorded with its prompt and completion token counts.
+
+``NEWSLETTER_SCRIPT`` drives the app.py crew: the researcher and the loader
+each call their tool once and report what it returned, the writer turns the
+events in its context into the HTML layout and the critic approves it.
+"""
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Union
+
+from crewai.llms.base_llm import BaseLLM
+from pydantic import PrivateAttr
+
+from compaction import count_tokens
+
+Response = Union[str, Callable[[List[dict]], str]]
+
+
+class LLMCall(NamedTuple):
+    agent: str
+    task: str
+    prompt_tokens: int
+    completion_tokens: int
+    started: float  # time.time(), comparable with the progress log
+    finished: float
+
+
+def _text(messages: List[dict]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+
+def final_answer(text: str) -> str:
+    return f"Thought: I now know the final answer\nFinal Answer: {text}"
+
+
+def use_tool(tool: str, **arguments) -> str:
+    arguments = ", ".join(f'"{name}": "{value}"' for name, value in arguments.items())
+    return f"Thought: I should use the {tool} tool\nAction: {tool}\nAction Input: {{{arguments}}}"
+
+
+def report_observation(messages: List[dict]) -> str:
+    """Final answer repeating the last tool observation, as a diligent agent would"""
+    text = _text(messages)
+    observation = text.rpartition("Observation:")[2].strip()
+    return final_answer(observation or "No results.")
+
+
+_EVENT_LINE = re.compile(r"^(?:\d+\.\s*)?(?P<title>[^|\n]+?) \| (?P<date>\d{4}-\d{2}-\d{2})"
+                         r"(?P<rest>[^\n]*?)SIGNUP URL: (?P<url>\S+)", re.MULTILINE)
+
+
+def write_newsletter(messages: List[dict]) -> str:
+    """The writer's HTML, one list per event found in its context"""
+    seen = set()
+    sections = ["<h1>This week in AI events</h1>"]
+    for match in _EVENT_LINE.finditer(_text(messages)):
+        if match["url"] in seen:
+            continue
+        seen.add(match["url"])
+        sections.append(f"<h2>{match['date']}</h2>\n<ul>\n<li><strong>{match['title'].strip()}</strong></li>\n"
+                        f"<li><strong>Sign Up:</strong> {match['url']}</li>\n</ul>")
+    return final_answer("\n".join(sections))
+
+
+def approve_html(messages: List[dict]) -> str:
+    """The critic's answer: the HTML lines of the draft in its context, unchanged"""
+    lines = [line for line in _text(messages).splitlines() if line.startswith("<")]
+    return final_answer("\n".join(lines) or "<p>No events.</p>")
+
+
+NEWSLETTER_SCRIPT: Dict[str, List[Response]] = {
+    "Senior Researcher": [use_tool("Web Search", query="AI events"), report_observation],
+    "Document Loader": [use_tool("Load document", query="AI events dates signup URLs"), report_observation],
+    "Senior Technical Writer": [write_newsletter],
+    "Expert Writing Critic": [approve_html],
+}
+
+
+class ScriptedLLM(BaseLLM):
+    """crewai LLM that answers from ``script`` (agent role -> responses)"""
+
+    script: Dict[str, List[Any]] = {}
+    first_token_latency: float = 0.0  # seconds
+    seconds_per_token: float = 0.0
+    _calls: List[LLMCall] = PrivateAttr(default_factory=list)
+    _turns: Dict[tuple, int] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def calls(self) -> List[LLMCall]:
+        with self._lock:
+            return list(self._calls)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        started = time.time()
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        role = getattr(from_agent, "role", "") or ""
+        task = getattr(from_task, "name", None) or role
+        with self._lock:
+            turn = self._turns.get((role, id(from_task)), 0)
+            self._turns[(role, id(from_task))] = turn + 1
+        responses = self.script.get(role) or [final_answer("Done.")]
+        response = responses[min(turn, len(responses) - 1)]
+        if callable(response):
+            response = response(messages)
+        completion_tokens = count_tokens(response)
+        time.sleep(self.first_token_latency + completion_tokens * self.seconds_per_token)
+        with self._lock:
+            self._calls.append(LLMCall(role, task, count_tokens(_text(messages)), completion_tokens,
+                                       started, time.time()))
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return False  # crewai falls back to the text Action / Final Answer protocol
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
@@ -0,0 +1,215 @@
+"""Offline stand-in for the event sources crawled by the research tool.
+
+``FakeWeb`` serves one HTML page per source URL from a local threaded HTTP
+server, with configurable latency and failure injection. ``RewriteAdapter``
+is mounted on every pooled session through ``http_client.route_all``, so the
+real fetch path - page cache, host health, rate limits, the concurrent
+fetch stage - runs unchanged against it.
+
+Pages come from ``benchmarks/fixtures/<key>.html`` when recorded there (see
+``record``), otherwise from a deterministic listing synthesized for the
+source: event headings with dates relative to today, signup links matching
+the source's link pattern and filler markup up to a realistic page size.
+"""
+import functools
+import hashlib
+import os
+import random
+import socket
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+
+from requests.adapters import HTTPAdapter
+
+import http_client
+from event_sources import GENERIC_LINK_PATTERN, SourceRegistry, default_registry, extract_event_urls
+from fetcher import host_of
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ORIGINAL_URL_HEADER = "X-Original-URL"
+
+# Failure modes: an HTTP 503, or a connection closed without any response
+STATUS = "status"
+RESET = "reset"
+FAILURE_MODES = (STATUS, RESET)
+
+_TOPICS = ("GenAI Builders Night", "LLM Agents Workshop", "Machine Learning Meetup", "AI Startup Demo Day",
+           "Open Source AI Hackathon", "Deep Learning Study Group", "AI Founders Breakfast", "RAG in Production",
+           "Computer Vision Lab", "AI Safety Reading Group", "MLOps Happy Hour", "Robotics and AI Forum")
+
+
+def fixture_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _event_link(page_url: str, slug: str, number: int, pattern) -> str:
+    """The first link shape that the source's extractor accepts"""
+    host = host_of(page_url)
+    candidates = [f"https://{host}/ai-group-{number}/events/{300000 + number}/",
+                  f"https://{host}/e/{slug}-{number}",
+                  f"https://{host}/event/evt-{slug}-{number}",
+                  f"https://{host}/events/{slug}-{number}"]
+    for candidate in candidates:
+        if extract_event_urls(page_url, [candidate], pattern):
+            return candidate
+    return candidates[-1]
+
+
+def synthetic_page(url: str, registry: SourceRegistry = None, today: date = None, events: int = 12,
+                   page_kb: int = 150) -> bytes:
+    """A listing page for ``url`` that the research scraper turns into ``events`` events"""
+    registry = registry or default_registry()
+    today = today or date.today()
+    source = registry.lookup(url)
+    name = source.name if source else host_of(url)
+    pattern = source.link_pattern if source else GENERIC_LINK_PATTERN
+    rng = random.Random(url)
+    parts = [f'<html><head><meta charset="utf-8"><title>{name} events</title></head><body>',
+             '<nav><a href="/">Home</a> <a href="/about">About</a> <a href="/login">Log in</a></nav>',
+             f"<h1>Upcoming events on {name}</h1>"]
+    for i in range(events):
+        # Most events fall inside the newsletter window, a few weeks out
+        when = today + timedelta(days=rng.randrange(1, 10) if i % 5 else rng.randrange(15, 40))
+        topic = _TOPICS[(i + rng.randrange(len(_TOPICS))) % len(_TOPICS)]
+        slug = "-".join(topic.lower().split())
+        link = _event_link(url, slug, rng.randrange(10000), pattern)
+        parts.append(
+            f'<div class="event-card"><h3>{when:%b} {when.day} · {rng.randrange(9, 20)}:00 · {topic}</h3>'
+            f"<p>Join the {name} community for talks and demos. Location: {rng.randrange(100, 999)} Market Street, "
+            f'San Francisco</p><a href="{link}">Register</a></div>'
+        )
+    filler = '<div class="promo"><p>Discover more events near you.</p><a href="/explore">Explore</a></div>'
+    while sum(len(part) for part in parts) < page_kb * 1024:
+        parts.append(filler)
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def fixture_page(url: str, registry: SourceRegistry = None, page_kb: int = 150) -> bytes:
+    """The recorded page for ``url`` if there is one, else a synthetic listing"""
+    path = os.path.join(FIXTURE_DIR, fixture_key(url) + ".html")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return synthetic_page(url, registry, page_kb=page_kb)
+
+
+def record(urls: Iterable[str], timeout: float = 20) -> Dict[str, Optional[int]]:
+    """Save the live pages at ``urls`` as fixtures; returns each URL's status"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    statuses = {}
+    for url in urls:
+        try:
+            response = http_client.get(url, timeout=timeout)
+        except Exception as e:
+            print(f"Could not record {url}: {e}")
+            statuses[url] = None
+            continue
+        statuses[url] = response.status_code
+        if response.status_code == 200:
+            with open(os.path.join(FIXTURE_DIR, fixture_key(url) + ".html"), "wb") as f:
+                f.write(response.content)
+    return statuses
+
+
+class RewriteAdapter(HTTPAdapter):
+    """Transport that sends every request to the fake web server instead of its host"""
+
+    def __init__(self, base_url: str, **kwargs):
+        self.base_url = base_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        request.headers[ORIGINAL_URL_HEADER] = request.url
+        request.url = f"{self.base_url}/{fixture_key(request.url)}"
+        return super().send(request, **kwargs)
+
+
+class FakeWeb:
+    def __init__(self, latency: float = 0.1, jitter: float = 0.05, failure_rate: float = 0.0,
+                 failure_mode: str = STATUS, host_latency: Dict[str, float] = None,
+                 registry: SourceRegistry = None, page_kb: int = 150, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.host_latency = host_latency or {}
+        self.registry = registry or default_registry()
+        self.page_kb = page_kb
+        self.seed = seed
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def fails(self, url: str) -> bool:
+        """Whether ``url`` is one of the failing pages (stable for a given seed)"""
+        return random.Random(f"{self.seed}:{url}").random() < self.failure_rate
+
+    def delay(self, url: str) -> float:
+        """Seconds before answering ``url``; ``host_latency`` keys match subdomains too"""
+        base = self.latency
+        host = host_of(url)
+        while host:
+            if host in self.host_latency:
+                base = self.host_latency[host]
+                break
+            _, _, host = host.partition(".")
+        return base + random.Random(f"{self.seed}:{url}:latency").uniform(0, self.jitter)
+
+    @functools.lru_cache(maxsize=None)
+    def page(self, url: str) -> bytes:
+        return fixture_page(url, self.registry, self.page_kb)
+
+    def _handler(self):
+        web = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real hosts
+
+            def do_GET(self):
+                url = self.headers.get(ORIGINAL_URL_HEADER, "")
+                with web._lock:
+                    web.requests += 1
+                time.sleep(web.delay(url))
+                if web.fails(url):
+                    with web._lock:
+                        web.failures += 1
+                    if web.failure_mode == RESET:
+                        self.connection.shutdown(socket.SHUT_RDWR)
+                        self.close_connection = True
+                        return
+                    self.send_error(503)
+                    return
+                body = web.page(url)
+                with web._lock:
+                    web.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        """Serve in a daemon thread and route all pooled sessions here; returns the base URL"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        http_client.route_all(functools.partial(RewriteAdapter, base_url))
+        return base_url
+
+    def stop(self) -> None:
+        http_client.route_all(None)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
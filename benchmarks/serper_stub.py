@@ -0,0 +1,82 @@
+"""Local stand-in for the Serper API.
+
+    python -m benchmarks.serper_stub [--port 8765] [--latency 0.3]
+    SERPER_BASE_URL=http://127.0.0.1:8765 streamlit run google_newsletter.py
+
+Answers ``POST /search`` (a query object or a batch of them) with canned,
+deterministic organic, top-story and news results derived from each query,
+after ``--latency`` seconds per request. ``serve()`` starts it in a
+background thread for benchmarks and tests.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def canned_result(query: dict) -> dict:
+    q = query.get("q", "")
+    slug = hashlib.sha1(q.encode("utf-8")).hexdigest()[:8]
+    num = int(query.get("num", 10))
+    return {
+        "searchParameters": {**query, "type": "search", "engine": "google"},
+        "organic": [
+            {"title": f"{q} - result {i}", "link": f"https://example.com/{slug}/{i}",
+             "snippet": f"Everything about {q}, part {i}. " * 3, "position": i}
+            for i in range(1, num + 1)
+        ],
+        "topStories": [
+            {"title": f"{q} makes headlines", "link": f"https://news.example.com/{slug}",
+             "source": "Example News", "date": "2 hours ago"},
+        ],
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    requests = 0
+
+    def do_POST(self):
+        type(self).requests += 1
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.latency)
+        if self.path.rstrip("/") != "/search":
+            self.send_error(404)
+            return
+        payload = [canned_result(query) for query in body] if isinstance(body, list) else canned_result(body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 0, latency: float = 0.0):
+    """Start the stub in a daemon thread; returns the server and its base URL"""
+    handler = type("Handler", (StubHandler,), {"latency": latency, "requests": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request")
+    args = parser.parse_args()
+    server, url = serve(args.port, args.latency)
+    print(f"Serper stub listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Task-level checkpoints for sequential crews.
+
+Each task's output is saved to SQLite under a key derived from the run's
+inputs, today's date, the task's own definition (description, expected
+output, agent) and the keys of the tasks whose output it reads. Changing a
+task therefore changes its key and the keys of everything downstream, while
+the tasks before it keep theirs.
+
+``kickoff_with_checkpoints`` restores the longest prefix of tasks that have
+a checkpoint and kicks off the crew with only the remaining tasks, wiring
+the restored outputs into their context exactly as a full run would. A run
+that failed in the critic step, or a change to the critic prompt, reruns
+the critic alone instead of the crawl and every LLM call before it.
+"""
+import hashlib
+import os
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, List, Optional
+
+import storage
+
+if TYPE_CHECKING:  # crewai is imported on first kickoff, not with this module
+    from crewai import Crew, Task
+    from crewai.crews.crew_output import CrewOutput
+
+MAX_AGE = float(os.environ.get("CHECKPOINT_MAX_AGE", 7 * 24 * 3600))  # seconds
+
+
+class CheckpointStore:
+    def __init__(self, db_name: str = "checkpoints.sqlite3", max_age: float = MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS task_outputs (
+                key TEXT PRIMARY KEY,
+                run_key TEXT NOT NULL,
+                task_index INTEGER NOT NULL,
+                raw TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT raw FROM task_outputs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, run_key: str, task_index: int, raw: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO task_outputs VALUES (?, ?, ?, ?, ?)",
+                             (key, run_key, task_index, raw, now))
+            self._db.execute("DELETE FROM task_outputs WHERE created_at < ?", (now - self.max_age,))
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
+
+
+def _upstream(tasks: List["Task"], index: int) -> List["Task"]:
+    """The tasks whose output ``tasks[index]`` receives as context in a sequential run"""
+    task = tasks[index]
+    if isinstance(task.context, list):
+        return task.context
+    if not task.context:
+        return []
+    # Default context: async tasks see the last synchronous output, sync tasks every earlier output
+    if task.async_execution:
+        return next(([t] for t in reversed(tasks[:index]) if not t.async_execution), [])
+    return tasks[:index]
+
+
+def task_keys(tasks: List["Task"], run_key: str, day: date = None) -> List[str]:
+    """Checkpoint key of every task, chained through the tasks it reads from"""
+    day = day or date.today()
+    keys = {}
+    for index, task in enumerate(tasks):
+        agent = task.agent
+        parts = [run_key, day.isoformat(), task.description, task.expected_output or "",
+                 getattr(agent, "role", ""), getattr(agent, "goal", ""), getattr(agent, "backstory", "")]
+        parts.extend(keys.get(id(upstream), "") for upstream in _upstream(tasks, index))
+        keys[id(task)] = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return [keys[id(task)] for task in tasks]
+
+
+def kickoff_with_checkpoints(crew: "Crew", run_key: str, store: CheckpointStore = None) -> "CrewOutput":
+    """Run a sequential crew, resuming after the last task checkpointed for ``run_key``"""
+    from crewai.crews.crew_output import CrewOutput
+    from crewai.tasks.task_output import TaskOutput
+
+    store = store or get_checkpoint_store()
+    tasks = list(crew.tasks)
+    keys = task_keys(tasks, run_key)
+
+    resume_at = 0
+    while resume_at < len(tasks):
+        raw = store.get(keys[resume_at])
+        if raw is None:
+            break
+        task = tasks[resume_at]
+        task.output = TaskOutput(description=task.description, name=task.name, raw=raw,
+                                 expected_output=task.expected_output,
+                                 agent=getattr(task.agent, "role", "") or "")
+        if crew.task_callback:
+            crew.task_callback(task.output)
+        resume_at += 1
+
+    if resume_at == len(tasks):
+        return CrewOutput(raw=tasks[-1].output.raw, tasks_output=[task.output for task in tasks])
+
+    contexts = [task.context for task in tasks]
+    if resume_at:
+        # The skipped tasks are no longer part of the crew, so spell out the
+        # context the remaining ones would have received from them
+        for index in range(resume_at, len(tasks)):
+            if not isinstance(tasks[index].context, list):
+                tasks[index].context = _upstream(tasks, index)
+        crew.tasks = tasks[resume_at:]
+    for task in tasks[resume_at:]:
+        task.output = None  # only what this kickoff produces gets saved
+    try:
+        output = crew.kickoff()
+    finally:
+        # Save whatever finished, also when a later task failed
+        for index in range(resume_at, len(tasks)):
+            if tasks[index].output is not None:
+                store.put(keys[index], run_key, index, tasks[index].output.raw)
+        # Leave the crew as it was given to us, so it can be kicked off again
+        crew.tasks = tasks
+        for task, context in zip(tasks, contexts):
+            task.context = context
+    # Same shape as a full run, whichever task it resumed from
+    return CrewOutput(raw=output.raw, pydantic=output.pydantic, json_dict=output.json_dict,
+                      tasks_output=[task.output for task in tasks], token_usage=output.token_usage)
@@ -0,0 +1,91 @@
+"""Token-budgeted compaction of research output.
+
+The research text is passed as context to every later task of the
+sequential crew, so its size is paid for at every step. Compaction dedupes
+events, drops past ones, ranks the rest by relevance and date and keeps as
+many as fit in the token budget.
+"""
+import math
+import os
+import re
+from datetime import date, timedelta
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from events import Event, dedupe_events
+
+TOKEN_BUDGET = int(os.environ.get("RESEARCH_TOKEN_BUDGET", 1500))
+WINDOW_DAYS = 10  # the tasks ask for events in the next 7 to 10 days
+
+_WORD = re.compile(r"\w+")
+
+
+def count_tokens(text: str) -> int:
+    """Approximate LLM token count (~4 characters per token for English text)"""
+    return math.ceil(len(text) / 4)
+
+
+class CompactionReport(NamedTuple):
+    events_in: int
+    events_kept: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+def _event_date(event: Event) -> Optional[date]:
+    try:
+        return date.fromisoformat(event.date) if event.date else None
+    except ValueError:
+        return None
+
+
+def rank_events(events: Iterable[Event], query: str = "", today: date = None) -> List[Event]:
+    """Order events by relevance, then date; events dated before today are dropped"""
+    today = today or date.today()
+    window_end = today + timedelta(days=WINDOW_DAYS)
+    query_words = {word for word in _WORD.findall(query.lower()) if len(word) > 2}
+
+    ranked = []
+    for position, event in enumerate(events):
+        when = _event_date(event)
+        if when is not None and when < today:
+            continue
+        title_words = set(_WORD.findall(event.title.lower()))
+        score = (
+            3 * (event.category == "ai")
+            + 2 * bool(event.url)
+            + 2 * (when is not None and when <= window_end)
+            + len(query_words & title_words)
+            + bool(event.title)
+        )
+        # Highest score first; among equals the soonest date, then page order
+        ranked.append(((-score, when or date.max, position), event))
+    ranked.sort(key=lambda item: item[0])
+    return [event for _, event in ranked]
+
+
+def compact_events(
+    events: Iterable[Event],
+    render,
+    budget: int = TOKEN_BUDGET,
+    query: str = "",
+    today: date = None,
+) -> Tuple[List[Event], CompactionReport]:
+    """Keep the best-ranked events whose rendered lines fit in ``budget`` tokens.
+
+    ``render(event)`` returns the line an event will occupy in the prompt.
+    """
+    events = list(events)
+    tokens_before = sum(count_tokens(render(event)) for event in events)
+    kept = []
+    used = 0
+    for event in rank_events(dedupe_events(events), query, today):
+        cost = count_tokens(render(event))
+        if used + cost > budget:
+            continue
+        kept.append(event)
+        used += cost
+    return kept, CompactionReport(len(events), len(kept), tokens_before, used)
@@ -0,0 +1,145 @@
+"""Local retrieval over uploaded documents for the "Load document" tool.
+
+Documents are split into overlapping chunks of a few hundred tokens and
+indexed with BM25 in pure Python, so no network or embedding model is
+needed. A query returns the top-k chunks, boosted when they contain dates,
+URLs or event/AI keywords, which keeps the loader agent's prompt the same
+size however long the uploaded catalog is.
+"""
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple
+
+from compaction import count_tokens
+from keyword_classifier import heading_classifier
+
+CHUNK_TOKENS = 200
+OVERLAP_LINES = 1  # repeated at the start of the next chunk so events aren't cut in half
+TOP_K = int(os.environ.get("DOC_TOP_K", 8))
+
+_WORD = re.compile(r"\w+")
+_URL = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+_DATE = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b"
+    r"|\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b"
+    r"|\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b"
+    r"|\b(?:mon|tues?|wed|thu(?:rs)?|fri|sat|sun)(?:day)?\b",
+    re.IGNORECASE,
+)
+
+
+class Chunk(NamedTuple):
+    index: int
+    text: str
+
+
+class ScoredChunk(NamedTuple):
+    score: float
+    chunk: Chunk
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words with a plural "s" stripped, so "events" matches "event" """
+    return [word[:-1] if len(word) > 3 and word.endswith("s") else word
+            for word in _WORD.findall(text.lower())]
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS, overlap_lines: int = OVERLAP_LINES) -> List[Chunk]:
+    """Pack consecutive non-empty lines into chunks of about ``max_tokens``"""
+    chunks = []
+    lines: List[str] = []
+    size = 0
+    for line in (line.strip() for line in text.splitlines()):
+        if not line:
+            continue
+        # Split single lines that are longer than a whole chunk
+        while count_tokens(line) > max_tokens:
+            cut = line.rfind(" ", 0, max_tokens * 4)
+            cut = cut if cut > 0 else max_tokens * 4
+            head, line = line[:cut], line[cut:].lstrip()
+            if lines:
+                chunks.append(Chunk(len(chunks), "\n".join(lines)))
+                lines, size = [], 0
+            chunks.append(Chunk(len(chunks), head))
+        if lines and size + count_tokens(line) > max_tokens:
+            chunks.append(Chunk(len(chunks), "\n".join(lines)))
+            lines = lines[-overlap_lines:] if overlap_lines else []
+            size = sum(count_tokens(kept) for kept in lines)
+        lines.append(line)
+        size += count_tokens(line)
+    if lines:
+        chunks.append(Chunk(len(chunks), "\n".join(lines)))
+    return chunks
+
+
+def event_boost(text: str) -> float:
+    """Multiplier for chunks that look like event listings"""
+    boost = 1.0
+    if _DATE.search(text):
+        boost += 0.5
+    if _URL.search(text):
+        boost += 0.5
+    categories = {match.category for match in heading_classifier.classify(text).matches}
+    boost += 0.25 * len(categories)  # "ai" and/or "event"
+    return boost
+
+
+class DocumentIndex:
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)  # term -> [(chunk index, tf)]
+        self._lengths = []
+        for chunk in chunks:
+            terms = tokenize(chunk.text)
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((chunk.index, tf))
+        self._avg_length = sum(self._lengths) / len(chunks) if chunks else 0.0
+        self._boosts = [event_boost(chunk.text) for chunk in chunks]
+
+    @classmethod
+    def from_text(cls, text: str) -> "DocumentIndex":
+        return cls(chunk_text(text))
+
+    def _idf(self, term: str) -> float:
+        n = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self.chunks) - n + 0.5) / (n + 0.5))
+
+    def search(self, query: str, k: int = TOP_K) -> List[ScoredChunk]:
+        """Top ``k`` chunks by BM25 score times event boost; chunks that match no
+        query term are ranked by the boost alone, below any matching chunk"""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self._idf(term)
+            for index, tf in self._postings.get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / self._avg_length)
+                scores[index] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(
+            (ScoredChunk(scores.get(chunk.index, 0.0) * self._boosts[chunk.index], chunk) for chunk in self.chunks),
+            key=lambda scored: (scored.score, self._boosts[scored.chunk.index]),
+            reverse=True,
+        )
+        return ranked[:k]
+
+
+@lru_cache(maxsize=8)
+def index_document(text: str) -> DocumentIndex:
+    """Index of ``text``, built once per document and reused across tool calls"""
+    return DocumentIndex.from_text(text)
+
+
+def render_chunks(index: DocumentIndex, query: str, k: int = TOP_K) -> str:
+    """Top chunks for ``query`` in document order, as agent-readable text"""
+    results = sorted(index.search(query, k), key=lambda scored: scored.chunk.index)
+    lines = [f"Top {len(results)} of {len(index.chunks)} document sections for '{query}':"]
+    for scored in results:
+        lines.append(f"--- section {scored.chunk.index + 1} ---")
+        lines.append(scored.chunk.text)
+    if len(results) < len(index.chunks):
+        lines.append("Search again with a different query to see other sections.")
+    return "\n".join(lines)
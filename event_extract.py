@@ -0,0 +1,199 @@
+"""Rule-based event extraction from plain text.
+
+Well-formed listings - a title line followed by a date, a time, an address
+and a signup link - are turned into ``Event`` records with compiled regexes
+and no LLM call. Text is split into blocks at blank lines and, inside a
+block, at the title line preceding each further date. Blocks dated outside
+the newsletter window (anchored on ``date.today()``) are dropped; blocks that
+look like events but lack a parseable date or title are returned as
+leftovers for the loader agent.
+"""
+import re
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+from compaction import WINDOW_DAYS
+from events import Event
+from keyword_classifier import heading_classifier
+
+_MONTHS = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+           r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)")
+_WEEKDAYS = r"(?:mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)(?:day|nesday|sday|urday)?"
+_MONTH_NUMBERS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+DATE_PATTERN = re.compile(
+    rf"\b(?P<month>{_MONTHS})\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s+(?P<year>\d{{4}})\b)?"
+    rf"|\b(?P<day2>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<month2>{_MONTHS})\b\.?(?:,?\s+(?P<year2>\d{{4}})\b)?"
+    r"|\b(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})\b"
+    r"|\b(?P<us_month>\d{1,2})/(?P<us_day>\d{1,2})/(?P<us_year>\d{4}|\d{2})\b"
+    # Without a year "3/4" is as likely a fraction: only after a weekday or a date label
+    rf"|\b(?:{_WEEKDAYS}\.?,?|(?:date|when|on)\s*:?)\s+(?P<md_month>\d{{1,2}})/(?P<md_day>\d{{1,2}})\b(?!/)",
+    re.IGNORECASE,
+)
+_CLOCK = r"\d{1,2}(?::\d{2})?\s*[ap]\.?m\.?|\b(?:[01]?\d|2[0-3]):[0-5]\d"
+TIME_PATTERN = re.compile(rf"\b(?:{_CLOCK})(?:\s*(?:-|–|to)\s*(?:{_CLOCK}))?(?:\s*(?-i:[A-Z]{{1,3}}T)\b)?",
+                          re.IGNORECASE)
+URL_PATTERN = re.compile(r"https?://[^\s<>\"')\]]+", re.IGNORECASE)
+_STREET_TYPES = (r"(?:street|st|avenue|ave|boulevard|blvd|road|rd|drive|dr|lane|ln|way|place|pl"
+                 r"|court|ct|plaza|square|sq|parkway|pkwy|highway|hwy)")
+ADDRESS_PATTERN = re.compile(
+    rf"(?<![\d:/])\b\d{{1,5}}[ \t]+(?:[A-Za-z0-9][\w.'-]*[ \t]+){{1,4}}(?i:{_STREET_TYPES})\b\.?"
+    rf"(?:,[ \t]*[A-Z][\w .'-]*){{0,3}}",
+)
+ONLINE_PATTERN = re.compile(r"\b(?:online|virtual|zoom|livestream|webinar)\b", re.IGNORECASE)
+_LABEL = re.compile(r"^(?:title|event|name|date|time|when|where|location|register|rsvp|sign\s*up|"
+                    r"signup|link|url|tickets?)\s*:\s*", re.IGNORECASE)
+
+MIN_TITLE_LENGTH = 6
+
+
+class Extraction(NamedTuple):
+    events: List[Event]
+    leftovers: List[str]  # event-like blocks that need an LLM
+    out_of_window: int = 0  # dated events dropped by the date window
+
+
+def _year(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    year = int(text)
+    return year + 2000 if year < 100 else year
+
+
+def parse_date(match: re.Match, today: date) -> Optional[date]:
+    """The date of a DATE_PATTERN match; a missing year means the next such date
+    (dates up to a month back keep this year, for events that just happened)"""
+    groups = match.groupdict()
+    if groups["iso_year"]:
+        year, month, day = int(groups["iso_year"]), int(groups["iso_month"]), int(groups["iso_day"])
+    elif groups["us_month"]:
+        year, month, day = _year(groups["us_year"]), int(groups["us_month"]), int(groups["us_day"])
+    elif groups["md_month"]:
+        year, month, day = None, int(groups["md_month"]), int(groups["md_day"])
+    else:
+        name = (groups["month"] or groups["month2"])[:3].lower()
+        year, month, day = _year(groups["year"] or groups["year2"]), _MONTH_NUMBERS[name], \
+            int(groups["day"] or groups["day2"])
+    try:
+        if year is not None:
+            return date(year, month, day)
+        found = date(today.year, month, day)
+        if found < today - timedelta(days=30):
+            found = date(today.year + 1, month, day)
+        return found
+    except ValueError:
+        return None
+
+
+def find_date(text: str, today: date) -> Optional[date]:
+    for match in DATE_PATTERN.finditer(text):
+        found = parse_date(match, today)
+        if found is not None:
+            return found
+    return None
+
+
+def find_time(text: str) -> Optional[str]:
+    match = TIME_PATTERN.search(text)
+    return " ".join(match.group().split()) if match else None
+
+
+def find_url(text: str) -> Optional[str]:
+    match = URL_PATTERN.search(text)
+    return match.group().rstrip(".,;:") if match else None
+
+
+def find_location(text: str) -> Optional[str]:
+    match = ADDRESS_PATTERN.search(text)
+    if match:
+        return match.group().strip(" ,.")
+    if ONLINE_PATTERN.search(text):
+        return "Online"
+    return None
+
+
+def _is_detail_line(line: str) -> bool:
+    return bool(DATE_PATTERN.search(line) or URL_PATTERN.search(line) or ADDRESS_PATTERN.search(line))
+
+
+def _title(lines: List[str]) -> Optional[str]:
+    """The first line that isn't a date, URL or address line"""
+    for line in lines:
+        if not _is_detail_line(line):
+            title = _LABEL.sub("", line).strip(" -|:")
+            if len(title) >= MIN_TITLE_LENGTH:
+                return title
+    return None
+
+
+def split_blocks(text: str) -> List[List[str]]:
+    """Split text at blank lines, then before the title line of every further date"""
+    paragraphs = []
+    current = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            current.append(line)
+        elif current:
+            paragraphs.append(current)
+            current = []
+    if current:
+        paragraphs.append(current)
+
+    blocks = []
+    for lines in paragraphs:
+        starts = [0]
+        for i, line in enumerate(lines):
+            if DATE_PATTERN.search(line):
+                # An event starts at its title, the non-date line right above its date
+                start = i - 1 if i > 0 and not DATE_PATTERN.search(lines[i - 1]) else i
+                if start > starts[-1]:
+                    starts.append(start)
+        blocks.extend(lines[a:b] for a, b in zip(starts, starts[1:] + [len(lines)]))
+    return blocks
+
+
+def extract_events(text: str, source: str = "", today: date = None,
+                   window_days: int = WINDOW_DAYS) -> Extraction:
+    """Turn every well-formed listing in ``text`` dated within ``window_days``
+    from ``today`` into an Event"""
+    today = today or date.today()
+    last_day = today + timedelta(days=window_days)
+    events = []
+    leftovers = []
+    out_of_window = 0
+    for lines in split_blocks(text):
+        block = "\n".join(lines)
+        when = find_date(block, today)
+        title = _title(lines)
+        classification = heading_classifier.classify(block)
+        if when is None or title is None:
+            # Event-like but not structured enough: let the LLM read it
+            mentions_event = any(match.category == "event" for match in classification.matches)
+            if mentions_event or when is not None or URL_PATTERN.search(block):
+                leftovers.append(block)
+            continue
+        if not today <= when <= last_day:
+            out_of_window += 1
+            continue
+        events.append(Event(
+            title=title,
+            url=find_url(block),
+            source=source,
+            date=when.isoformat(),
+            time=find_time(block),
+            location=find_location(block),
+            category="ai" if classification.category == "ai" else "event",
+        ))
+    return Extraction(events, leftovers, out_of_window)
+
+
+def fill_details(event: Event, text: str, today: date = None) -> Event:
+    """Fill a scraped event's missing date, time and location from ``text``"""
+    if event.date is None:
+        when = find_date(text, today or date.today())
+        event.date = when.isoformat() if when else None
+    event.time = event.time or find_time(text)
+    event.location = event.location or find_location(text)
+    return event
@@ -0,0 +1,180 @@
+"""Declarative registry of the event sources the research scraper crawls.
+
+Each source maps a domain to its display name, search URL templates, a
+precompiled event-link pattern and default search keywords. Lookups go
+through a dict keyed by domain, so adding sources does not add per-page work.
+
+Extra sources (or overrides of built-in ones, matched by domain) can be
+listed in a JSON file named by ``EVENT_SOURCES_FILE`` (default:
+``event_sources.json`` next to this module)::
+
+    [
+      {
+        "name": "AI Tinkerers SF",
+        "domain": "sf.aitinkerers.org",
+        "urls": ["https://sf.aitinkerers.org/p/events?q={query_plus}"],
+        "link_pattern": "/p/[^/?#]+$",
+        "keywords": ["ai tinkerers"]
+      }
+    ]
+
+URL templates may use ``{query_plus}`` (``ai+events``) and ``{query_dash}``
+(``ai-events``).
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+from urllib.parse import quote, quote_plus
+
+from fetcher import host_of
+
+CONFIG_FILE = os.environ.get(
+    "EVENT_SOURCES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "event_sources.json"),
+)
+
+GENERIC_LINK_PATTERN = re.compile(r"/events?/|register|signup|rsvp", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    domain: str
+    url_templates: Tuple[str, ...]
+    link_pattern: Pattern = GENERIC_LINK_PATTERN
+    keywords: Tuple[str, ...] = ()
+
+    def urls_for(self, query: str) -> List[str]:
+        query_plus = quote_plus(query)
+        query_dash = quote("-".join(query.split()))
+        return [template.format(query_plus=query_plus, query_dash=query_dash)
+                for template in self.url_templates]
+
+    def extract_event_urls(self, page_url: str, links: Iterable[str]) -> List[str]:
+        """Return absolute event URLs among ``links``, in order and without duplicates"""
+        return extract_event_urls(page_url, links, self.link_pattern)
+
+
+def _absolute(page_host: str, href: str) -> Optional[str]:
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("//"):
+        return "https:" + href
+    if href.startswith("/"):
+        return f"https://{page_host}{href}"
+    return None
+
+
+def extract_event_urls(page_url: str, links: Iterable[str], pattern: Pattern = GENERIC_LINK_PATTERN) -> List[str]:
+    """Resolve ``links`` against ``page_url`` and keep the ones matching ``pattern``"""
+    page_host = host_of(page_url)
+    found = {}
+    for href in links:
+        url = _absolute(page_host, href.strip())
+        if url and pattern.search(url):
+            found[url] = None
+    return list(found)
+
+
+DEFAULT_SOURCES = [
+    # Event platforms
+    Source("Meetup", "meetup.com",
+           ("https://www.meetup.com/find/?keywords={query_plus}&source=EVENTS",
+            "https://www.meetup.com/find/?keywords=bay+area+tech+{query_plus}"),
+           re.compile(r"^https?://(?:[\w-]+\.)*meetup\.com/[^?#]*/events/"),
+           ("ai", "machine learning", "generative ai", "llm")),
+    Source("Eventbrite", "eventbrite.com",
+           ("https://www.eventbrite.com/d/ca--san-francisco/{query_dash}/",
+            "https://www.eventbrite.com/d/ca--palo-alto/{query_dash}/",
+            "https://www.eventbrite.com/d/ca--berkeley/{query_dash}/"),
+           re.compile(r"^https?://(?:[\w-]+\.)*eventbrite\.com/(?:[^?#]*/)?(?:e|events)/"),
+           ("ai", "artificial intelligence", "machine learning")),
+    Source("Lu.ma", "lu.ma",
+           ("https://lu.ma/genai-sf?k=c",
+            "https://lu.ma/discover?q={query_plus}"),
+           re.compile(r"^https?://(?:[\w-]+\.)*lu\.ma(?:/[^?#]*)?/event/"),
+           ("ai", "genai", "llm")),
+    # Startup/VC events
+    Source("Y Combinator", "ycombinator.com",
+           ("https://www.ycombinator.com/events?q={query_plus}",), keywords=("ai",)),
+    Source("500 Startups", "500.co", ("https://500.co/events/",)),
+    Source("Andreessen Horowitz", "a16z.com", ("https://a16z.com/events/",)),
+    # Universities
+    Source("Stanford Events", "stanford.edu",
+           ("https://events.stanford.edu/search?search={query_plus}",),
+           keywords=("artificial intelligence", "machine learning")),
+    Source("Berkeley Events", "berkeley.edu",
+           ("https://events.berkeley.edu/search?search_api_fulltext={query_plus}",),
+           keywords=("artificial intelligence", "machine learning")),
+    # Professional networks
+    Source("LinkedIn Events", "linkedin.com",
+           ("https://www.linkedin.com/events/search?keywords={query_plus}",), keywords=("ai",)),
+    Source("Silicon Valley Forum", "svforum.org", ("https://www.svforum.org/events/",)),
+    # Tech communities
+    Source("Galvanize", "galvanize.com", ("https://www.galvanize.com/events",)),
+    Source("StrictlyVC", "strictlyvc.com", ("https://strictlyvc.com/events/",)),
+    Source("Cerebral Valley", "cerebralvalley.ai", ("https://cerebralvalley.ai/events",)),
+    Source("TechCrunch", "techcrunch.com", ("https://www.techcrunch.com/events/",)),
+]
+
+
+def source_from_config(entry: dict) -> Source:
+    """Build a Source from one JSON config entry"""
+    pattern = entry.get("link_pattern")
+    return Source(
+        name=entry["name"],
+        domain=entry["domain"].lower(),
+        url_templates=tuple(entry.get("urls", ())),
+        link_pattern=re.compile(pattern, re.IGNORECASE) if pattern else GENERIC_LINK_PATTERN,
+        keywords=tuple(entry.get("keywords", ())),
+    )
+
+
+class SourceRegistry:
+    def __init__(self, sources: Iterable[Source] = ()):
+        self._by_domain = {}
+        for source in sources:
+            self.register(source)
+
+    def register(self, source: Source) -> None:
+        """Add ``source``, replacing any source registered for the same domain"""
+        self._by_domain[source.domain] = source
+
+    def lookup(self, url: str) -> Optional[Source]:
+        """Return the source for a URL or hostname, matching parent domains too"""
+        host = host_of(url) if "/" in url else url.lower()
+        while host:
+            source = self._by_domain.get(host)
+            if source is not None:
+                return source
+            _, _, host = host.partition(".")
+        return None
+
+    def urls_for(self, query: str, sources: Iterable[Source] = None) -> List[str]:
+        """Expand the URL templates of ``sources`` (default: all) for ``query``"""
+        return [url for source in (self if sources is None else sources) for url in source.urls_for(query)]
+
+    def __iter__(self) -> Iterator[Source]:
+        return iter(self._by_domain.values())
+
+    def __len__(self) -> int:
+        return len(self._by_domain)
+
+
+def load_registry(config_file: str = CONFIG_FILE) -> SourceRegistry:
+    """Return the built-in sources plus any configured in ``config_file``"""
+    registry = SourceRegistry(DEFAULT_SOURCES)
+    if config_file and os.path.exists(config_file):
+        with open(config_file, encoding="utf-8") as f:
+            for entry in json.load(f):
+                registry.register(source_from_config(entry))
+    return registry
+
+
+@lru_cache(maxsize=1)
+def default_registry() -> SourceRegistry:
+    """The process-wide registry loaded from the built-ins and CONFIG_FILE"""
+    return load_registry()
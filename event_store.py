@@ -0,0 +1,170 @@
+"""Persistent index of scraped events.
+
+Events are upserted into SQLite keyed by their canonical signup URL, with
+first-seen/last-seen times and the page they were found on. The store also
+remembers when each source page was last fetched, so the research pipeline
+can run incrementally: pages that are not yet due for a refresh are answered
+from the index instead of being crawled again. ``events_between`` serves the
+newsletter's date window from everything indexed so far, including events
+found by earlier crawls that this one didn't repeat.
+"""
+import threading
+import time
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from events import Event
+import storage
+
+UNDATED_MAX_AGE = 2 * 24 * 3600  # undated events are trusted for two days after last sighting
+_TRACKING_PARAMS = ("utm_", "aff", "ref", "fbclid", "gclid", "_gl")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a signup URL so the same event found via different links gets one key"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query)
+                             if not key.lower().startswith(_TRACKING_PARAMS)))
+    return urlunsplit(("https", host, parts.path.rstrip("/") or "/", query, ""))
+
+
+def event_key(event: Event) -> str:
+    if event.url:
+        return canonical_url(event.url)
+    return f"untitled:{event.source.lower()}:{' '.join(event.title.lower().split())}"
+
+
+class EventStore:
+    def __init__(self, db_name: str = "events.sqlite3"):
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT,
+                source TEXT,
+                event_date TEXT,
+                event_time TEXT,
+                location TEXT,
+                category TEXT,
+                page_url TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_date ON events (event_date);
+            CREATE INDEX IF NOT EXISTS events_page ON events (page_url, last_seen);
+            CREATE TABLE IF NOT EXISTS page_fetches (
+                page_url TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                ok INTEGER NOT NULL
+            );
+            """
+        )
+
+    def upsert(self, events: Iterable[Event], page_url: str = None, now: float = None) -> Tuple[int, int]:
+        """Insert new events and refresh known ones; returns (new, updated) counts"""
+        now = now or time.time()
+        new = updated = 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for event in events:
+                    key = event_key(event)
+                    row = self._db.execute("SELECT 1 FROM events WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        updated += 1
+                        # Keep details learned earlier when this sighting lacks them
+                        self._db.execute(
+                            """UPDATE events SET title = COALESCE(NULLIF(?, ''), title), url = COALESCE(?, url),
+                               event_date = COALESCE(?, event_date), event_time = COALESCE(?, event_time),
+                               location = COALESCE(?, location), category = ?, page_url = COALESCE(?, page_url),
+                               last_seen = ? WHERE key = ?""",
+                            (event.title, event.url, event.date, event.time, event.location, event.category,
+                             page_url, now, key),
+                        )
+                    else:
+                        new += 1
+                        self._db.execute(
+                            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (key, event.title, event.url, event.source, event.date, event.time, event.location,
+                             event.category, page_url, now, now),
+                        )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return new, updated
+
+    def record_fetch(self, page_url: str, ok: bool, now: float = None) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO page_fetches VALUES (?, ?, ?)",
+                             (page_url, now or time.time(), int(ok)))
+
+    def due_pages(self, page_urls: Iterable[str], refresh_after: Callable[[str], float],
+                  now: float = None) -> List[str]:
+        """Return the pages never fetched successfully or fetched longer than
+        ``refresh_after(page_url)`` seconds ago"""
+        now = now or time.time()
+        due = []
+        with self._lock:
+            for page_url in page_urls:
+                row = self._db.execute("SELECT fetched_at, ok FROM page_fetches WHERE page_url = ?",
+                                       (page_url,)).fetchone()
+                if row is None or not row[1] or now - row[0] >= refresh_after(page_url):
+                    due.append(page_url)
+        return due
+
+    def events_from_pages(self, page_urls: Iterable[str]) -> List[Event]:
+        """Events found on ``page_urls`` during the latest fetch of each page"""
+        page_urls = list(page_urls)
+        if not page_urls:
+            return []
+        marks = ",".join("?" * len(page_urls))
+        with self._lock:
+            rows = self._db.execute(
+                f"""SELECT {_EVENT_COLUMNS} FROM events JOIN page_fetches USING (page_url)
+                    WHERE page_url IN ({marks}) AND events.last_seen >= page_fetches.fetched_at
+                    ORDER BY events.rowid""",
+                page_urls,
+            ).fetchall()
+        return [_to_event(row) for row in rows]
+
+    def events_between(self, start: date, end: date, undated_max_age: float = UNDATED_MAX_AGE,
+                       now: float = None) -> List[Event]:
+        """Events dated within [start, end], plus undated events seen recently"""
+        now = now or time.time()
+        with self._lock:
+            rows = self._db.execute(
+                f"""SELECT {_EVENT_COLUMNS} FROM events
+                    WHERE (event_date BETWEEN ? AND ?) OR (event_date IS NULL AND last_seen >= ?)
+                    ORDER BY event_date IS NULL, event_date, last_seen DESC""",
+                (start.isoformat(), end.isoformat(), now - undated_max_age),
+            ).fetchall()
+        return [_to_event(row) for row in rows]
+
+
+_EVENT_COLUMNS = "events.title, events.url, events.source, events.event_date, events.event_time, " \
+                 "events.location, events.category"
+
+
+def _to_event(row) -> Event:
+    return Event(row[0], row[1], row[2] or "", row[3], row[4], row[5], row[6] or "event")
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """Return the process-wide event store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore()
+        return _store
@@ -0,0 +1,44 @@
+"""Structured event records produced by the scrapers.
+
+Scraping produces ``Event`` records; turning them into the text the agents
+read is a single final step (``render_events``), so nothing downstream has
+to re-parse formatted strings.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+
+@dataclass(slots=True)
+class Event:
+    title: str
+    url: Optional[str] = None
+    source: str = ""
+    date: Optional[str] = None
+    time: Optional[str] = None
+    location: Optional[str] = None
+    category: str = "event"  # "ai" for AI-related events, "event" for general ones
+
+    def render(self) -> str:
+        """One compact line per event; the signup URL keeps its 'SIGNUP URL:' label"""
+        fields = [self.title or "Untitled event"]
+        fields.extend(value for value in (self.date, self.time, self.location) if value)
+        if self.source:
+            fields.append(f"via {self.source}")
+        fields.append(f"SIGNUP URL: {self.url}" if self.url else "SIGNUP URL: not available")
+        return " | ".join(fields)
+
+
+def dedupe_events(events: Iterable[Event]) -> List[Event]:
+    """Drop repeats of the same signup URL (or, without a URL, the same title)"""
+    seen = set()
+    unique = []
+    for event in events:
+        key = event.url or event.title.lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(event)
+    return unique
+
+
+def render_events(events: Iterable[Event]) -> List[str]:
+    return [f"{i}. {event.render()}" for i, event in enumerate(events, 1)]
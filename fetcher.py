@@ -0,0 +1,88 @@
+"""Concurrent fetch stage used by the event research scraper.
+
+URLs are fetched on a thread pool with a cap on in-flight requests per host and
+a global deadline for the whole batch. Results are yielded as each fetch
+finishes, so callers can start parsing the fast sources while slow ones are
+still downloading.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 8  # seconds per request
+DEFAULT_DEADLINE = 20  # seconds for the whole batch
+DEFAULT_PER_HOST_LIMIT = 2  # concurrent requests to the same host
+DEFAULT_MAX_WORKERS = 16
+
+
+class FetchResult(NamedTuple):
+    url: str
+    response: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased hostname of a URL ('' if it has none)"""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def fetch_all(
+    urls: Iterable[str],
+    fetch: Callable[[str, float], Any],
+    deadline: float = DEFAULT_DEADLINE,
+    timeout: float = DEFAULT_TIMEOUT,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[FetchResult]:
+    """Fetch every URL concurrently and yield a FetchResult as each one finishes.
+
+    ``fetch(url, timeout)`` performs a single request and returns the response.
+    Every URL produces exactly one result: URLs still pending when the deadline
+    passes are yielded with a TimeoutError and their workers are abandoned.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+
+    started = time.monotonic()
+    expires_at = started + deadline
+    host_slots = {host_of(url): threading.BoundedSemaphore(per_host_limit) for url in urls}
+
+    def run(url: str) -> FetchResult:
+        t0 = time.monotonic()
+        slot = host_slots[host_of(url)]
+        if not slot.acquire(timeout=max(0.0, expires_at - t0)):
+            return FetchResult(url, error=TimeoutError("deadline reached while waiting for host slot"),
+                               elapsed=time.monotonic() - t0)
+        try:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("deadline reached before request started")
+            response = fetch(url, min(timeout, remaining))
+            return FetchResult(url, response=response, elapsed=time.monotonic() - t0)
+        except Exception as e:
+            return FetchResult(url, error=e, elapsed=time.monotonic() - t0)
+        finally:
+            slot.release()
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)), thread_name_prefix="fetch")
+    pending = {executor.submit(run, url): url for url in urls}
+    try:
+        while pending:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                yield future.result()
+        for future, url in pending.items():
+            future.cancel()
+            yield FetchResult(url, error=TimeoutError(f"no response within {deadline}s deadline"),
+                              elapsed=time.monotonic() - started)
+    finally:
+        # Don't block the caller on requests that overran the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
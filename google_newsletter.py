@@ -1,18 +1,30 @@
+import functools
 import os
 
 from crewai import Agent, Task, Process, Crew
 from crewai.tools import tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
+from checkpoints import kickoff_with_checkpoints
+from llm_cache import cached_llm
+from serper_search import SerperSearch, render_results, split_queries
 import streamlit as st
 
 #os.environ["SERPER_API_KEY"] = "serp-api-here"
-search = GoogleSerperAPIWrapper(serper_api_key=st.secrets["SERPER_API_KEY"])
 #api = os.environ.get("OPENAI_API_KEY")
 
+@functools.lru_cache(maxsize=None)
+def get_search() -> SerperSearch:
+    """The Serper client, created on the first search"""
+    return SerperSearch(api_key=st.secrets["SERPER_API_KEY"])
+
 @tool("Scrape google searches")
 def search_tool(query: str) -> str:
-    """Useful for when you need to ask the agent to search the internet"""
-    return search.run(query)
+    """Useful for when you need to ask the agent to search the internet. Pass several
+    queries separated by semicolons to run them all at once"""
+    # One batched, cached request for all queries (see serper_search)
+    try:
+        return render_results(get_search().search(split_queries(query)))
+    except Exception as e:
+        return f"Search failed for query '{query}': {str(e)}"
 
 @tool("Load document")
 def load_tool(document_type: str = "any") -> str:
@@ -61,6 +73,7 @@ explorer = Agent(
     """,
     verbose=True,
     allow_delegation=False,
+    llm=cached_llm(),
     tools=[search_tool],
 )
 
@@ -72,6 +85,7 @@ writer = Agent(
     fun way by using layman words.ONLY use scraped data from the internet for the blog.""",
     verbose=True,
     allow_delegation=False,
+    llm=cached_llm(),
 )
 critic = Agent(
     role="Expert Writing Critic",
@@ -82,6 +96,7 @@ critic = Agent(
     """,
     verbose=True,
     allow_delegation=False,
+    llm=cached_llm(),
 )
 
 task_report = Task(
@@ -138,8 +153,14 @@ crew = Crew(
     process=Process.sequential,  # Sequential process will have tasks executed one after the other and the outcome of the previous one is passed as extra content into this next.
 )
 
-# Get your crew to work!
-result = crew.kickoff()
 
-print("######################")
-print(result)
+def main():
+    # Get your crew to work! A rerun on the same day resumes after the last finished task
+    result = kickoff_with_checkpoints(crew, run_key="google_newsletter")
+
+    print("######################")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
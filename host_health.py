@@ -0,0 +1,212 @@
+"""Per-host resilience for the research scraper.
+
+Every host gets its own latency history, request rate limit and circuit
+breaker:
+
+- the request timeout is derived from the host's recent p95 latency instead
+  of a fixed 8 seconds, so a host that normally answers in 1s gives up after
+  a few seconds rather than the full budget. A timed-out request counts as a
+  latency of at least the timeout it had, so a host that slows down widens
+  its own timeout instead of timing out at the old one forever;
+- a token bucket caps the request rate per host;
+- after ``FAILURE_THRESHOLD`` consecutive failures (errors, timeouts, 5xx
+  or blocking responses) the circuit opens and the host is skipped for
+  ``COOL_DOWN`` seconds and its latency history is dropped as stale. After
+  the cool-down one trial request is let through with the full default
+  timeout; success closes the circuit, failure reopens it.
+
+State is persisted in SQLite, so a host known to be down is skipped from
+the first request of the next run.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from fetcher import DEFAULT_TIMEOUT, host_of
+from rate_limit import TokenBucket
+import storage
+
+LATENCY_SAMPLES = 50  # recent latencies kept per host
+MIN_SAMPLES = 5  # use the default timeout until a host has this many samples
+MIN_TIMEOUT = 2.0  # seconds
+TIMEOUT_FACTOR = 2.0  # timeout = p95 latency * factor
+FAILURE_THRESHOLD = int(os.environ.get("HOST_FAILURE_THRESHOLD", 3))
+COOL_DOWN = float(os.environ.get("HOST_COOL_DOWN", 15 * 60))  # seconds
+# LinkedIn answers scrapers with 999; 403 and 429 mean we are being blocked too
+FAILURE_STATUSES = {403, 429, 999}
+
+DEFAULT_RATE = 2.0  # requests per second per host
+HOST_RATES = {
+    "linkedin.com": 0.5,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of requesting a host whose circuit is open"""
+
+
+class HostState:
+    def __init__(self, latencies=(), failures: int = 0, open_until: float = 0.0):
+        self.latencies = deque(latencies, maxlen=LATENCY_SAMPLES)
+        self.failures = failures  # consecutive
+        self.open_until = open_until
+        self.trial_in_flight = False
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (q in 0..100)"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def rate_for(host: str, rates: dict = HOST_RATES, default: float = DEFAULT_RATE) -> float:
+    """Return the request rate for ``host``, matching the most specific configured domain"""
+    while host:
+        if host in rates:
+            return rates[host]
+        _, _, host = host.partition(".")
+    return default
+
+
+class HostHealth:
+    def __init__(self, db_name: str = "host_health.sqlite3"):
+        self._lock = threading.Lock()
+        self._states: Dict[str, HostState] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS hosts (
+                host TEXT PRIMARY KEY,
+                latencies TEXT NOT NULL,
+                failures INTEGER NOT NULL,
+                open_until REAL NOT NULL
+            )"""
+        )
+        for host, latencies, failures, open_until in self._db.execute("SELECT * FROM hosts"):
+            self._states[host] = HostState(json.loads(latencies), failures, open_until)
+
+    def _state(self, host: str) -> HostState:
+        state = self._states.get(host)
+        if state is None:
+            state = self._states[host] = HostState()
+        return state
+
+    def timeout_for(self, host: str, default: float = DEFAULT_TIMEOUT) -> float:
+        """Timeout for the next request to ``host``, from its recent p95 latency"""
+        with self._lock:
+            latencies = list(self._state(host).latencies)
+        if len(latencies) < MIN_SAMPLES:
+            return default
+        return min(default, max(MIN_TIMEOUT, percentile(latencies, 95) * TIMEOUT_FACTOR))
+
+    def check(self, host: str, now: float = None) -> bool:
+        """Raise CircuitOpenError if ``host`` should be skipped right now; True
+        when the request is the half-open trial"""
+        now = now or time.time()
+        with self._lock:
+            state = self._state(host)
+            if state.failures < FAILURE_THRESHOLD:
+                return False
+            if now < state.open_until:
+                raise CircuitOpenError(f"circuit open for {host}, retry in {state.open_until - now:.0f}s")
+            # Half-open: let a single trial request through
+            if state.trial_in_flight:
+                raise CircuitOpenError(f"circuit half-open for {host}, trial request in flight")
+            state.trial_in_flight = True
+            return True
+
+    def record(self, host: str, elapsed: float, ok: bool, now: float = None, timed_out: bool = False) -> None:
+        """Record the outcome of one request to ``host``; a request that
+        ``timed_out`` took at least ``elapsed`` and counts as that latency"""
+        now = now or time.time()
+        with self._lock:
+            state = self._state(host)
+            state.trial_in_flight = False
+            if ok or timed_out:
+                state.latencies.append(round(elapsed, 3))
+            if ok:
+                state.failures = 0
+                state.open_until = 0.0
+            else:
+                state.failures += 1
+                if state.failures >= FAILURE_THRESHOLD:
+                    state.open_until = now + COOL_DOWN
+                    # Whatever the host was like before it failed no longer says much
+                    state.latencies.clear()
+            self._db.execute(
+                "INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?)",
+                (host, json.dumps(list(state.latencies)), state.failures, state.open_until),
+            )
+
+    def _end_trial(self, host: str) -> None:
+        with self._lock:
+            self._state(host).trial_in_flight = False
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate_for(host))
+            return bucket
+
+    def wrap(self, fetch: Callable) -> Callable:
+        """Guard a ``fetch(url, timeout, ...)`` callable with the host's circuit
+        breaker, rate limit and adaptive timeout, and record its outcome"""
+
+        def guarded(url, timeout, *args, **kwargs):
+            host = host_of(url)
+            trial = self.check(host)
+            started = time.monotonic()
+            if not trial:
+                # The trial gets the full budget: the host may only have become slower
+                timeout = min(timeout, self.timeout_for(host))
+            if not self._bucket(host).acquire(timeout):
+                self._end_trial(host)  # our own limit, not the host's fault
+                raise TimeoutError(f"rate limit for {host}: no request slot before timeout")
+            t0 = time.monotonic()
+            request_timeout = max(0.1, timeout - (t0 - started))
+            try:
+                response = fetch(url, request_timeout, *args, **kwargs)
+            except Exception as e:
+                elapsed = time.monotonic() - t0
+                timed_out = isinstance(e, (TimeoutError, requests.Timeout))
+                self.record(host, max(elapsed, request_timeout) if timed_out else elapsed, ok=False,
+                            timed_out=timed_out)
+                raise
+            status = getattr(response, "status_code", 200)
+            self.record(host, time.monotonic() - t0, ok=status < 500 and status not in FAILURE_STATUSES)
+            return response
+
+        return guarded
+
+    def stats(self) -> Dict[str, dict]:
+        now = time.time()
+        with self._lock:
+            return {
+                host: {
+                    "p50": percentile(state.latencies, 50) if state.latencies else None,
+                    "p95": percentile(state.latencies, 95) if state.latencies else None,
+                    "failures": state.failures,
+                    "open": state.failures >= FAILURE_THRESHOLD and now < state.open_until,
+                }
+                for host, state in self._states.items()
+            }
+
+
+_health: Optional[HostHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_host_health() -> HostHealth:
+    """Return the process-wide host health tracker"""
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = HostHealth()
+        return _health
@@ -0,0 +1,188 @@
+"""Targeted anchor/heading extraction for scraped pages.
+
+The scraper only needs link targets and heading texts, so instead of building
+a full BeautifulSoup tree for every page it streams the document through one
+of the backends below and stops as soon as it has collected enough.
+
+Backends (pick with ``HTML_EXTRACT_BACKEND`` or the ``backend`` argument):
+
+- ``lxml``: incremental ``lxml.etree.HTMLPullParser``; elements outside
+  headings are cleared as soon as they close, so memory stays flat.
+- ``htmlparser``: stdlib ``html.parser`` event handler, no dependencies.
+- ``soup``: BeautifulSoup restricted to the interesting tags by a SoupStrainer.
+"""
+import os
+from html.parser import HTMLParser
+from typing import List, NamedTuple, Optional
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5")
+MAX_LINKS = 1000
+MAX_HEADINGS = 200
+CHUNK_SIZE = 64 * 1024
+
+
+class PageExtract(NamedTuple):
+    links: List[str]  # href values, in document order
+    headings: List[str]  # stripped heading texts, in document order
+
+
+class _Collector:
+    """Shared limit bookkeeping for the streaming backends"""
+
+    def __init__(self, max_links: Optional[int], max_headings: Optional[int]):
+        self.links = []
+        self.headings = []
+        self.max_links = max_links
+        self.max_headings = max_headings
+
+    def add_link(self, href: Optional[str]) -> None:
+        if href and (self.max_links is None or len(self.links) < self.max_links):
+            self.links.append(href)
+
+    def add_heading(self, text: str) -> None:
+        text = " ".join(text.split())
+        if text and (self.max_headings is None or len(self.headings) < self.max_headings):
+            self.headings.append(text)
+
+    @property
+    def full(self) -> bool:
+        # Headings are paired with links by position, so once the link cap is
+        # reached the headings further down have nothing left to pair with
+        return self.max_links is not None and len(self.links) >= self.max_links
+
+    def result(self) -> PageExtract:
+        return PageExtract(self.links, self.headings)
+
+
+def _extract_lxml(content: bytes, max_links, max_headings) -> PageExtract:
+    from lxml import etree
+
+    out = _Collector(max_links, max_headings)
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    open_headings = 0
+
+    def drain():
+        nonlocal open_headings
+        for event, element in parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if event == "start":
+                if tag in HEADING_TAGS:
+                    open_headings += 1
+                continue
+            if tag == "a":
+                out.add_link(element.get("href"))
+            elif tag in HEADING_TAGS:
+                open_headings -= 1
+                out.add_heading("".join(element.itertext()))
+            if not open_headings:
+                # Nothing above this element needs its contents any more
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        drain()
+        if out.full:
+            return out.result()
+    # Elements still open at the end of the document (e.g. an unclosed last
+    # <a>) are only ended by close()
+    parser.close()
+    drain()
+    return out.result()
+
+
+class _StdlibExtractor(HTMLParser):
+    def __init__(self, out: _Collector):
+        super().__init__(convert_charrefs=True)
+        self.out = out
+        self.heading_depth = 0
+        self.heading_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.out.add_link(dict(attrs).get("href"))
+        elif tag in HEADING_TAGS:
+            self.heading_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in HEADING_TAGS and self.heading_depth:
+            self.heading_depth -= 1
+            if not self.heading_depth:
+                self.out.add_heading("".join(self.heading_text))
+                self.heading_text = []
+
+    def handle_data(self, data):
+        if self.heading_depth:
+            self.heading_text.append(data)
+
+    def close(self):
+        super().close()
+        if self.heading_depth:  # unclosed heading at the end of the document
+            self.out.add_heading("".join(self.heading_text))
+            self.heading_depth = 0
+            self.heading_text = []
+
+
+def _extract_htmlparser(content: bytes, max_links, max_headings) -> PageExtract:
+    out = _Collector(max_links, max_headings)
+    parser = _StdlibExtractor(out)
+    text = content.decode("utf-8", errors="replace")
+    for offset in range(0, len(text), CHUNK_SIZE):
+        parser.feed(text[offset:offset + CHUNK_SIZE])
+        if out.full:
+            return out.result()
+    parser.close()
+    return out.result()
+
+
+def _extract_soup(content: bytes, max_links, max_headings) -> PageExtract:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    out = _Collector(max_links, max_headings)
+    soup = BeautifulSoup(content, "html.parser", parse_only=SoupStrainer(["a", *HEADING_TAGS]))
+    for element in soup.find_all(["a", *HEADING_TAGS]):
+        if element.name == "a":
+            out.add_link(element.get("href"))
+        else:
+            out.add_heading(element.get_text())
+    return out.result()
+
+
+BACKENDS = {
+    "lxml": _extract_lxml,
+    "htmlparser": _extract_htmlparser,
+    "soup": _extract_soup,
+}
+
+
+def _default_backend() -> str:
+    configured = os.environ.get("HTML_EXTRACT_BACKEND")
+    if configured:
+        return configured
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "htmlparser"
+
+
+DEFAULT_BACKEND = _default_backend()
+
+
+def extract_page(
+    content: bytes,
+    backend: str = None,
+    max_links: Optional[int] = MAX_LINKS,
+    max_headings: Optional[int] = MAX_HEADINGS,
+) -> PageExtract:
+    """Extract link targets and heading texts from an HTML document.
+
+    Parsing stops early once ``max_links`` are collected; ``max_headings`` only
+    caps the headings kept. Pass ``None`` to collect everything.
+    """
+    try:
+        extractor = BACKENDS[backend or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown HTML extraction backend: {backend or DEFAULT_BACKEND}")
+    return extractor(content, max_links, max_headings)
@@ -0,0 +1,117 @@
+"""Process-wide HTTP client with pooled keep-alive sessions.
+
+One ``requests.Session`` is kept per host for the lifetime of the process, so
+repeated search_tool calls (and the Reddit scraper) reuse open TCP/TLS
+connections instead of paying the handshake on every request. Each session
+negotiates compression, bounds its connection pool and retries transient
+failures with exponential backoff.
+"""
+import threading
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br only when brotli is installed)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+POOL_MAXSIZE = 4  # max open connections per host
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.5  # sleeps 0.5s, 1s, ... between retries
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Hosts whose callers retry themselves: reddit_fetch.with_backoff owns the
+# retries (and the 100 requests/minute budget) of the Reddit API
+NO_RETRY_HOSTS = ("reddit.com",)
+
+_sessions = {}
+_lock = threading.Lock()
+_adapter_factory: Callable[..., HTTPAdapter] = HTTPAdapter
+
+
+def _retry_policy() -> Retry:
+    return Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=1,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _retries_for(host: str):
+    """The transport retry policy for ``host``: none for NO_RETRY_HOSTS and their subdomains"""
+    while host:
+        if host in NO_RETRY_HOSTS:
+            return 0
+        _, _, host = host.partition(".")
+    return _retry_policy()
+
+
+def _new_session(host: str = "") -> requests.Session:
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # pool_block keeps us at POOL_MAXSIZE connections per host under load
+    adapter = _adapter_factory(pool_connections=1, pool_maxsize=POOL_MAXSIZE,
+                               pool_block=True, max_retries=_retries_for(host))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(host: str) -> requests.Session:
+    """Return the shared keep-alive session for ``host``, creating it on first use"""
+    host = host.lower()
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _sessions[host] = _new_session(host)
+    return session
+
+
+def get(url: str, timeout: float, headers: dict = None, **kwargs) -> requests.Response:
+    """GET ``url`` through the pooled session of its host"""
+    host = urlsplit(url).hostname or ""
+    return get_session(host).get(url, headers=headers, timeout=timeout, **kwargs)
+
+
+def post(url: str, timeout: float, headers: dict = None, **kwargs) -> requests.Response:
+    """POST to ``url`` through the pooled session of its host (not retried)"""
+    host = urlsplit(url).hostname or ""
+    return get_session(host).post(url, headers=headers, timeout=timeout, **kwargs)
+
+
+def close_all() -> None:
+    """Close every pooled session (mainly for tests and clean shutdown)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def route_all(adapter_factory: Optional[Callable[..., HTTPAdapter]]) -> None:
+    """Build every session's transport with ``adapter_factory`` (None: back to the
+    network), e.g. to replay recorded pages from a local server. Open sessions are
+    closed so the next request picks it up."""
+    global _adapter_factory
+    close_all()
+    with _lock:
+        _adapter_factory = adapter_factory or HTTPAdapter
@@ -0,0 +1,184 @@
+"""Background job queue for newsletter generation.
+
+Generation runs in a bounded worker pool instead of the Streamlit script
+thread, so page reruns don't interrupt it and concurrent users don't each
+hold a script thread for minutes. Submitting returns a job ID that any
+session can poll; identical requests that are still queued or running are
+coalesced onto the same job. Job status and results are also written to
+SQLite so finished newsletters outlive the process.
+
+The jobs database may be shared by several Streamlit processes. Each
+manager records itself as the owner of the jobs it runs and keeps a
+heartbeat for as long as it lives; a queued or running job is only failed
+as interrupted once its owner has stopped beating. Finished jobs stay in
+memory (with their progress log) only for the last ``KEEP_FINISHED`` ones,
+older ones are served from SQLite.
+"""
+import contextvars
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import storage
+from streaming import ProgressLog, current_log
+
+MAX_WORKERS = int(os.environ.get("NEWSLETTER_WORKERS", 2))
+KEEP_FINISHED = 8  # finished jobs kept in memory with their progress log
+HEARTBEAT_INTERVAL = 10.0  # seconds
+# An owner that has not beaten for this long is gone, and so are its jobs
+OWNER_TIMEOUT = 6 * HEARTBEAT_INTERVAL
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    key: str
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    log: ProgressLog = field(default_factory=ProgressLog, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+class JobManager:
+    def __init__(self, max_workers: int = MAX_WORKERS, db_name: str = "jobs.sqlite3"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="newsletter-job")
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Deque[str] = deque()  # IDs of the finished jobs in self._jobs, oldest first
+        self._in_flight: Dict[str, str] = {}  # request key -> job id
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                submitted_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                result TEXT,
+                error TEXT,
+                owner TEXT
+            )"""
+        )
+        if "owner" not in {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS owners (
+                owner TEXT PRIMARY KEY,
+                heartbeat REAL NOT NULL
+            )"""
+        )
+        self._beat()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._keep_beating, name="newsletter-job-heartbeat", daemon=True).start()
+
+    def _beat(self, now: float = None) -> None:
+        """Refresh this manager's heartbeat and fail the jobs of owners that are gone"""
+        now = now or time.time()
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO owners VALUES (?, ?)", (self.owner, now))
+            # Jobs whose process died will never finish
+            self._db.execute(
+                """UPDATE jobs SET status = ?, error = ? WHERE status IN (?, ?) AND (owner IS NULL OR owner NOT IN
+                   (SELECT owner FROM owners WHERE heartbeat >= ?))""",
+                (FAILED, "interrupted by restart", QUEUED, RUNNING, now - OWNER_TIMEOUT),
+            )
+            self._db.execute("DELETE FROM owners WHERE heartbeat < ?", (now - OWNER_TIMEOUT,))
+
+    def _keep_beating(self) -> None:
+        while not self._stopped.wait(HEARTBEAT_INTERVAL):
+            self._beat()
+
+    def close(self) -> None:
+        """Stop the heartbeat; this manager's unfinished jobs count as interrupted from now on"""
+        self._stopped.set()
+        with self._db_lock:
+            self._db.execute("DELETE FROM owners WHERE owner = ?", (self.owner,))
+
+    def submit(self, key: str, fn: Callable[[], Any]) -> str:
+        """Queue ``fn`` and return its job ID, or the ID of an identical job in flight"""
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing
+            job = Job(id=uuid.uuid4().hex[:12], key=key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job.id
+        self._save(job)
+        context = contextvars.copy_context()
+        context.run(current_log.set, job.log)
+        self._executor.submit(context.run, self._run, job, fn)
+        return job.id
+
+    def _run(self, job: Job, fn: Callable[[], Any]) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._save(job)
+        try:
+            job.result = str(fn())
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+                # Older finished jobs are served from SQLite, without their progress log
+                self._finished.append(job.id)
+                while len(self._finished) > KEEP_FINISHED:
+                    self._jobs.pop(self._finished.popleft(), None)
+            job.log.done.set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, falling back to the stored record of past processes"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT id, key, status, submitted_at, started_at, finished_at, result, error FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = Job(*row)
+        job.log.done.set()
+        return job
+
+    def recent(self, limit: int = 10) -> List[Job]:
+        """Most recently submitted jobs, newest first"""
+        with self._db_lock:
+            ids = [row[0] for row in self._db.execute(
+                "SELECT id FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,))]
+        return [job for job in map(self.get, ids) if job is not None]
+
+    def _save(self, job: Job) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.key, job.status, job.submitted_at, job.started_at, job.finished_at,
+                 job.result, job.error, self.owner),
+            )
@@ -0,0 +1,82 @@
+"""Single-pass keyword classification of scraped headings.
+
+All keywords of all categories are compiled into one alternation regex with
+word boundaries (so "ml" no longer matches "html" or "email"), and a whole
+batch of headings is scanned with one ``finditer`` call over the joined
+texts.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+AI_KEYWORDS = (
+    'ai', 'artificial intelligence', 'machine learning', 'ml',
+    'deep learning', 'neural', 'data science', 'nlp',
+    'computer vision', 'llm', 'gpt', 'transformer', 'genai', 'generative ai',
+)
+EVENT_KEYWORDS = (
+    'event', 'meetup', 'workshop', 'conference', 'seminar',
+    'hackathon', 'demo', 'presentation', 'talk', 'webinar',
+)
+
+_SEPARATOR = "\n\x00\n"  # never part of a heading and never inside a match
+
+
+class KeywordMatch(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    category: str
+
+
+class Classification(NamedTuple):
+    text: str
+    category: Optional[str]  # highest-priority category matched, if any
+    matches: List[KeywordMatch]
+
+
+class KeywordClassifier:
+    def __init__(self, categories: Dict[str, Sequence[str]]):
+        """``categories`` maps category name to keywords; earlier categories win ties"""
+        self.priority = list(categories)
+        groups = []
+        for index, keywords in enumerate(categories.values()):
+            # Longest first so "machine learning" wins over a shorter overlapping keyword
+            alternatives = "|".join(
+                r"\s+".join(map(re.escape, keyword.split()))
+                for keyword in sorted(set(keywords), key=len, reverse=True)
+            )
+            groups.append(f"(?P<c{index}>{alternatives})")
+        # Optional plural "s" so "events" and "LLMs" still match
+        self.pattern = re.compile(rf"\b(?:{'|'.join(groups)})s?\b", re.IGNORECASE)
+
+    def _category(self, match: re.Match) -> str:
+        return self.priority[int(match.lastgroup[1:])]
+
+    def classify(self, text: str) -> Classification:
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: Iterable[str]) -> List[Classification]:
+        """Classify every text with a single regex scan over the whole batch"""
+        texts = list(texts)
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(_SEPARATOR)
+        matches = [[] for _ in texts]
+        for match in self.pattern.finditer(_SEPARATOR.join(texts)):
+            index = bisect_right(offsets, match.start()) - 1
+            base = offsets[index]
+            keyword = " ".join(match.group(match.lastgroup).lower().split())
+            matches[index].append(KeywordMatch(match.start() - base, match.end() - base,
+                                               keyword, self._category(match)))
+        results = []
+        for text, found in zip(texts, matches):
+            categories = {m.category for m in found}
+            category = next((name for name in self.priority if name in categories), None)
+            results.append(Classification(text, category, found))
+        return results
+
+
+heading_classifier = KeywordClassifier({"ai": AI_KEYWORDS, "event": EVENT_KEYWORDS})
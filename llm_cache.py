@@ -0,0 +1,200 @@
+"""Local cache of LLM responses shared by all crews.
+
+``CachedLLM`` wraps the crewai LLM an agent would use and stores each text
+response in SQLite, keyed by a hash of the model, temperature, stop words,
+messages and tool schemas. Rerunning a crew with the same inputs - or after
+a prompt tweak that only touches later tasks - answers the unchanged calls
+from disk. Entries expire after ``LLM_CACHE_TTL`` seconds and the least
+recently used ones are evicted beyond ``LLM_CACHE_MAX_ENTRIES``.
+
+``LLM_CACHE_MODE`` selects the behaviour:
+
+- ``read_write`` (default): serve hits, call the LLM on misses and store them
+- ``replay``: serve hits only and raise ``ReplayMissError`` on a miss, for
+  deterministic reruns and tests without network or API keys
+- ``off``: always call the LLM
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+from pydantic import PrivateAttr
+
+import storage
+
+OFF = "off"
+READ_WRITE = "read_write"
+REPLAY = "replay"
+MODE = os.environ.get("LLM_CACHE_MODE", READ_WRITE)
+TTL = float(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))  # seconds
+MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))
+
+
+# Builds the LLM behind a CachedLLM; see set_llm_factory
+_llm_factory: Callable[..., BaseLLM] = LLM
+
+
+def set_llm_factory(factory: Optional[Callable[..., BaseLLM]]) -> None:
+    """Create the LLMs behind cached LLMs with ``factory(model=..., temperature=...,
+    **llm_kwargs)`` from now on (None: crewai's ``LLM``), e.g. to run the crews
+    against a scripted LLM offline"""
+    global _llm_factory
+    _llm_factory = factory or LLM
+
+
+class ReplayMissError(RuntimeError):
+    """Raised in replay mode when a call has no cached response"""
+
+
+def default_model() -> str:
+    """The model crewai would pick for an agent without an explicit LLM"""
+    from crewai.constants import DEFAULT_LLM_MODEL
+    return os.environ.get("MODEL") or os.environ.get("OPENAI_MODEL_NAME") or DEFAULT_LLM_MODEL
+
+
+def cache_key(model: str, temperature: Optional[float], messages: Any, tools: Any = None, stop: Any = None) -> str:
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages, "tools": tools, "stop": stop},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, db_name: str = "llm_cache.sqlite3", ttl: float = TTL, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                             (key, model, response, now, now))
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+class CachedLLM(BaseLLM):
+    """crewai LLM that answers repeated calls from the response cache.
+
+    The wrapped LLM is created lazily and replayed runs never call it, so they
+    need neither network access nor an API key.
+    """
+
+    llm_kwargs: dict = {}
+    mode: str = MODE
+    _inner: Any = PrivateAttr(default=None)
+
+    @classmethod
+    def wrap(cls, llm: BaseLLM, mode: str = MODE) -> "CachedLLM":
+        """Put an existing LLM instance behind the cache"""
+        cached = cls(model=llm.model, temperature=llm.temperature, mode=mode)
+        cached._inner = llm
+        return cached
+
+    @property
+    def inner(self) -> BaseLLM:
+        if self._inner is None:
+            self._inner = _llm_factory(model=self.model, temperature=self.temperature, **self.llm_kwargs)
+        return self._inner
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        if self.mode == OFF:
+            return self._call_inner(messages, tools, callbacks, available_functions,
+                                    from_task, from_agent, response_model)
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        key = cache_key(self.model, self.temperature, messages, tools, self.stop)
+        cache = get_llm_cache()
+        response = cache.get(key)
+        if response is not None:
+            return response
+        if self.mode == REPLAY:
+            raise ReplayMissError(f"no cached response for {self.model} call {key[:12]}")
+        response = self._call_inner(messages, tools, callbacks, available_functions,
+                                    from_task, from_agent, response_model)
+        # Tool-call objects and structured outputs are not cached, only text
+        if isinstance(response, str):
+            cache.put(key, self.model, response)
+        return response
+
+    def _call_inner(self, messages, tools, callbacks, available_functions, from_task, from_agent, response_model):
+        inner = self.inner
+        # crewai sets stop words and streaming on the agent's LLM, i.e. on this wrapper
+        inner.stop = self.stop
+        inner.stream = self.stream
+        return inner.call(messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                          from_task=from_task, from_agent=from_agent, response_model=response_model)
+
+    def supports_function_calling(self) -> bool:
+        supports = getattr(self.inner, "supports_function_calling", None)
+        return bool(supports and supports())
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+def cached_llm(model: str = None, temperature: float = None, mode: str = MODE, **kwargs) -> CachedLLM:
+    """A cached LLM for ``model`` (default: crewai's default model); extra keyword
+    arguments are passed to crewai's ``LLM`` when it is created"""
+    return CachedLLM(model=model or default_model(), temperature=temperature, mode=mode, llm_kwargs=kwargs)
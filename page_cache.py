@@ -0,0 +1,156 @@
+"""Persistent TTL cache for scraped source pages.
+
+Pages are stored in SQLite keyed by URL. A fresh entry is served without
+touching the network; a stale one is revalidated with If-None-Match /
+If-Modified-Since so an unchanged page costs a 304 instead of a full
+download. When the refresh fails (timeout, open circuit, connection error)
+the stale copy is served instead, so a page on disk is not lost exactly when
+its host is down. The cache is bounded in bytes and evicts least recently
+used pages first.
+"""
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from fetcher import host_of
+import storage
+
+DEFAULT_TTL = 6 * 3600  # seconds
+# Event listings change within hours; organisation pages rarely do
+SOURCE_TTLS = {
+    "lu.ma": 2 * 3600,
+    "meetup.com": 2 * 3600,
+    "eventbrite.com": 3 * 3600,
+    "linkedin.com": 3 * 3600,
+}
+MAX_BYTES = int(os.environ.get("PAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+
+class CachedPage(NamedTuple):
+    """Response-like view of a page; exposes ``status_code`` and ``content``"""
+    url: str
+    status_code: int
+    content: bytes
+    from_cache: bool = False
+
+
+def ttl_for(url: str, ttls: dict = SOURCE_TTLS, default: int = DEFAULT_TTL) -> int:
+    """Return the TTL for ``url``, matching the most specific configured domain"""
+    host = host_of(url)
+    while host:
+        if host in ttls:
+            return ttls[host]
+        _, _, host = host.partition(".")
+    return default
+
+
+class PageCache:
+    def __init__(self, db_name: str = "pages.sqlite3", max_bytes: int = MAX_BYTES, ttls: dict = None):
+        self.max_bytes = max_bytes
+        self.ttls = SOURCE_TTLS if ttls is None else ttls
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stale = 0  # stale pages served because the refresh failed
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+
+    def get(self, url: str, fetch: Callable, timeout: float) -> CachedPage:
+        """Return ``url`` from the cache, fetching or revalidating it when stale.
+
+        ``fetch(url, timeout=..., headers=...)`` performs the network request.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, body, etag, last_modified, expires_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row and row[4] > now:
+                self.hits += 1
+                self._db.execute("UPDATE pages SET last_access = ? WHERE url = ?", (now, url))
+                return CachedPage(url, row[0], row[1], from_cache=True)
+
+        headers = {}
+        if row:
+            if row[2]:
+                headers['If-None-Match'] = row[2]
+            if row[3]:
+                headers['If-Modified-Since'] = row[3]
+        try:
+            response = fetch(url, timeout=timeout, headers=headers or None)
+        except Exception:
+            if row is None:
+                raise
+            with self._lock:
+                self.stale += 1
+            return CachedPage(url, row[0], row[1], from_cache=True)
+        now = time.time()
+
+        with self._lock:
+            if row and response.status_code == 304:
+                self.revalidated += 1
+                self._db.execute(
+                    "UPDATE pages SET expires_at = ?, last_access = ? WHERE url = ?",
+                    (now + ttl_for(url, self.ttls), now, url),
+                )
+                return CachedPage(url, row[0], row[1], from_cache=True)
+
+            self.misses += 1
+            if response.status_code == 200:
+                body = response.content
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, 200, body, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                     now, now + ttl_for(url, self.ttls), now, len(body)),
+                )
+                self._evict()
+            return CachedPage(url, response.status_code, response.content)
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used pages until we are back under the limit
+        for url, size in self._db.execute("SELECT url, size FROM pages ORDER BY last_access").fetchall():
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated,
+                "stale": self.stale, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM pages")
+
+
+_cache: Optional[PageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide page cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
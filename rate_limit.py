@@ -0,0 +1,50 @@
+"""Token-bucket rate limiting for outgoing requests."""
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, with bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one will be"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float = None) -> bool:
+        """Block until a token is available; False if that would take longer than ``timeout``"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def wrap(self, fetch: Callable) -> Callable:
+        """Rate-limit a ``fetch(url, timeout, ...)`` callable; waiting counts against its timeout"""
+
+        def limited(url, timeout, *args, **kwargs):
+            started = time.monotonic()
+            if not self.acquire(timeout):
+                raise TimeoutError("rate limit: no request slot before timeout")
+            return fetch(url, max(0.1, timeout - (time.monotonic() - started)), *args, **kwargs)
+
+        return limited
@@ -0,0 +1,155 @@
+"""Concurrent Reddit fetch stage for the reddit newsletter.
+
+Listings of several subreddits are fetched side by side, then the comments
+of every post are hydrated in parallel. Each worker thread has its own
+``praw.Reddit`` (PRAW instances are not thread-safe) on the shared pooled
+session, and a shared token bucket keeps the whole stage under Reddit's
+OAuth limit of 100 requests per minute. Rate-limit and server errors are
+retried with exponential backoff that honours ``Retry-After`` and
+``X-Ratelimit-Reset`` instead of sleeping a fixed minute.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional, Sequence, TypeVar
+
+import praw
+import prawcore
+
+import http_client
+from rate_limit import TokenBucket
+
+MAX_WORKERS = int(os.environ.get("REDDIT_WORKERS", 8))
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+MAX_BACKOFF = 60.0
+# Reddit allows 100 OAuth requests per minute; a burst of 30 covers one scrape
+request_limiter = TokenBucket(rate=100 / 60, capacity=30)
+
+_RETRYABLE = (prawcore.exceptions.TooManyRequests, prawcore.exceptions.ServerError,
+              prawcore.exceptions.RequestException, praw.exceptions.RedditAPIException)
+
+T = TypeVar("T")
+
+
+class RedditComment(NamedTuple):
+    id: str
+    body: str
+    score: int = 0
+
+
+class RedditPost(NamedTuple):
+    subreddit: str
+    id: str
+    title: str
+    url: str
+    score: int = 0
+    num_comments: int = 0
+    created_utc: float = 0.0
+    comments: List[RedditComment] = []
+
+
+def backoff_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number ``attempt`` (0-based) after ``error``"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after", "x-ratelimit-reset"):
+        try:
+            if header == "x-ratelimit-reset" and float(headers.get("x-ratelimit-remaining", 1)) >= 1:
+                continue  # quota left, the reset time is irrelevant
+            return min(MAX_BACKOFF, float(headers[header]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return min(MAX_BACKOFF, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def with_backoff(fn: Callable[[], T], retries: int = MAX_RETRIES) -> T:
+    """Call ``fn`` under the shared rate limit, retrying rate-limit and server errors"""
+    for attempt in range(retries + 1):
+        request_limiter.acquire()
+        try:
+            return fn()
+        except _RETRYABLE as e:
+            if attempt == retries:
+                raise
+            delay = backoff_delay(e, attempt)
+            print(f"Reddit API error ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+_local = threading.local()
+
+
+def _reddit() -> praw.Reddit:
+    """This thread's Reddit client"""
+    reddit = getattr(_local, "reddit", None)
+    if reddit is None:
+        reddit = _local.reddit = praw.Reddit(
+            client_id=os.environ.get("REDDIT_CLIENT_ID", "client-id"),
+            client_secret=os.environ.get("REDDIT_CLIENT_SECRET", "client-secret"),
+            user_agent=os.environ.get("REDDIT_USER_AGENT", "user-agent"),
+            requestor_kwargs={"session": http_client.get_session("reddit.com")},
+        )
+    return reddit
+
+
+def fetch_listing(subreddit: str, limit: int) -> List[RedditPost]:
+    """Hot posts of ``subreddit``, without comments"""
+    posts = with_backoff(lambda: list(_reddit().subreddit(subreddit).hot(limit=limit)))
+    return [RedditPost(subreddit, post.id, post.title, post.url, post.score, post.num_comments, post.created_utc)
+            for post in posts]
+
+
+def fetch_comments(post_id: str, limit: Optional[int]) -> List[RedditComment]:
+    """Top-level and loaded reply bodies of a post, at most ``limit`` of them (None: all)"""
+
+    def load():
+        submission = _reddit().submission(id=post_id)
+        if limit is not None:
+            submission.comment_limit = limit  # ask Reddit for no more than we keep
+        submission.comment_sort = "top"
+        submission.comments.replace_more(limit=0)  # skip "load more comments" requests
+        return [RedditComment(comment.id, comment.body, comment.score)
+                for comment in submission.comments.list()[:limit]]
+
+    return with_backoff(load)
+
+
+def scrape_subreddits(subreddits: Sequence[str], posts_per_subreddit: int = 12,
+                      max_comments_per_post: Optional[int] = 7,
+                      max_workers: int = MAX_WORKERS,
+                      hydrate_if: Callable[[RedditPost], bool] = None,
+                      listing_fetcher: Callable = fetch_listing,
+                      comments_fetcher: Callable = fetch_comments) -> List[RedditPost]:
+    """Hot posts of every subreddit with their comments, in listing order.
+
+    ``max_comments_per_post=None`` keeps every loaded comment; with
+    ``hydrate_if`` only the posts it accepts get their comments loaded. A
+    subreddit that can't be listed is skipped and a post whose comments still
+    fail after retries is kept without comments.
+    """
+
+    def listing(name: str) -> List[RedditPost]:
+        try:
+            return listing_fetcher(name, posts_per_subreddit)
+        except Exception as e:
+            print(f"Could not list r/{name}: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reddit") as pool:
+        posts = [post for posts in pool.map(listing, subreddits) for post in posts]
+        if max_comments_per_post == 0:
+            return posts
+
+        def hydrate(post: RedditPost) -> RedditPost:
+            if hydrate_if is not None and not hydrate_if(post):
+                return post
+            try:
+                return post._replace(comments=comments_fetcher(post.id, max_comments_per_post))
+            except Exception as e:
+                print(f"Could not load comments of {post.url}: {e}")
+                return post
+
+        return list(pool.map(hydrate, posts))
@@ -1,56 +1,48 @@
-import praw
-import time
 import os
+import sys
 
-from langchain.tools import tool
-from langchain.llms import Ollama
 from crewai import Agent, Task, Process, Crew
+from crewai.tools import tool
 
+from checkpoints import kickoff_with_checkpoints
+from llm_cache import cached_llm
+from reddit_fetch import scrape_subreddits
+from reddit_store import SYNC, render_sync, sync_subreddits
 
-from langchain.agents import load_tools
+# Human in the loop only when someone is at the terminal (not in cron runs)
+HUMAN_INPUT = os.environ.get("REDDIT_HUMAN_INPUT", "1" if sys.stdin.isatty() else "0") == "1"
 
-# To load Human in the loop
-human_tools = load_tools(["human"])
+
+def human_tools():
+    """The human input tool, loaded only when HUMAN_INPUT is on"""
+    if not HUMAN_INPUT:
+        return []
+    from langchain.agents import load_tools
+    return load_tools(["human"])
 
 # To Load GPT-4
 api = os.environ.get("OPENAI_API_KEY")
 
 
-# To Load Local models through Ollama
-mistral = Ollama(model="mistral")
+# To Load Local models through Ollama (responses are cached, see llm_cache)
+mistral = cached_llm("ollama/mistral")
 
 
 class BrowserTool:
     @tool("Scrape reddit content")
-    def scrape_reddit(max_comments_per_post=7):
-        """Useful to scrape a reddit content"""
-        reddit = praw.Reddit(
-            client_id="client-id",
-            client_secret="client-secret",
-            user_agent="user-agent",
-        )
-        subreddit = reddit.subreddit("LocalLLaMA")
-        scraped_data = []
-
-        for post in subreddit.hot(limit=12):
-            post_data = {"title": post.title, "url": post.url, "comments": []}
-
-            try:
-                post.comments.replace_more(limit=0)  # Load top-level comments only
-                comments = post.comments.list()
-                if max_comments_per_post is not None:
-                    comments = comments[:7]
-
-                for comment in comments:
-                    post_data["comments"].append(comment.body)
-
-                scraped_data.append(post_data)
-
-            except praw.exceptions.APIException as e:
-                print(f"API Exception: {e}")
-                time.sleep(60)  # Sleep for 1 minute before retrying
-
-        return scraped_data
+    def scrape_reddit(subreddits: str = "LocalLLaMA", max_comments_per_post: int = 7):
+        """Useful to scrape a reddit content. Pass several subreddits separated by commas"""
+        max_comments_per_post = int(max_comments_per_post)  # LLMs sometimes pass "7"
+        names = [name.strip().removeprefix("r/") for name in str(subreddits).split(",") if name.strip()]
+        names = names or ["LocalLLaMA"]
+        if SYNC:
+            # Only new and changed posts are loaded and shown in full (see reddit_store)
+            return render_sync(sync_subreddits(names, max_comments_per_post=max_comments_per_post))
+        # Listings and comments are fetched concurrently (see reddit_fetch)
+        posts = scrape_subreddits(names, max_comments_per_post=max_comments_per_post)
+        return [{"subreddit": post.subreddit, "title": post.title, "url": post.url,
+                 "comments": [comment.body for comment in post.comments]}
+                for post in posts]
 
 
 """
@@ -69,7 +61,7 @@ explorer = Agent(
     """,
     verbose=True,
     allow_delegation=False,
-    tools=[BrowserTool().scrape_reddit] + human_tools,
+    tools=[BrowserTool().scrape_reddit] + human_tools(),
     llm=mistral,  # remove to use default gpt-4
 )
 
@@ -102,6 +94,7 @@ task_report = Task(
     Each bullet point MUST contain 3 sentences that refer to one specific ai company, product, model or anything you found on subreddit LocalLLama.  
     """,
     agent=explorer,
+    expected_output="A detailed analysis report with bullet points listing 5-10 exciting AI projects and tools, with each bullet containing 3 sentences about a specific AI company, product, or model."
 )
 
 task_blog = Task(
@@ -121,6 +114,7 @@ task_blog = Task(
     ```
     """,
     agent=writer,
+    expected_output="A blog article in markdown format with compelling headline and at least 10 paragraphs, featuring specific AI projects with links and formatted according to the specified template."
 )
 
 task_critique = Task(
@@ -136,18 +130,25 @@ task_critique = Task(
     Make sure that it does and if it doesn't, rewrite it accordingly.
     """,
     agent=critic,
+    expected_output="A finalized blog article that strictly follows the specified markdown format with proper project titles, links, interesting facts, and thoughts on newsletter theme connections."
 )
 
 # instantiate crew of agents
 crew = Crew(
     agents=[explorer, writer, critic],
     tasks=[task_report, task_blog, task_critique],
-    verbose=2,
+    verbose=True,
     process=Process.sequential,  # Sequential process will have tasks executed one after the other and the outcome of the previous one is passed as extra content into this next.
 )
 
-# Get your crew to work!
-result = crew.kickoff()
 
-print("######################")
-print(result)
+def main():
+    # Get your crew to work! A rerun on the same day resumes after the last finished task
+    result = kickoff_with_checkpoints(crew, run_key="reddit_newsletter")
+
+    print("######################")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
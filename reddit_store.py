@@ -0,0 +1,257 @@
+"""Local store of Reddit posts and comments for incremental syncs.
+
+Posts and comments are kept in SQLite keyed by their Reddit IDs, and every
+sync adds a score / comment-count snapshot per post. A sync still lists the
+subreddits (one request each) but only loads comments for posts that are new
+or whose comment count grew meaningfully since their comments were last
+stored; every other post is answered from the store. The result is a diff
+against the previous sync - new posts, rising posts and the rest - so a
+daily newsletter only spends API calls and prompt space on what changed.
+
+With ``REDDIT_FIXTURE`` pointing to a JSON file recorded by
+``record_fixture``, syncs read the fixture instead of the live API.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from reddit_fetch import RedditComment, RedditPost, fetch_comments, fetch_listing, scrape_subreddits
+import storage
+
+SYNC = os.environ.get("REDDIT_SYNC", "1") != "0"
+FIXTURE = os.environ.get("REDDIT_FIXTURE")
+RISING_MIN_DELTA = int(os.environ.get("REDDIT_RISING_MIN_DELTA", 20))  # score gained since last sync
+# Reload comments once the count grew by this many and by this fraction
+COMMENT_REFRESH_MIN = 5
+COMMENT_REFRESH_RATIO = 0.2
+
+NEW = "new"
+RISING = "rising"
+SEEN = "seen"
+
+
+class PostChange(NamedTuple):
+    post: RedditPost
+    status: str  # NEW, RISING or SEEN
+    score_delta: int = 0
+    comments_delta: int = 0
+
+
+class SyncResult(NamedTuple):
+    changes: List[PostChange]
+    hydrated: int  # posts whose comments were fetched from Reddit
+
+    def with_status(self, status: str) -> List[PostChange]:
+        return [change for change in self.changes if change.status == status]
+
+
+class _Known(NamedTuple):
+    score: int
+    num_comments: int
+    comments_synced: Optional[int]  # num_comments when comments were last stored
+
+
+def comments_changed(post: RedditPost, known: Optional[_Known]) -> bool:
+    """Whether the stored comments of ``post`` are missing or too far behind"""
+    if known is None or known.comments_synced is None:
+        return True
+    grown = post.num_comments - known.comments_synced
+    return grown >= COMMENT_REFRESH_MIN and grown >= COMMENT_REFRESH_RATIO * max(1, known.comments_synced)
+
+
+class RedditStore:
+    def __init__(self, db_name: str = "reddit.sqlite3"):
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id TEXT PRIMARY KEY,
+                subreddit TEXT NOT NULL,
+                title TEXT NOT NULL,
+                url TEXT,
+                created_utc REAL,
+                score INTEGER NOT NULL,
+                num_comments INTEGER NOT NULL,
+                comments_synced INTEGER,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS comments (
+                id TEXT PRIMARY KEY,
+                post_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                body TEXT NOT NULL,
+                score INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS comments_post ON comments (post_id, position);
+            CREATE TABLE IF NOT EXISTS snapshots (
+                post_id TEXT NOT NULL,
+                taken_at REAL NOT NULL,
+                score INTEGER NOT NULL,
+                num_comments INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_post ON snapshots (post_id, taken_at);
+            """
+        )
+
+    def known(self, post_id: str) -> Optional[_Known]:
+        with self._lock:
+            row = self._db.execute("SELECT score, num_comments, comments_synced FROM posts WHERE id = ?",
+                                   (post_id,)).fetchone()
+        return _Known(*row) if row else None
+
+    def comments_of(self, post_id: str, limit: Optional[int] = None) -> List[RedditComment]:
+        with self._lock:
+            rows = self._db.execute("SELECT id, body, score FROM comments WHERE post_id = ? ORDER BY position",
+                                    (post_id,)).fetchall()
+        return [RedditComment(*row) for row in rows[:limit]]
+
+    def save(self, posts: Sequence[RedditPost], hydrated: Sequence[str], now: float = None) -> None:
+        """Upsert ``posts`` with a snapshot each; replace the comments of the ``hydrated`` post IDs"""
+        now = now or time.time()
+        hydrated = set(hydrated)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for post in posts:
+                    synced = post.num_comments if post.id in hydrated else None
+                    self._db.execute(
+                        """INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT (id) DO UPDATE SET title = excluded.title, url = excluded.url,
+                           score = excluded.score, num_comments = excluded.num_comments,
+                           comments_synced = COALESCE(excluded.comments_synced, comments_synced),
+                           last_seen = excluded.last_seen""",
+                        (post.id, post.subreddit, post.title, post.url, post.created_utc, post.score,
+                         post.num_comments, synced, now, now),
+                    )
+                    self._db.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?)",
+                                     (post.id, now, post.score, post.num_comments))
+                    if post.id in hydrated:
+                        self._db.execute("DELETE FROM comments WHERE post_id = ?", (post.id,))
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?)",
+                            [(comment.id, post.id, position, comment.body, comment.score)
+                             for position, comment in enumerate(post.comments)],
+                        )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+_store: Optional[RedditStore] = None
+_store_lock = threading.Lock()
+
+
+def get_reddit_store() -> RedditStore:
+    """Return the process-wide Reddit store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RedditStore()
+        return _store
+
+
+Source = Tuple[Callable, Callable]  # (listing fetcher, comments fetcher) as used by scrape_subreddits
+
+
+def fixture_source(path: str) -> Source:
+    """Serve listings and comments from a fixture written by ``record_fixture``"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    posts = {}
+    for subreddit, entries in data.items():
+        for entry in entries:
+            comments = [RedditComment(**comment) for comment in entry.pop("comments", [])]
+            posts[entry["id"]] = RedditPost(subreddit=subreddit, comments=comments, **entry)
+
+    def listing(subreddit: str, limit: int) -> List[RedditPost]:
+        return [post._replace(comments=[]) for post in posts.values() if post.subreddit == subreddit][:limit]
+
+    def comments(post_id: str, limit: Optional[int]) -> List[RedditComment]:
+        return posts[post_id].comments[:limit]
+
+    return listing, comments
+
+
+def record_fixture(path: str, subreddits: Sequence[str], posts_per_subreddit: int = 12,
+                   max_comments_per_post: Optional[int] = 7) -> None:
+    """Save the live hot posts and comments of ``subreddits`` as a fixture"""
+    data: Dict[str, list] = {}
+    for post in scrape_subreddits(subreddits, posts_per_subreddit, max_comments_per_post):
+        entry = post._asdict()
+        entry["comments"] = [comment._asdict() for comment in post.comments]
+        data.setdefault(entry.pop("subreddit"), []).append(entry)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def sync_subreddits(subreddits: Sequence[str], store: RedditStore = None, posts_per_subreddit: int = 12,
+                    max_comments_per_post: Optional[int] = 7, source: Source = None) -> SyncResult:
+    """List ``subreddits``, load comments only where they changed and diff against the last sync"""
+    store = store or get_reddit_store()
+    if source is None:
+        source = fixture_source(FIXTURE) if FIXTURE else (fetch_listing, fetch_comments)
+    listing_fetcher, comments_fetcher = source
+
+    previous: Dict[str, Optional[_Known]] = {}
+    accepted = set()
+
+    def hydrate_if(post: RedditPost) -> bool:
+        previous[post.id] = store.known(post.id)
+        if comments_changed(post, previous[post.id]):
+            accepted.add(post.id)
+            return True
+        return False
+
+    posts = scrape_subreddits(subreddits, posts_per_subreddit, max_comments_per_post, hydrate_if=hydrate_if,
+                              listing_fetcher=listing_fetcher, comments_fetcher=comments_fetcher)
+    # hydrate_if isn't asked about every post (e.g. with max_comments_per_post=0)
+    for post in posts:
+        if post.id not in previous:
+            previous[post.id] = store.known(post.id)
+    # A post without comments counts as synced; one whose comments failed to load doesn't
+    hydrated = [post.id for post in posts if post.comments or (post.id in accepted and not post.num_comments)]
+    store.save(posts, hydrated)
+
+    changes = []
+    for post in posts:
+        if not post.comments:
+            post = post._replace(comments=store.comments_of(post.id, max_comments_per_post))
+        known = previous.get(post.id)
+        if known is None:
+            changes.append(PostChange(post, NEW))
+            continue
+        score_delta = post.score - known.score
+        status = RISING if score_delta >= RISING_MIN_DELTA else SEEN
+        changes.append(PostChange(post, status, score_delta, post.num_comments - known.num_comments))
+    return SyncResult(changes, len(hydrated))
+
+
+def _render_post(change: PostChange, with_comments: bool) -> List[str]:
+    post = change.post
+    delta = ""
+    if change.status == RISING:
+        delta = f", +{change.score_delta} score / +{change.comments_delta} comments since last sync"
+    lines = [f"- [r/{post.subreddit}] {post.title} ({post.score} points, {post.num_comments} comments{delta}) "
+             f"{post.url}"]
+    if with_comments:
+        lines.extend(f"    > {' '.join(comment.body.split())[:300]}" for comment in post.comments)
+    return lines
+
+
+def render_sync(result: SyncResult) -> str:
+    """Agent-readable diff view: new and rising posts with comments, the rest as titles"""
+    lines = []
+    for status, heading, with_comments in ((NEW, "New posts since the last sync", True),
+                                           (RISING, "Rising posts", True),
+                                           (SEEN, "Other hot posts (covered before)", False)):
+        changes = result.with_status(status)
+        if changes:
+            lines.append(f"{heading} ({len(changes)}):")
+            for change in changes:
+                lines.extend(_render_post(change, with_comments))
+    return "\n".join(lines) or "No posts found."
@@ -0,0 +1,188 @@
+"""Event research pipeline behind the "Web Search" tool.
+
+Every registered source is fetched concurrently (through the page cache and
+the pooled HTTP sessions), each page is reduced to ``Event`` records, and the
+records are rendered into agent-readable text in one final step.
+"""
+import os
+import time
+from datetime import date, timedelta
+from typing import Callable, List, NamedTuple, Optional
+
+from compaction import TOKEN_BUDGET, compact_events
+from event_sources import SourceRegistry, default_registry, extract_event_urls
+from event_extract import fill_details
+from event_store import EventStore, get_event_store
+from events import Event, dedupe_events, render_events
+from fetcher import DEFAULT_DEADLINE, DEFAULT_PER_HOST_LIMIT, fetch_all, host_of
+from host_health import get_host_health
+from html_extract import extract_page
+import http_client
+from keyword_classifier import heading_classifier
+from page_cache import get_page_cache, ttl_for
+from rate_limit import TokenBucket
+import streaming
+
+MAX_EVENTS_PER_SOURCE = 10
+MIN_HEADING_LENGTH = 6  # shorter headings are navigation noise
+# Answer pages that are not due for a refresh from the event index
+INCREMENTAL = os.environ.get("RESEARCH_INCREMENTAL", "1") != "0"
+# Also answer with indexed events dated this many days ahead that the crawl didn't find (0: off)
+INDEX_WINDOW_DAYS = int(os.environ.get("RESEARCH_INDEX_WINDOW_DAYS", 10))
+
+
+class SourceReport(NamedTuple):
+    name: str
+    url: str
+    error: Optional[str] = None  # None when the page was scraped
+    events: int = 0
+    from_index: bool = False  # answered from the event index without fetching
+
+
+def _publish(report: SourceReport) -> SourceReport:
+    """Stream the per-source outcome to the UI while the crawl is still running"""
+    if report.error is not None:
+        streaming.emit("source", report.name, f"❌ {report.error}")
+    else:
+        origin = " (from index)" if report.from_index else ""
+        streaming.emit("source", report.name, f"✅ {report.events} events{origin}")
+    return report
+
+
+class ResearchResult(NamedTuple):
+    query: str
+    events: List[Event]
+    reports: List[SourceReport]
+
+
+def fetch_page(url: str, timeout: float, limiter: TokenBucket = None):
+    """Serve from the on-disk page cache when fresh; otherwise fetch (or revalidate)
+    through the pooled keep-alive session of the host, guarded by its circuit
+    breaker, rate limit and adaptive timeout. ``limiter`` additionally limits
+    the requests that actually go out; cache hits never wait for it."""
+    fetch = get_host_health().wrap(http_client.get)
+    if limiter is not None:
+        fetch = limiter.wrap(fetch)
+    return get_page_cache().get(url, fetch, timeout)
+
+
+def scrape_page(url: str, content: bytes, registry: SourceRegistry) -> List[Event]:
+    """Turn one downloaded page into events"""
+    page = extract_page(content)
+    source = registry.lookup(url)
+    source_name = source.name if source else host_of(url)
+    if source:
+        event_urls = source.extract_event_urls(url, page.links)
+    else:
+        event_urls = extract_event_urls(url, page.links)
+
+    ai_titles = []
+    event_titles = []
+    for heading in heading_classifier.classify_batch(t for t in page.headings if len(t) >= MIN_HEADING_LENGTH):
+        if heading.category == "ai":
+            ai_titles.append(heading.text)
+        elif heading.category == "event":
+            event_titles.append(heading.text)
+
+    # Prefer AI events; fall back to general events, then to bare signup URLs.
+    # Headings and event links are paired by position on the page.
+    titles, category = (ai_titles, "ai") if ai_titles else (event_titles, "event")
+    if titles:
+        # Listing headings often carry the date/time ("Aug 26 · 6:00 PM · GenAI Night")
+        events = [fill_details(Event(title, event_urls[i] if i < len(event_urls) else None, source_name,
+                                     category=category), title)
+                  for i, title in enumerate(titles)]
+    else:
+        events = [Event("", event_url, source_name) for event_url in event_urls]
+    return dedupe_events(events)[:MAX_EVENTS_PER_SOURCE]
+
+
+def research_events(
+    query: str,
+    registry: SourceRegistry = None,
+    fetch: Callable = fetch_page,
+    store: EventStore = None,
+    incremental: bool = INCREMENTAL,
+    page_urls: List[str] = None,
+    deadline: float = DEFAULT_DEADLINE,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    window_days: int = INDEX_WINDOW_DAYS,
+) -> ResearchResult:
+    """Scrape every source for ``query``; pages are processed as they arrive.
+
+    Scraped events are upserted into the event index. In incremental mode only
+    pages due for a refresh (per the page cache TTLs) are fetched; the others
+    contribute the events found on them last time. Indexed events dated in the
+    next ``window_days`` days are added after the crawled ones, so events from
+    earlier crawls (other keywords, pages that failed this time) still count.
+    ``page_urls`` overrides the pages to crawl (default: every source's URLs
+    for ``query``); ``deadline`` and ``per_host_limit`` are passed on to the
+    fetch stage.
+    """
+    registry = registry or default_registry()
+    store = store or get_event_store()
+    page_urls = page_urls if page_urls is not None else registry.urls_for(query)
+    due = store.due_pages(page_urls, ttl_for) if incremental else page_urls
+
+    page_events = {}
+    reports = {}
+    for page_url in page_urls:
+        if page_url not in due:
+            source = registry.lookup(page_url)
+            page_events[page_url] = store.events_from_pages([page_url])
+            reports[page_url] = _publish(SourceReport(source.name if source else host_of(page_url), page_url,
+                                                      events=len(page_events[page_url]), from_index=True))
+
+    for fetched in fetch_all(due, fetch, deadline=deadline, per_host_limit=per_host_limit):
+        source = registry.lookup(fetched.url)
+        name = source.name if source else host_of(fetched.url)
+        error = None
+        if fetched.error is not None:
+            error = str(fetched.error)[:50]
+        elif fetched.response.status_code != 200:
+            error = f"HTTP {fetched.response.status_code}"
+        else:
+            try:
+                scraped = scrape_page(fetched.url, fetched.response.content, registry)
+            except Exception as e:
+                error = str(e)[:50]
+        now = time.time()
+        store.record_fetch(fetched.url, ok=error is None, now=now)
+        if error is not None:
+            reports[fetched.url] = _publish(SourceReport(name, fetched.url, error=error))
+            continue
+        store.upsert(scraped, page_url=fetched.url, now=now)
+        page_events[fetched.url] = scraped
+        reports[fetched.url] = _publish(SourceReport(name, fetched.url, events=len(scraped)))
+
+    # Pages finish in any order; merge them in crawl order so that the same
+    # crawl always renders the same text (and hits the LLM cache)
+    order = [url for url in dict.fromkeys(page_urls) if url in reports]
+    events = [event for url in order for event in page_events.get(url, [])]
+    if window_days:
+        today = date.today()
+        events.extend(store.events_between(today, today + timedelta(days=window_days)))
+    return ResearchResult(query, dedupe_events(events), [reports[url] for url in order])
+
+
+def render_research(result: ResearchResult, token_budget: int = TOKEN_BUDGET) -> str:
+    """Render research results as compact, agent-readable text.
+
+    Events are ranked and truncated to fit ``token_budget`` (see compaction).
+    """
+    scraped = sum(1 for report in result.reports if report.error is None)
+    events, compaction = compact_events(result.events, Event.render, token_budget, result.query)
+    lines = [f"Deep research results for '{result.query}': "
+             f"{len(events)} events from {scraped}/{len(result.reports)} sources"]
+    if events:
+        lines.append("Each event lists its exact SIGNUP URL; copy it as-is.")
+        lines.extend(render_events(events))
+        if compaction.events_kept < compaction.events_in:
+            lines.append(f"({compaction.events_in - compaction.events_kept} lower-ranked events omitted, "
+                         f"~{compaction.tokens_saved} tokens saved)")
+    else:
+        lines.append("No specific events or signup URLs found; only then use 'Sign up URL not available'.")
+    failed = [f"{report.name} ({report.error})" for report in result.reports if report.error is not None]
+    if failed:
+        lines.append("Unavailable sources: " + "; ".join(failed))
+    return "\n".join(lines)
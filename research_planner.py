@@ -0,0 +1,86 @@
+"""Research planner: one newsletter request becomes a (platform x keyword) grid.
+
+Instead of the explorer agent looping over slow tool calls, one search plans
+subqueries for every registered source - the request itself plus the
+source's own keywords - and runs the whole grid through the concurrent
+fetch stage under a shared rate limit. The agent gets one merged,
+deduplicated event set from a single tool call.
+
+A grid puts several pages on the same host (one per keyword), so it is
+fetched with ``GRID_PER_HOST_LIMIT`` requests in flight per host and a
+deadline that grows with the largest per-host column: one request timeout
+per wave of that column, at least the fetch stage's default and at most
+``GRID_MAX_DEADLINE``, so a slow Eventbrite or Meetup doesn't lose the
+tail of its column.
+"""
+import functools
+import math
+import os
+from collections import Counter
+from typing import List, NamedTuple
+
+from event_sources import SourceRegistry, default_registry
+from fetcher import DEFAULT_DEADLINE, DEFAULT_TIMEOUT, host_of
+from rate_limit import TokenBucket
+from research import ResearchResult, fetch_page, research_events
+
+KEYWORDS_PER_SOURCE = int(os.environ.get("RESEARCH_KEYWORDS_PER_SOURCE", 3))
+# Shared by every grid in the process so concurrent searches can't stampede the sources
+REQUESTS_PER_SECOND = float(os.environ.get("RESEARCH_REQUESTS_PER_SECOND", 10))
+request_limiter = TokenBucket(REQUESTS_PER_SECOND)
+GRID_PER_HOST_LIMIT = int(os.environ.get("RESEARCH_PER_HOST_LIMIT", 3))
+GRID_MAX_DEADLINE = float(os.environ.get("RESEARCH_MAX_DEADLINE", 60))  # seconds
+
+
+class Subquery(NamedTuple):
+    source: str
+    keyword: str
+    url: str
+
+
+def plan_queries(query: str, registry: SourceRegistry = None,
+                 keywords_per_source: int = KEYWORDS_PER_SOURCE) -> List[Subquery]:
+    """Expand ``query`` into one subquery per (source, keyword, URL template).
+
+    Each source is searched for the query itself plus its registered keywords
+    that the query doesn't already contain. Static pages (templates without a
+    query placeholder) are only planned once.
+    """
+    registry = registry or default_registry()
+    query = " ".join(query.split())
+    plan = []
+    seen_urls = set()
+    for source in registry:
+        keywords = [query] + [keyword for keyword in source.keywords if keyword not in query.lower()]
+        for keyword in keywords[:keywords_per_source]:
+            for url in source.urls_for(keyword):
+                if url not in seen_urls:
+                    seen_urls.add(url)
+                    plan.append(Subquery(source.name, keyword, url))
+    return plan
+
+
+def grid_deadline(urls: List[str], per_host_limit: int = GRID_PER_HOST_LIMIT,
+                  timeout: float = DEFAULT_TIMEOUT) -> float:
+    """Seconds for the fetch stage to get through ``urls``: one request timeout
+    per wave of the busiest host, between the default and the maximum deadline"""
+    busiest = max(Counter(host_of(url) for url in urls).values(), default=0)
+    waves = math.ceil(busiest / per_host_limit)
+    return min(GRID_MAX_DEADLINE, max(DEFAULT_DEADLINE, waves * timeout))
+
+
+def research_plan(query: str, registry: SourceRegistry = None, fetch=None, **kwargs) -> ResearchResult:
+    """Run the whole query grid for ``query`` and merge it into one event set.
+
+    Requests that go out share ``request_limiter``; pages served from the page
+    cache don't wait for it. A custom ``fetch`` is rate-limited as a whole.
+    """
+    registry = registry or default_registry()
+    urls = [subquery.url for subquery in plan_queries(query, registry)]
+    if fetch is None:
+        fetch = functools.partial(fetch_page, limiter=request_limiter)
+    else:
+        fetch = request_limiter.wrap(fetch)
+    kwargs.setdefault("per_host_limit", GRID_PER_HOST_LIMIT)
+    kwargs.setdefault("deadline", grid_deadline(urls, kwargs["per_host_limit"]))
+    return research_events(query, registry, fetch=fetch, page_urls=urls, **kwargs)
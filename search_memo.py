@@ -0,0 +1,56 @@
+"""Query normalization for memoizing search_tool results.
+
+The explorer agent tends to repeat the same search with small variations
+("AI events SF", "ai events in SF August 26 2025"). Normalizing case,
+whitespace, complete date expressions and stopwords maps those variations
+onto one key so the crawl only runs once per equivalent query.
+"""
+import os
+import re
+
+MEMO_TTL = int(os.environ.get("SEARCH_MEMO_TTL", 3600))  # seconds
+MEMO_MAX_ENTRIES = int(os.environ.get("SEARCH_MEMO_MAX_ENTRIES", 256))
+
+_MONTHS = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_WEEKDAYS = r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:rs(?:day)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\.?"
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+_YEAR = r"\d{4}"
+# Only complete date expressions: a bare month ("in May"), weekday or number
+# ("GPT-4", "top 10") changes what is being searched for and is kept
+_DATE_TOKENS = re.compile(
+    rf"""(?<![\w-])(?:
+        (?:{_WEEKDAYS},?\s+)?                           # Tuesday, ...
+        (?: \d{{4}}-\d{{1,2}}-\d{{1,2}}                 # 2025-08-26
+          | \d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?          # 8/26, 8/26/2025
+          | {_MONTHS}\s+{_DAY}(?:,?\s+{_YEAR})?         # Aug 26, August 26th 2025
+          | {_DAY}(?:\s+of)?\s+{_MONTHS}(?:,?\s+{_YEAR})?  # 26 August 2025
+          | {_MONTHS},?\s+{_YEAR}                       # August 2025
+        )
+      | today | tomorrow | tonight | weekend | upcoming
+      | (?:this|next)\s+(?:week|month)
+    )(?![\w-])""",
+    re.IGNORECASE | re.VERBOSE,
+)
+_NON_WORD = re.compile(r"[^\w\s.+#-]+")
+STOPWORDS = frozenset(
+    "a an and are at by for from in into is near of on or the to with within "
+    "days day next find search show list me please starting".split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Return ``query`` lower-cased with dates, stopwords and duplicate words removed.
+
+    Word order is kept so the result can still be used as a search query. If
+    nothing is left the lower-cased, whitespace-collapsed query is returned.
+    """
+    lowered = " ".join(query.lower().split())
+    text = _NON_WORD.sub(" ", _DATE_TOKENS.sub(" ", lowered))
+    words = [word.strip(".-") for word in text.split()]
+    kept = [word for word in dict.fromkeys(words) if word and word not in STOPWORDS]
+    return " ".join(kept) or lowered
+
+
+def memo_key(normalized_query: str) -> str:
+    """Order-insensitive cache key for an already normalized query"""
+    return " ".join(sorted(normalized_query.split()))
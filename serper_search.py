@@ -0,0 +1,204 @@
+"""Batched, cached Google search through the Serper API.
+
+``SerperSearch.search`` takes a batch of queries, answers the ones searched
+recently from a local SQLite cache and sends the rest to Serper's batch
+endpoint - up to ``BATCH_SIZE`` queries per POST, with several POSTs in
+flight for bigger batches - over the pooled keep-alive session. The
+structured JSON (organic results, top stories, news) is cached, and
+``render_results`` turns it into a few compact lines per query instead of
+the flattened blob of ``GoogleSerperAPIWrapper.run``.
+
+``SERPER_BASE_URL`` points the client at another server, e.g. the stub in
+``benchmarks/serper_stub.py``.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import http_client
+import storage
+
+BASE_URL = os.environ.get("SERPER_BASE_URL", "https://google.serper.dev")
+TTL = float(os.environ.get("SERPER_CACHE_TTL", 6 * 3600))  # seconds
+MAX_ENTRIES = int(os.environ.get("SERPER_CACHE_MAX_ENTRIES", 2000))
+BATCH_SIZE = 100  # Serper's limit of queries per request
+MAX_WORKERS = 4
+TIMEOUT = 20
+RESULTS_PER_QUERY = 5  # hits per section kept by render_results
+
+
+class SerperError(RuntimeError):
+    """Raised when Serper answers with an error status"""
+
+
+class Hit(NamedTuple):
+    title: str
+    link: str
+    snippet: str = ""
+    date: Optional[str] = None
+    source: Optional[str] = None
+
+
+class SearchResult(NamedTuple):
+    query: str
+    organic: List[Hit]
+    news: List[Hit]  # top stories and news results
+    from_cache: bool = False
+
+
+def _hits(entries: Optional[list]) -> List[Hit]:
+    return [Hit(entry.get("title", ""), entry.get("link", ""), entry.get("snippet", ""),
+                entry.get("date"), entry.get("source"))
+            for entry in entries or [] if entry.get("link")]
+
+
+def parse_result(query: str, payload: dict, from_cache: bool = False) -> SearchResult:
+    """The compact view of one Serper response"""
+    return SearchResult(query, _hits(payload.get("organic")),
+                        _hits(payload.get("topStories")) + _hits(payload.get("news")), from_cache)
+
+
+def normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def split_queries(text: str) -> List[str]:
+    """Queries separated by newlines or semicolons, without duplicates"""
+    queries = (query.strip() for query in re.split(r"[;\n]", text))
+    return list(dict.fromkeys(query for query in queries if query))
+
+
+class SearchCache:
+    def __init__(self, db_name: str = "serper.sqlite3", ttl: float = TTL, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = storage.connect(db_name)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT payload, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put_many(self, entries: Dict[str, tuple]) -> None:
+        """Store ``{key: (query, payload)}``"""
+        now = time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                 [(key, query, json.dumps(payload), now) for key, (query, payload) in entries.items()])
+            self._db.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
+
+
+class SerperSearch:
+    def __init__(self, api_key: str = None, base_url: str = BASE_URL, gl: str = "us", hl: str = "en",
+                 num: int = 10, cache: SearchCache = None, timeout: float = TIMEOUT):
+        self.api_key = api_key or os.environ.get("SERPER_API_KEY", "")
+        self.base_url = base_url.rstrip("/")
+        self.params = {"gl": gl, "hl": hl, "num": num}
+        self.cache = cache
+        self.timeout = timeout
+
+    def _key(self, query: str) -> str:
+        payload = json.dumps({"q": normalize(query), **self.params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _post(self, queries: List[str]) -> List[dict]:
+        response = http_client.post(
+            f"{self.base_url}/search", timeout=self.timeout,
+            headers={"X-API-KEY": self.api_key, "Content-Type": "application/json"},
+            json=[{"q": query, **self.params} for query in queries],
+        )
+        if response.status_code != 200:
+            raise SerperError(f"Serper returned {response.status_code}: {response.text[:200]}")
+        payloads = response.json()
+        # A single query may come back as a bare object
+        return payloads if isinstance(payloads, list) else [payloads]
+
+    def search(self, queries: Sequence[str]) -> List[SearchResult]:
+        """Results for every query, in order; cached queries cost no request"""
+        cache = self.cache or get_search_cache()
+        queries = list(dict.fromkeys(queries))
+        keys = [self._key(query) for query in queries]
+        payloads = {key: cache.get(key) for key in keys}
+        missing = [query for query, key in zip(queries, keys) if payloads[key] is None]
+
+        fetched = {}
+        if missing:
+            batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches)), thread_name_prefix="serper") as pool:
+                for batch, results in zip(batches, pool.map(self._post, batches)):
+                    fetched.update({self._key(query): (query, payload) for query, payload in zip(batch, results)})
+            cache.put_many(fetched)
+
+        results = []
+        for query, key in zip(queries, keys):
+            if payloads[key] is not None:
+                results.append(parse_result(query, payloads[key], from_cache=True))
+            else:
+                results.append(parse_result(query, fetched.get(key, (query, {}))[1]))
+        return results
+
+
+def _render_hit(hit: Hit) -> str:
+    extra = ", ".join(part for part in (hit.source, hit.date) if part)
+    snippet = f" - {' '.join(hit.snippet.split())[:200]}" if hit.snippet else ""
+    return f"- {hit.title}{f' ({extra})' if extra else ''}{snippet} {hit.link}"
+
+
+def render_results(results: Sequence[SearchResult], per_query: int = RESULTS_PER_QUERY) -> str:
+    """A few lines per query: top organic results, then news, each with its link"""
+    lines = []
+    for result in results:
+        lines.append(f"## {result.query}")
+        lines.extend(_render_hit(hit) for hit in result.organic[:per_query])
+        if result.news:
+            lines.append("News:")
+            lines.extend(_render_hit(hit) for hit in result.news[:per_query])
+        if not result.organic and not result.news:
+            lines.append("No results.")
+    return "\n".join(lines) or "No queries given."
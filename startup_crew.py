@@ -1,20 +1,21 @@
+import functools
 import os
 
 from crewai import Agent, Task, Process, Crew
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.llms import Ollama
 
-# To Load Local models through Ollama
-mistral = Ollama(model="mistral")
+from llm_cache import cached_llm
 
 # To Load GPT-4
 api = os.environ.get("OPENAI_API_KEY")
 
-# To load gemini (this api is for free: https://makersuite.google.com/app/apikey)
-api_gemini = os.environ.get("GEMINI-API-KEY")
-llm = ChatGoogleGenerativeAI(
-    model="gemini-pro", verbose=True, temperature=0.1, google_api_key=api_gemini
-)
+
+# The alternative model is only created when an agent asks for it
+@functools.lru_cache(maxsize=None)
+def get_gemini():
+    """To load gemini (this api is for free: https://makersuite.google.com/app/apikey)"""
+    api_gemini = os.environ.get("GEMINI-API-KEY")
+    return cached_llm("gemini/gemini-pro", temperature=0.1, api_key=api_gemini)
+
 
 marketer = Agent(
     role="Market Research Analyst",
@@ -25,7 +26,8 @@ marketer = Agent(
 		""",
     verbose=True,  # enable more detailed or extensive output
     allow_delegation=True,  # enable collaboration between agent
-    #   llm=llm # to load gemini
+    llm=cached_llm(),  # default model, responses cached (see llm_cache)
+    #   llm=get_gemini() # to load gemini
 )
 
 technologist = Agent(
@@ -38,7 +40,8 @@ technologist = Agent(
 		operational efficiency but also provides a competitive edge in the market.""",
     verbose=True,  # enable more detailed or extensive output
     allow_delegation=True,  # enable collaboration between agent
-    #   llm=llm # to load gemini
+    llm=cached_llm(),  # default model, responses cached (see llm_cache)
+    #   llm=get_gemini() # to load gemini
 )
 
 business_consultant = Agent(
@@ -50,7 +53,8 @@ business_consultant = Agent(
 		about immediate gains but about building a resilient and adaptable business that can thrive in a changing market.""",
     verbose=True,  # enable more detailed or extensive output
     allow_delegation=True,  # enable collaboration between agent
-    #   llm=llm # to load gemini
+    llm=cached_llm(),  # default model, responses cached (see llm_cache)
+    #   llm=get_gemini() # to load gemini
 )
 
 task1 = Task(
@@ -59,6 +63,7 @@ task1 = Task(
 		be concise with at least 10 bullet points and it has to address the most important areas when it comes to marketing this type of business.
     """,
     agent=marketer,
+    expected_output="A concise marketing report with at least 10 bullet points describing the ideal customer and how to reach the widest possible audience."
 )
 
 task2 = Task(
@@ -67,6 +72,7 @@ task2 = Task(
 		at least 10  bullet points and it has to address the most important areas when it comes to manufacturing this type of business. 
     """,
     agent=technologist,
+    expected_output="A concise technology report with at least 10 bullet points on the technologies needed to manufacture the product."
 )
 
 task3 = Task(
@@ -76,16 +82,24 @@ task3 = Task(
 		at least 10  bullet points, 5 goals and it has to contain a time schedule for which goal should be achieved and when.
     """,
     agent=business_consultant,
+    expected_output="A concise business plan with at least 10 bullet points, 5 goals and a time schedule for achieving them."
 )
 
 crew = Crew(
     agents=[marketer, technologist, business_consultant],
     tasks=[task1, task2, task3],
-    verbose=2,
+    verbose=True,
     process=Process.sequential,  # Sequential process will have tasks executed one after the other and the outcome of the previous one is passed as extra content into this next.
 )
 
-result = crew.kickoff()
 
-print("######################")
-print(result)
+
+def main():
+    result = crew.kickoff()
+
+    print("######################")
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
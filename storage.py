@@ -0,0 +1,28 @@
+"""Location and connection helpers for the local on-disk caches and stores."""
+import os
+import sqlite3
+
+# Override with NEWSLETTER_CACHE_DIR to share one cache between deployments
+CACHE_DIR = os.environ.get(
+    "NEWSLETTER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+
+
+def cache_path(name: str) -> str:
+    """Return the path of ``name`` inside the cache directory, creating the directory"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def connect(name: str) -> sqlite3.Connection:
+    """Open a SQLite database in the cache directory.
+
+    The connection is in autocommit mode and may be shared between threads;
+    callers serialize access with their own lock. WAL mode lets several
+    Streamlit processes read while one writes.
+    """
+    conn = sqlite3.connect(cache_path(name), timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,102 @@
+"""Progress streaming for newsletter generation.
+
+A ``ProgressLog`` collects what happens during a crew run - per-source scrape
+results, agent steps, finished task outputs and LLM tokens - from whichever
+thread produces it. The crew runs on a background worker (see jobs) while
+the UI polls the log and redraws it, so the first results show up seconds
+after kickoff instead of when the whole crew is done.
+
+Producers call ``emit``, which writes to the log bound to ``current_log`` in
+the running context and is a no-op otherwise, so the research pipeline can
+report progress without knowing who is listening.
+"""
+import contextvars
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+current_log: contextvars.ContextVar[Optional["ProgressLog"]] = contextvars.ContextVar("current_log", default=None)
+
+
+class ProgressEvent(NamedTuple):
+    kind: str  # "source", "step", "token" or "task"
+    label: str
+    text: str = ""
+    at: float = 0.0
+
+
+class ProgressLog:
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    def emit(self, kind: str, label: str, text: str = "") -> None:
+        with self._lock:
+            self._events.append(ProgressEvent(kind, label, text, time.time()))
+
+    def since(self, index: int) -> List[ProgressEvent]:
+        """Events recorded after the first ``index`` ones"""
+        with self._lock:
+            return self._events[index:]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+
+def emit(kind: str, label: str, text: str = "") -> None:
+    """Record a progress event on the log of the current run, if any"""
+    log = current_log.get()
+    if log is not None:
+        log.emit(kind, label, text)
+
+
+def task_callback(output) -> None:
+    """Crew ``task_callback``: publish each task's output as soon as it finishes"""
+    label = getattr(output, "agent", None) or getattr(output, "name", None) or "Task"
+    emit("task", str(label), str(getattr(output, "raw", output)))
+
+
+def step_callback(step) -> None:
+    """Crew ``step_callback``: publish a one-line summary of each agent step"""
+    tool = getattr(step, "tool", None)
+    if tool:
+        emit("step", "Tool", f"{tool}({str(getattr(step, 'tool_input', ''))[:120]})")
+    else:
+        thought = getattr(step, "thought", None) or getattr(step, "text", None) or ""
+        if thought:
+            emit("step", "Thought", str(thought).strip()[:200])
+
+
+def enable_token_streaming(agents) -> None:
+    """Switch the agents' LLMs to streaming and forward their chunks to the log"""
+    for agent in agents:
+        llm = getattr(agent, "llm", None)
+        if llm is not None and hasattr(llm, "stream"):
+            llm.stream = True
+    _install_chunk_listener()
+
+
+_listener_installed = False
+_listener_lock = threading.Lock()
+
+
+def _install_chunk_listener() -> None:
+    global _listener_installed
+    with _listener_lock:
+        if _listener_installed:
+            return
+        try:
+            from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:
+            # Older crewai without an event bus: tasks and steps still stream
+            _listener_installed = True
+            return
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _forward_chunk(source, event):
+            if event.chunk:
+                emit("token", getattr(event, "agent_role", None) or "LLM", event.chunk)
+
+        _listener_installed = True
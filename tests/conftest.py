@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# The stores open their databases in the cache directory at import time of the
+# first get_X(); keep the tests away from the real one
+os.environ["NEWSLETTER_CACHE_DIR"] = tempfile.mkdtemp(prefix="newsletter_tests_")
+# crewai must not phone home from the crew tests
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
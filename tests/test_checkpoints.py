@@ -0,0 +1,79 @@
+import pytest
+
+crewai = pytest.importorskip("crewai")
+from crewai import Agent, Crew, Process, Task  # noqa: E402
+
+from benchmarks.fake_llm import ScriptedLLM, final_answer  # noqa: E402
+from checkpoints import CheckpointStore, kickoff_with_checkpoints  # noqa: E402
+
+PROMPTS = []
+
+
+def remember(answer):
+    def respond(messages):
+        PROMPTS.append("\n".join(str(message.get("content") or "") for message in messages))
+        return final_answer(answer)
+    return respond
+
+
+SCRIPT = {
+    "Researcher": [remember("RESEARCH: GenAI Night on 2026-10-20")],
+    "Writer": [remember("DRAFT: <h1>GenAI Night</h1>")],
+    "Critic": [remember("<h1>GenAI Night</h1>")],
+}
+
+
+def make_crew(llm, writer_description="Write a draft from the research.",
+              critic_description="Review the draft."):
+    agents = [Agent(role=role, goal=f"{role} goal", backstory=f"{role} backstory", llm=llm, verbose=False)
+              for role in ("Researcher", "Writer", "Critic")]
+    research = Task(description="Find AI events.", expected_output="A list of events.", agent=agents[0])
+    write = Task(description=writer_description, expected_output="An HTML draft.", agent=agents[1])
+    critique = Task(description=critic_description, expected_output="The final HTML.", agent=agents[2],
+                    context=[write])
+    return Crew(agents=agents, tasks=[research, write, critique], process=Process.sequential, verbose=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(db_name=str(tmp_path / "checkpoints.sqlite3"))
+
+
+def test_critic_only_rerun(store):
+    llm = ScriptedLLM(model="scripted", script=SCRIPT)
+    first = kickoff_with_checkpoints(make_crew(llm), "run", store)
+    assert len(llm.calls) == 3
+    assert len(first.tasks_output) == 3
+
+    crew = make_crew(llm, critic_description="Review the draft and fix the HTML.")
+    output = kickoff_with_checkpoints(crew, "run", store)
+    assert [call.agent for call in llm.calls[3:]] == ["Critic"]
+    assert [task.raw for task in output.tasks_output] == [
+        "RESEARCH: GenAI Night on 2026-10-20", "DRAFT: <h1>GenAI Night</h1>", "<h1>GenAI Night</h1>"]
+    assert output.raw == "<h1>GenAI Night</h1>"
+    assert len(crew.tasks) == 3  # the crew is not cut down to the rerun suffix
+
+
+def test_resume_from_middle_wires_context(store):
+    llm = ScriptedLLM(model="scripted", script=SCRIPT)
+    kickoff_with_checkpoints(make_crew(llm), "run", store)
+
+    crew = make_crew(llm, writer_description="Write a short draft from the research.")
+    writer_context = crew.tasks[1].context
+    PROMPTS.clear()
+    output = kickoff_with_checkpoints(crew, "run", store)
+    assert [call.agent for call in llm.calls[3:]] == ["Writer", "Critic"]
+    # The writer still reads the restored research, the critic only the draft it names
+    assert "RESEARCH: GenAI Night" in PROMPTS[0]
+    assert "DRAFT: <h1>GenAI Night</h1>" in PROMPTS[1]
+    assert "RESEARCH: GenAI Night" not in PROMPTS[1]
+    assert len(output.tasks_output) == len(crew.tasks) == 3
+    assert crew.tasks[1].context is writer_context
+
+
+def test_full_restore_makes_no_calls(store):
+    llm = ScriptedLLM(model="scripted", script=SCRIPT)
+    kickoff_with_checkpoints(make_crew(llm), "run", store)
+    output = kickoff_with_checkpoints(make_crew(llm), "run", store)
+    assert len(llm.calls) == 3
+    assert len(output.tasks_output) == 3
@@ -0,0 +1,77 @@
+from doc_index import Chunk, DocumentIndex, chunk_text, event_boost, render_chunks
+
+# 40 characters = 10 tokens per line
+LINES = [f"line {i:02d} " + "x" * 32 for i in range(7)]
+
+
+def test_chunks_overlap_by_one_line():
+    chunks = chunk_text("\n".join(LINES), max_tokens=30)
+    assert [chunk.text.splitlines() for chunk in chunks] == [
+        LINES[0:3], LINES[2:5], LINES[4:7],
+    ]
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    no_overlap = chunk_text("\n".join(LINES), max_tokens=30, overlap_lines=0)
+    assert [chunk.text.splitlines() for chunk in no_overlap] == [LINES[0:3], LINES[3:6], LINES[6:7]]
+
+
+def test_blank_lines_are_dropped_and_long_lines_split():
+    assert chunk_text("\n\n  first  \n\nsecond\n") == [Chunk(0, "first\nsecond")]
+    long_line = " ".join(["word"] * 40)  # 199 characters, 50 tokens
+    chunks = chunk_text(long_line, max_tokens=20)
+    assert all(len(chunk.text) <= 80 for chunk in chunks)
+    assert " ".join(chunk.text for chunk in chunks).split() == ["word"] * 40
+
+
+def test_bm25_ranks_the_chunk_with_rarer_and_more_frequent_terms_first():
+    index = DocumentIndex([
+        Chunk(0, "quarterly budget review for the finance team"),
+        Chunk(1, "robotics robotics robotics lab open house"),
+        Chunk(2, "robotics reading group notes"),
+        Chunk(3, "office plants watering schedule"),
+    ])
+    ranked = index.search("robotics", k=4)
+    assert [scored.chunk.index for scored in ranked[:2]] == [1, 2]
+    assert ranked[0].score > ranked[1].score > 0
+    assert all(scored.score == 0 for scored in ranked[2:])
+    # Plurals match their singular
+    assert index.search("plant", k=1)[0].chunk.index == 3
+
+
+def test_event_boost_moves_dated_and_linked_chunks_up():
+    plain = "robotics club notes from the garage"
+    dated = "robotics club notes Oct 24"
+    linked = "robotics club notes https://lu.ma/robots"
+    assert event_boost(plain) == 1.0
+    assert event_boost(dated) == event_boost(linked) == 1.5
+    assert event_boost("AI meetup Oct 24 https://lu.ma/ai") == 2.5
+
+    index = DocumentIndex([Chunk(0, plain), Chunk(1, dated), Chunk(2, linked)])
+    ranked = [scored.chunk.index for scored in index.search("robotics club", k=3)]
+    assert ranked[-1] == 0
+    assert set(ranked[:2]) == {1, 2}
+
+
+def test_chunks_without_query_terms_rank_by_boost_below_matches():
+    index = DocumentIndex([
+        Chunk(0, "pottery class notes"),
+        Chunk(1, "GenAI workshop Oct 24 https://lu.ma/genai"),
+        Chunk(2, "pottery glaze recipes"),
+    ])
+    ranked = [scored.chunk.index for scored in index.search("pottery", k=3)]
+    assert set(ranked[:2]) == {0, 2} and ranked[2] == 1
+    assert [scored.chunk.index for scored in index.search("chess", k=3)][0] == 1
+
+
+def test_render_chunks_lists_the_top_sections_in_document_order():
+    index = DocumentIndex([
+        Chunk(0, "robotics club notes"),
+        Chunk(1, "pottery class notes"),
+        Chunk(2, "robotics robotics lab open house"),
+    ])
+    text = render_chunks(index, "robotics", k=2)
+    assert text.splitlines() == [
+        "Top 2 of 3 document sections for 'robotics':",
+        "--- section 1 ---", "robotics club notes",
+        "--- section 3 ---", "robotics robotics lab open house",
+        "Search again with a different query to see other sections.",
+    ]
@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+import doc_ingest
+from doc_ingest import DocumentCache, ingest, iter_text_lines
+
+
+def _lines(data: bytes):
+    return list(iter_text_lines(io.BytesIO(data)))
+
+
+def test_utf8_text_is_decoded_as_utf8():
+    assert _lines("Café Talk – Zürich\r\nNext line\n".encode("utf-8")) == ["Café Talk – Zürich", "Next line"]
+
+
+def test_latin1_text_falls_back_to_latin1():
+    assert _lines("Café Talk\nZürich Meetup\n".encode("latin-1")) == ["Café Talk", "Zürich Meetup"]
+
+
+def test_whole_stream_is_checked_before_decoding(monkeypatch):
+    monkeypatch.setattr(doc_ingest, "_CHUNK_SIZE", 8)
+    # The only non-UTF-8 byte comes long after the first chunk
+    data = b"AI events in the Bay Area\n" * 10 + "Café\n".encode("latin-1")
+    assert _lines(data)[-1] == "Café"
+    # A multi-byte character split across chunks is still UTF-8
+    data = "1234567é\n".encode("utf-8")
+    assert _lines(data) == ["1234567é"]
+
+
+def test_stream_is_left_open():
+    stream = io.BytesIO("Zürich\n".encode("latin-1"))
+    assert list(iter_text_lines(stream)) == ["Zürich"]
+    assert not stream.closed
+
+
+def test_ingest_reuses_the_text_of_identical_content(tmp_path):
+    cache = DocumentCache(db_name=str(tmp_path / "documents.sqlite3"))
+    data = "Café AI Night\nOct 24\n".encode("latin-1")
+    first = ingest("events.txt", io.BytesIO(data), cache)
+    assert first.text == "Café AI Night\nOct 24" and not first.from_cache
+    again = ingest("renamed.txt", io.BytesIO(data), cache)
+    assert again.from_cache and again.text == first.text and again.digest == first.digest
+
+
+def test_small_pdfs_are_not_sent_to_a_process_pool(monkeypatch):
+    pytest.importorskip("PyPDF2")
+    from benchmarks.bench_ingest import synthetic_brochure
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(doc_ingest, "ProcessPoolExecutor", no_pool)
+    pages = list(doc_ingest.iter_pdf_pages(io.BytesIO(synthetic_brochure(pages=3)), workers=8))
+    assert len(pages) == 3
+    assert "Bay Area AI Week - page 2" in pages[1]
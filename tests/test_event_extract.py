@@ -0,0 +1,52 @@
+from datetime import date
+
+from event_extract import extract_events, find_date, find_location
+
+TODAY = date(2026, 3, 2)
+
+LISTINGS = """Applied AI Meetup
+March 5, 2026 6:30 PM PT
+500 Howard Street, San Francisco
+https://lu.ma/applied-ai
+
+LLM Agents Workshop
+Thu 3/12 10am - 1pm
+Online
+https://www.eventbrite.com/e/agents-123
+
+Computer Vision Summit
+April 20, 2026 9:00 AM
+https://cvsummit.example.org/register
+
+Monthly AI community call, date to be announced
+RSVP at https://community.example.org/call
+
+Our progress: the migration is 3/4 of the way done.
+"""
+
+
+def test_window_split_and_leftovers():
+    extraction = extract_events(LISTINGS, source="upload", today=TODAY)
+    assert [(event.title, event.date) for event in extraction.events] == [
+        ("Applied AI Meetup", "2026-03-05"), ("LLM Agents Workshop", "2026-03-12")]
+    first, second = extraction.events
+    assert (first.time, first.location, first.url, first.category) == (
+        "6:30 PM PT", "500 Howard Street, San Francisco", "https://lu.ma/applied-ai", "ai")
+    assert (second.time, second.location) == ("10am - 1pm", "Online")
+    assert extraction.out_of_window == 1  # the April summit
+    # No date: the loader agent reads it; the status note is neither event nor leftover
+    assert extraction.leftovers == ["Monthly AI community call, date to be announced\n"
+                                    "RSVP at https://community.example.org/call"]
+
+
+def test_fractions_are_not_dates():
+    assert find_date("Meetup 3/4 of the way", TODAY) is None
+    assert find_location("Meetup 3/4 of the way") is None
+    assert find_date("Meetup on 3/4", TODAY) == date(2026, 3, 4)
+    assert find_date("Wednesday, 3/4 at 6pm", TODAY) == date(2026, 3, 4)
+    assert find_date("3/4/27", TODAY) == date(2027, 3, 4)
+
+
+def test_missing_year_is_the_next_occurrence():
+    assert find_date("Jan 15", TODAY) == date(2027, 1, 15)
+    assert find_date("Feb 20", TODAY) == date(2026, 2, 20)  # just happened
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import Counter
+
+from fetcher import fetch_all
+
+
+class SleepingFetch:
+    """Sleeps ``delays[url]`` seconds per request and records the peak in-flight requests per host"""
+
+    def __init__(self, delays, default=0.05):
+        self.delays = delays
+        self.default = default
+        self.release = threading.Event()  # wakes requests still sleeping when a test ends
+        self.in_flight = Counter()
+        self.peak = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, url, timeout):
+        host = url.split("/")[2]
+        with self.lock:
+            self.in_flight[host] += 1
+            self.peak[host] = max(self.peak[host], self.in_flight[host])
+        try:
+            self.release.wait(self.delays.get(url, self.default))
+            return f"body of {url}"
+        finally:
+            with self.lock:
+                self.in_flight[host] -= 1
+
+
+def test_pending_urls_time_out_at_the_deadline_without_blocking():
+    fetch = SleepingFetch({"https://slow.test/a": 10, "https://slow.test/b": 10})
+    urls = ["https://fast.test/1", "https://slow.test/a", "https://fast.test/2", "https://slow.test/b"]
+    try:
+        t0 = time.monotonic()
+        results = list(fetch_all(urls, fetch, deadline=0.5, timeout=10))
+        elapsed = time.monotonic() - t0
+    finally:
+        fetch.release.set()
+
+    assert elapsed < 2  # neither the iteration nor the executor shutdown waited for the slow host
+    assert sorted(result.url for result in results) == sorted(urls)
+    by_url = {result.url: result for result in results}
+    assert by_url["https://fast.test/1"].response == "body of https://fast.test/1"
+    assert by_url["https://fast.test/2"].error is None
+    for url in ("https://slow.test/a", "https://slow.test/b"):
+        assert isinstance(by_url[url].error, TimeoutError)
+        assert by_url[url].response is None
+    # Fast results come out first, as they finish
+    assert {result.url for result in results[:2]} == {"https://fast.test/1", "https://fast.test/2"}
+
+
+def test_requests_per_host_are_capped():
+    fetch = SleepingFetch({})
+    urls = [f"https://busy.test/{i}" for i in range(8)] + [f"https://other.test/{i}" for i in range(3)]
+    results = list(fetch_all(urls, fetch, deadline=5, per_host_limit=2, max_workers=16))
+
+    assert all(result.error is None for result in results)
+    assert len(results) == len(urls)
+    assert fetch.peak["busy.test"] == 2
+    assert fetch.peak["other.test"] == 2
+
+
+def test_duplicate_urls_are_fetched_once():
+    fetch = SleepingFetch({}, default=0)
+    results = list(fetch_all(["https://a.test/x", "https://a.test/x"], fetch))
+    assert [result.url for result in results] == ["https://a.test/x"]
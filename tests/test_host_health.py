@@ -0,0 +1,96 @@
+import requests
+import pytest
+
+import host_health
+from host_health import CircuitOpenError, HostHealth
+from rate_limit import TokenBucket
+
+HOST = "slow.example.com"
+URL = f"https://{HOST}/events"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+class Host:
+    """A host answering in ``latency`` seconds on a fake clock"""
+
+    def __init__(self, clock, latency):
+        self.clock = clock
+        self.latency = latency
+        self.timeouts = []
+
+    def get(self, url, timeout):
+        self.timeouts.append(timeout)
+        if self.latency > timeout:
+            self.clock.now += timeout
+            raise requests.ReadTimeout(f"read timed out after {timeout}s")
+        self.clock.now += self.latency
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(host_health, "time", clock)
+    return clock
+
+
+def make_health(tmp_path, name):
+    health = HostHealth(db_name=str(tmp_path / name))
+    health._buckets[HOST] = TokenBucket(1000)
+    return health
+
+
+def test_timeout_adapts_to_fast_host(tmp_path, clock):
+    health = make_health(tmp_path, "fast.sqlite3")
+    fetch = health.wrap(Host(clock, 0.8).get)
+    for _ in range(host_health.LATENCY_SAMPLES):
+        fetch(URL, 8)
+    assert health.timeout_for(HOST, 8) == pytest.approx(2.0)
+
+
+def test_host_that_slows_down_recovers(tmp_path, clock):
+    health = make_health(tmp_path, "slows.sqlite3")
+    host = Host(clock, 0.8)
+    fetch = health.wrap(host.get)
+    for _ in range(host_health.LATENCY_SAMPLES):
+        fetch(URL, 8)
+
+    host.latency = 3.0
+    for _ in range(host_health.FAILURE_THRESHOLD):
+        with pytest.raises(requests.Timeout):
+            fetch(URL, 8)
+    assert health.stats()[HOST]["open"]
+    with pytest.raises(CircuitOpenError):
+        fetch(URL, 8)
+
+    # After the cool-down the trial gets the full timeout and closes the circuit
+    clock.now += host_health.COOL_DOWN + 1
+    fetch(URL, 8)
+    assert host.timeouts[-1] == 8
+    assert not health.stats()[HOST]["open"]
+
+    # The stale 0.8s history is gone: the new latency sets the timeout
+    for _ in range(host_health.MIN_SAMPLES):
+        fetch(URL, 8)
+    assert health.timeout_for(HOST, 8) == pytest.approx(6.0)
+    assert health.stats()[HOST]["failures"] == 0
+
+
+def test_timeouts_count_as_latency(tmp_path, clock):
+    health = make_health(tmp_path, "timeouts.sqlite3")
+    health.record(HOST, 0.5, ok=True)
+    health.record(HOST, 2.0, ok=False, timed_out=True)
+    health.record(HOST, 1.0, ok=False)  # a 503, not a latency
+    assert sorted(health._states[HOST].latencies) == [0.5, 2.0]
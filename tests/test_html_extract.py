@@ -0,0 +1,32 @@
+import pytest
+
+import html_extract
+from html_extract import extract_page
+
+BACKENDS = ["lxml", "htmlparser", "soup"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_links_and_headings_in_document_order(backend):
+    page = extract_page(b'<h1>AI events</h1><div><h3>GenAI <b>Night</b></h3>'
+                        b'<a href="/e/1">x</a><a>no href</a><a href="/e/2">y</a></div>', backend)
+    assert page.links == ["/e/1", "/e/2"]
+    assert page.headings == ["AI events", "GenAI Night"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_elements_left_open_at_the_end_are_kept(backend):
+    page = extract_page(b'<h2>Title one</h2><a href="/a">a</a><h3>Last heading', backend)
+    assert page.headings == ["Title one", "Last heading"]
+
+
+@pytest.mark.parametrize("backend", ["lxml", "htmlparser"])
+def test_parsing_stops_at_the_link_cap(backend, monkeypatch):
+    monkeypatch.setattr(html_extract, "CHUNK_SIZE", 64)
+    content = b'<a href="/e">e</a>' * 20 + b"<p>" + b"filler " * 100 + b"</p><h2>Far down the page</h2>"
+    page = extract_page(content, backend, max_links=5, max_headings=10)
+    assert len(page.links) == 5
+    assert page.headings == []
+    # A heading cap alone does not cut the links short
+    page = extract_page(content, backend, max_links=None, max_headings=0)
+    assert len(page.links) == 20
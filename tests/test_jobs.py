@@ -0,0 +1,44 @@
+import threading
+
+import jobs
+from jobs import FAILED, RUNNING, JobManager
+
+
+def wait_for(manager, job_id, status):
+    for _ in range(200):
+        if manager.get(job_id).status == status:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} never became {status}")
+
+
+def test_new_manager_leaves_other_processes_jobs_running(tmp_path):
+    db = str(tmp_path / "shared.sqlite3")
+    first = JobManager(db_name=db)
+    release = threading.Event()
+    job_id = first.submit("slow", release.wait)
+    wait_for(first, job_id, RUNNING)
+
+    second = JobManager(db_name=db)  # another Streamlit process on the same cache dir
+    assert second.get(job_id).status == RUNNING
+
+    # Once the owner is gone its job can never finish
+    first.close()
+    second._beat()
+    assert second.get(job_id).status == FAILED
+    assert second.get(job_id).error == "interrupted by restart"
+    release.set()
+    second.close()
+
+
+def test_finished_jobs_are_dropped_from_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "KEEP_FINISHED", 2)
+    manager = JobManager(max_workers=1, db_name=str(tmp_path / "prune.sqlite3"))
+    ids = [manager.submit(f"job-{i}", lambda i=i: f"newsletter {i}") for i in range(5)]
+    for job_id in ids:
+        assert manager.get(job_id).log.done.wait(2)
+    assert set(manager._jobs) == set(ids[-2:])
+    # Dropped jobs are still served from SQLite
+    assert manager.get(ids[0]).result == "newsletter 0"
+    assert manager.get(ids[0]).log.done.is_set()
+    manager.close()
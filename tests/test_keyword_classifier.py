@@ -0,0 +1,46 @@
+import pytest
+
+from keyword_classifier import KeywordClassifier, heading_classifier
+
+
+@pytest.mark.parametrize("text, category", [
+    ("ML meetup in SF", "ai"),
+    ("Hands-on LLMs workshop", "ai"),
+    ("Machine   Learning night", "ai"),
+    ("GenAI Builders", "ai"),
+    ("Startup demo day", "event"),
+    ("Community events this week", "event"),
+    ("html email templates", None),
+    ("Email marketing for small teams", None),
+    ("Detailed pricing", None),  # "ai" inside a word
+    ("", None),
+])
+def test_categories(text, category):
+    assert heading_classifier.classify(text).category == category
+
+
+def test_keywords_are_word_bounded():
+    assert heading_classifier.classify("html email webinar").matches[0].keyword == "webinar"
+    assert [m.keyword for m in heading_classifier.classify("LLMs and NLP talks").matches] == ["llm", "nlp", "talk"]
+
+
+def test_longest_keyword_wins():
+    (match,) = heading_classifier.classify("Generative AI").matches
+    assert match.keyword == "generative ai"
+
+
+def test_batch_spans_are_relative_to_each_text():
+    texts = ["html email", "Deep learning meetup", "", "Talk: ML ops"]
+    results = heading_classifier.classify_batch(texts)
+    assert [result.text for result in results] == texts
+    assert [result.category for result in results] == [None, "ai", None, "ai"]
+    for text, result in zip(texts, results):
+        for match in result.matches:
+            assert " ".join(text[match.start:match.end].lower().split()).rstrip("s") == match.keyword
+    assert [(m.start, m.end, m.category) for m in results[3].matches] == [(0, 4, "event"), (6, 8, "ai")]
+
+
+def test_earlier_category_wins_ties():
+    classifier = KeywordClassifier({"first": ["demo"], "second": ["demo day"]})
+    assert classifier.classify("demo day").category == "first"
+    assert KeywordClassifier({"a": ["talk"], "b": ["ml"]}).classify("ML talk").category == "a"
@@ -0,0 +1,75 @@
+import pytest
+from crewai.llms.base_llm import BaseLLM
+
+import llm_cache
+from llm_cache import READ_WRITE, REPLAY, CachedLLM, LLMCache, ReplayMissError
+
+MESSAGES = [{"role": "system", "content": "You are a researcher."},
+            {"role": "user", "content": "Find AI events in SF."}]
+
+
+class StubLLM(BaseLLM):
+    """Returns the queued responses in order (the last one repeats) and counts its calls"""
+
+    responses: list = ["answer"]
+    calls: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self.calls += 1
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(db_name=str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    return cache
+
+
+def _cached(mode=READ_WRITE, temperature=0.2, responses=("answer",)):
+    return CachedLLM.wrap(StubLLM(model="stub", temperature=temperature, responses=list(responses)), mode=mode)
+
+
+def test_repeated_call_is_answered_from_the_cache():
+    llm = _cached()
+    assert llm.call(MESSAGES) == "answer"
+    assert llm.call(MESSAGES) == "answer"
+    assert llm.inner.calls == 1
+
+
+def test_temperature_and_stop_words_are_part_of_the_key(cache):
+    _cached(temperature=0.2, responses=["cool"]).call(MESSAGES)
+
+    warmer = _cached(temperature=0.9, responses=["warm"])
+    assert warmer.call(MESSAGES) == "warm"
+    assert warmer.inner.calls == 1
+
+    stopped = _cached(temperature=0.2, responses=["stopped"])
+    stopped.stop = ["\nObservation:"]
+    assert stopped.call(MESSAGES) == "stopped"
+    assert stopped.inner.calls == 1
+    # The stop words set by crewai reach the wrapped LLM
+    assert stopped.inner.stop == ["\nObservation:"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_replay_serves_hits_and_fails_on_a_miss():
+    _cached().call(MESSAGES)
+
+    replay = _cached(mode=REPLAY)
+    assert replay.call(MESSAGES) == "answer"
+    with pytest.raises(ReplayMissError):
+        replay.call(MESSAGES + [{"role": "user", "content": "And in Oakland?"}])
+    assert replay.inner.calls == 0
+
+
+def test_only_text_responses_are_stored(cache):
+    tool_call = [{"id": "call_1", "function": {"name": "search", "arguments": "{}"}}]
+    llm = _cached(responses=[tool_call, "text"])
+    assert llm.call(MESSAGES) == tool_call
+    assert cache.stats()["entries"] == 0
+    # Not cached, so the next call goes to the LLM again
+    assert llm.call(MESSAGES) == "text"
+    assert llm.inner.calls == 2
+    assert cache.stats()["entries"] == 1
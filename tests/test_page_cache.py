@@ -0,0 +1,96 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from page_cache import PageCache
+
+
+class FakeFetch:
+    """Answers from a queue of (status, body, headers) or exceptions and records the request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, timeout=None, headers=None):
+        self.requests.append(headers or {})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        status, body, response_headers = response
+        return SimpleNamespace(status_code=status, content=body, headers=response_headers)
+
+
+def _expire(cache, url):
+    cache._db.execute("UPDATE pages SET expires_at = ? WHERE url = ?", (time.time() - 1, url))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(db_name=str(tmp_path / "pages.sqlite3"), ttls={})
+
+
+def test_fresh_page_is_served_without_fetching(cache):
+    fetch = FakeFetch((200, b"<html>v1</html>", {"ETag": '"v1"'}))
+    assert cache.get("https://lu.ma/sf", fetch, 5).content == b"<html>v1</html>"
+    page = cache.get("https://lu.ma/sf", fetch, 5)
+    assert page.from_cache and page.content == b"<html>v1</html>"
+    assert len(fetch.requests) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_page_is_revalidated_with_its_validators(cache):
+    url = "https://lu.ma/sf"
+    fetch = FakeFetch((200, b"<html>v1</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 12 Oct 2026 08:00:00 GMT"}),
+                      (304, b"", {}))
+    cache.get(url, fetch, 5)
+    _expire(cache, url)
+
+    page = cache.get(url, fetch, 5)
+    assert fetch.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 12 Oct 2026 08:00:00 GMT"}
+    assert page.from_cache and page.status_code == 200 and page.content == b"<html>v1</html>"
+    assert cache.stats()["revalidated"] == 1
+    # The 304 renewed the TTL
+    cache.get(url, fetch, 5)
+    assert len(fetch.requests) == 2
+
+
+def test_only_ok_responses_are_stored(cache):
+    url = "https://lu.ma/missing"
+    fetch = FakeFetch((404, b"not found", {}), (500, b"oops", {}), (200, b"found", {}))
+    assert cache.get(url, fetch, 5).status_code == 404
+    assert cache.get(url, fetch, 5).status_code == 500
+    assert cache.stats()["entries"] == 0
+    assert cache.get(url, fetch, 5).content == b"found"
+    assert cache.stats()["entries"] == 1
+
+
+def test_stale_page_is_served_when_the_refresh_fails(cache):
+    url = "https://lu.ma/sf"
+    fetch = FakeFetch((200, b"<html>v1</html>", {}), TimeoutError("read timed out"))
+    cache.get(url, fetch, 5)
+    _expire(cache, url)
+
+    page = cache.get(url, fetch, 5)
+    assert page.from_cache and page.content == b"<html>v1</html>"
+    assert cache.stats()["stale"] == 1
+
+
+def test_fetch_error_without_a_cached_page_propagates(cache):
+    with pytest.raises(ConnectionError):
+        cache.get("https://lu.ma/sf", FakeFetch(ConnectionError("refused")), 5)
+
+
+def test_least_recently_used_pages_are_evicted_by_size(tmp_path):
+    cache = PageCache(db_name=str(tmp_path / "pages.sqlite3"), max_bytes=250, ttls={})
+    body = b"x" * 100
+    fetch = FakeFetch(*[(200, body, {})] * 4)
+    cache.get("https://a.test/", fetch, 5)
+    cache.get("https://b.test/", fetch, 5)
+    cache.get("https://a.test/", fetch, 5)  # a is now more recent than b
+    cache.get("https://c.test/", fetch, 5)  # 300 bytes: b goes
+
+    stored = {url for (url,) in cache._db.execute("SELECT url FROM pages")}
+    assert stored == {"https://a.test/", "https://c.test/"}
+    assert cache.stats()["bytes"] == 200
@@ -0,0 +1,55 @@
+import os
+
+from reddit_store import NEW, RISING, SEEN, RedditStore, fixture_source, render_sync, sync_subreddits
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SUBREDDITS = ["LocalLLaMA", "MachineLearning"]
+
+
+def recorded(name, calls=None):
+    """Fixture source that counts the comment requests per post"""
+    listing, comments = fixture_source(os.path.join(FIXTURES, name))
+
+    def counted(post_id, limit):
+        if calls is not None:
+            calls.append(post_id)
+        return comments(post_id, limit)
+
+    return listing, counted
+
+
+def statuses(result):
+    return {change.post.id: change.status for change in result.changes}
+
+
+def test_second_sync_is_a_diff(tmp_path):
+    store = RedditStore(db_name=str(tmp_path / "reddit.sqlite3"))
+    first = sync_subreddits(SUBREDDITS, store, source=recorded("reddit_day1.json"))
+    assert set(statuses(first).values()) == {NEW}
+    assert first.hydrated == 4
+
+    calls = []
+    again = sync_subreddits(SUBREDDITS, store, source=recorded("reddit_day1.json", calls))
+    assert set(statuses(again).values()) == {SEEN}
+    assert calls == []  # nothing changed, so no comments were reloaded
+    # Comments are answered from the store
+    assert [len(change.post.comments) for change in again.changes] == [3, 2, 0, 2]
+
+    calls = []
+    later = sync_subreddits(SUBREDDITS, store, source=recorded("reddit_day2.json", calls))
+    assert statuses(later) == {"1fr0e5p": NEW, "1fq2a7k": RISING, "1fq3c9m": SEEN, "1fq4d0n": SEEN,
+                               "1fq1x2y": SEEN}
+    assert sorted(calls) == ["1fq3c9m", "1fr0e5p"]
+    rising = later.with_status(RISING)[0]
+    assert (rising.score_delta, rising.comments_delta) == (58, 0)
+    assert "Rising posts (1):" in render_sync(later)
+
+
+def test_diff_without_comments(tmp_path):
+    store = RedditStore(db_name=str(tmp_path / "reddit.sqlite3"))
+    first = sync_subreddits(SUBREDDITS, store, max_comments_per_post=0, source=recorded("reddit_day1.json"))
+    assert set(statuses(first).values()) == {NEW}
+    later = sync_subreddits(SUBREDDITS, store, max_comments_per_post=0, source=recorded("reddit_day2.json"))
+    assert statuses(later)["1fr0e5p"] == NEW
+    assert statuses(later)["1fq2a7k"] == RISING
+    assert statuses(later)["1fq1x2y"] == SEEN
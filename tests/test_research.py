@@ -0,0 +1,21 @@
+from datetime import date, timedelta
+
+from event_store import EventStore
+from events import Event
+from research import research_events
+
+
+def test_indexed_events_in_window_join_the_crawl(tmp_path):
+    store = EventStore(db_name=str(tmp_path / "events.sqlite3"))
+    today = date.today()
+    soon = Event("Earlier crawl: LLM Agents Workshop", "https://lu.ma/agents", "Lu.ma",
+                 date=(today + timedelta(days=3)).isoformat())
+    later = Event("Far out: AI Conference", "https://lu.ma/conf", "Lu.ma",
+                  date=(today + timedelta(days=40)).isoformat())
+    past = Event("Last week: GenAI Night", "https://lu.ma/night", "Lu.ma",
+                 date=(today - timedelta(days=7)).isoformat())
+    store.upsert([soon, later, past], page_url="https://lu.ma/search?q=agents")
+
+    result = research_events("AI events", store=store, page_urls=[])
+    assert [event.url for event in result.events] == ["https://lu.ma/agents"]
+    assert research_events("AI events", store=store, page_urls=[], window_days=0).events == []
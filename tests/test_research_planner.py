@@ -0,0 +1,27 @@
+import research
+import research_planner
+from fetcher import DEFAULT_DEADLINE
+from research_planner import grid_deadline, plan_queries
+
+
+def test_deadline_covers_busiest_column():
+    urls = [subquery.url for subquery in plan_queries("AI events")]
+    # Every wave of the busiest host gets a full request timeout
+    assert grid_deadline(urls, per_host_limit=3, timeout=8) >= 3 * 8
+    assert grid_deadline(["https://lu.ma/sf"], per_host_limit=3, timeout=8) == DEFAULT_DEADLINE
+    assert grid_deadline(urls * 10, per_host_limit=1, timeout=8) == research_planner.GRID_MAX_DEADLINE
+
+
+def test_cache_hits_do_not_wait_for_the_limiter(monkeypatch):
+    class Hit:
+        def get(self, url, fetch, timeout):
+            return "cached page"  # fresh: fetch is never called
+
+    class Limiter:
+        def wrap(self, fetch):
+            def limited(url, timeout):
+                raise AssertionError("cache hit waited for the rate limiter")
+            return limited
+
+    monkeypatch.setattr(research, "get_page_cache", Hit)
+    assert research.fetch_page("https://lu.ma/sf", 8, limiter=Limiter()) == "cached page"
@@ -0,0 +1,34 @@
+import pytest
+
+from search_memo import memo_key, normalize_query
+
+
+@pytest.mark.parametrize("variant", [
+    "AI events SF",
+    "ai events in SF August 26 2025",
+    "AI events in SF on Tuesday, Aug 26th, 2025",
+    "AI events SF 8/26",
+    "AI events SF 2025-08-26",
+    "AI events in SF 26 August",
+    "AI events in SF next week",
+    "SF AI events",
+])
+def test_date_variations_share_a_key(variant):
+    assert memo_key(normalize_query(variant)) == memo_key(normalize_query("AI events SF"))
+
+
+@pytest.mark.parametrize("first, second", [
+    ("GPT-4 events", "GPT-5 events"),
+    ("GPT-4 events", "GPT events"),
+    ("AI events in May", "AI events"),
+    ("AI events on Sat", "AI events on Sun"),
+    ("AI events in Mar", "AI events"),
+    ("top 10 AI events", "top 20 AI events"),
+    ("Llama 3 meetup", "Llama meetup"),
+])
+def test_different_queries_keep_different_keys(first, second):
+    assert memo_key(normalize_query(first)) != memo_key(normalize_query(second))
+
+
+def test_only_dates_left_falls_back_to_query():
+    assert normalize_query("August 26, 2025") == "august 26, 2025"
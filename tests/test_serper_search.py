@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from benchmarks.serper_stub import serve
+from serper_search import Hit, SearchCache, SearchResult, SerperSearch, render_results
+
+
+@pytest.fixture(scope="module")
+def stub():
+    server, url = serve()
+    yield server, url
+    server.shutdown()
+
+
+@pytest.fixture
+def search(stub, tmp_path, monkeypatch):
+    server, url = stub
+    server.RequestHandlerClass.requests = 0
+    search = SerperSearch(api_key="stub", base_url=url, num=3,
+                          cache=SearchCache(db_name=str(tmp_path / "serper.sqlite3"), ttl=3600))
+    search.batches = []
+    post = search._post
+
+    def recording_post(queries):
+        search.batches.append(len(queries))
+        return post(queries)
+
+    monkeypatch.setattr(search, "_post", recording_post)
+    return search
+
+
+def requests(stub):
+    return stub[0].RequestHandlerClass.requests
+
+
+def test_queries_are_sent_in_batches_of_100(stub, search):
+    queries = [f"ai meetup {i}" for i in range(250)]
+    results = search.search(queries)
+
+    assert sorted(search.batches) == [50, 100, 100]
+    assert requests(stub) == 3
+    assert [result.query for result in results] == queries
+    assert results[137].organic[0].title == "ai meetup 137 - result 1"
+    assert not any(result.from_cache for result in results)
+
+
+def test_cached_queries_cost_no_request_within_the_ttl(stub, search):
+    search.search(["llm agents", "genai hackathon"])
+    assert requests(stub) == 1
+
+    # Case and spacing do not matter; only the new query is sent
+    results = search.search(["LLM  agents", "genai hackathon", "vector databases"])
+    assert requests(stub) == 2
+    assert search.batches == [2, 1]
+    assert [result.from_cache for result in results] == [True, True, False]
+    assert results[0].organic == search.search(["llm agents"])[0].organic
+
+    # Past the TTL the query is searched again
+    search.cache._db.execute("UPDATE results SET created_at = ?", (time.time() - 7200,))
+    assert not search.search(["llm agents"])[0].from_cache
+    assert requests(stub) == 3
+
+
+def test_duplicate_queries_are_searched_once(stub, search):
+    results = search.search(["rag", "rag"])
+    assert len(results) == 1
+    assert search.batches == [1]
+
+
+def test_render_results_lists_organic_hits_then_news(stub, search):
+    text = render_results(search.search(["ai demo day"]), per_query=2)
+    lines = text.splitlines()
+    assert lines[0] == "## ai demo day"
+    assert lines[1].startswith("- ai demo day - result 1 - Everything about ai demo day, part 1.")
+    assert lines[1].endswith("/1")
+    assert len([line for line in lines if "- result" in line]) == 2
+    assert lines[3] == "News:"
+    assert lines[4].startswith("- ai demo day makes headlines (Example News, 2 hours ago) https://news.example.com/")
+
+
+def test_render_results_without_hits():
+    assert render_results([]) == "No queries given."
+    empty = SearchResult("nothing here", [], [])
+    assert render_results([empty]) == "## nothing here\nNo results."
+    hit = Hit("Title", "https://example.com", "  a\n snippet ")
+    assert render_results([SearchResult("q", [hit], [])]) == "## q\n- Title - a snippet https://example.com"